@@ -3,3 +3,14 @@ from django.apps import AppConfig
 
 class NinjaJwtConfig(AppConfig):
     name = "ninja_simple_jwt"
+
+    def ready(self) -> None:
+        # pylint: disable=C0415
+        from ninja_simple_jwt import checks  # noqa: F401  pylint: disable=W0611
+        from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+        from ninja_simple_jwt.jwt.user_revalidation import connect_user_signals
+        from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+        connect_user_signals()
+        if ninja_simple_jwt_settings.JWT_PRELOAD_KEYS:
+            InMemoryJwtKeyPair.preload()
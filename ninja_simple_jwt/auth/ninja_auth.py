@@ -1,35 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import Any, Coroutine, Optional
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import AnonymousUser
 from django.http import HttpRequest
+from django.utils.functional import LazyObject
+from django.utils.module_loading import import_string
 from jwt import PyJWTError
 from ninja.errors import AuthenticationError
 from ninja.security import HttpBearer
-from ninja.security.http import DecodeError
+from ninja.security.http import DecodeError, HttpAuthBase
 
-from ninja_simple_jwt.jwt.token_operations import TokenTypes, decode_token
+from ninja_simple_jwt.jwt.claim_mapping import ClaimMapping
+from ninja_simple_jwt.jwt.token_operations import (
+    TokenTypes,
+    adecode_token,
+    averify_not_revoked,
+    decode_token,
+    verify_not_revoked,
+)
+from ninja_simple_jwt.jwt.verified_token_cache import verified_token_cache
+from ninja_simple_jwt.metrics import instrument
 from ninja_simple_jwt.settings import ninja_simple_jwt_settings
 
 
-class HttpJwtAuth(HttpBearer):
-    def authenticate(self, request: HttpRequest, token: str) -> bool:
-        token = self.decode_authorization(request.headers["Authorization"])
-
-        try:
-            access_token = decode_token(token, token_type=TokenTypes.ACCESS, verify=True)
-        except PyJWTError as e:
-            raise AuthenticationError(e)
-
-        self.set_token_claims_to_user(request.user, access_token)
-
-        return True
+class JwtAuthMixin:
+    """Authorization header decoding and claim mapping shared by HttpJwtAuth and AsyncHttpJwtAuth."""
 
     @staticmethod
+    @instrument("claim_mapping")
     def set_token_claims_to_user(user: AbstractBaseUser | AnonymousUser, token: dict) -> None:
-        for claim, user_attribute in ninja_simple_jwt_settings.TOKEN_CLAIM_USER_ATTRIBUTE_MAP.items():
-            if isinstance(user_attribute, str):
-                setattr(user, user_attribute, token.get(claim))
-            else:
-                setattr(user, claim, token.get(claim))
+        ClaimMapping.plan.set_claims_to_user(user, token)
 
     def decode_authorization(self, value: str) -> str:
         parts = value.split(" ")
@@ -38,3 +41,90 @@ class HttpJwtAuth(HttpBearer):
 
         token = parts[1]
         return token
+
+
+class HttpJwtAuth(JwtAuthMixin, HttpBearer):
+    @instrument("authenticate", root=True)
+    def authenticate(self, request: HttpRequest, token: str) -> bool:
+        token = self.decode_authorization(request.headers["Authorization"])
+
+        access_token = verified_token_cache.get(token)
+        if access_token is None:
+            try:
+                access_token = decode_token(token, token_type=TokenTypes.ACCESS, verify=True)
+            except PyJWTError as e:
+                raise AuthenticationError(e)
+            verified_token_cache.set(token, access_token)
+        elif ninja_simple_jwt_settings.JWT_ACCESS_TOKEN_REVOCATION:
+            try:
+                verify_not_revoked(access_token)
+            except PyJWTError as e:
+                raise AuthenticationError(e)
+
+        if ninja_simple_jwt_settings.TOKEN_USER_CLS is not None:
+            request.user = import_string(ninja_simple_jwt_settings.TOKEN_USER_CLS)(access_token)
+        else:
+            self.set_token_claims_to_user(request.user, access_token)
+
+        return True
+
+
+class AsyncHttpBearer(HttpAuthBase, ABC):
+    """HttpBearer with a coroutine `authenticate`, which django-ninja awaits since `is_async` is set from it."""
+
+    openapi_scheme: str = "bearer"
+    header: str = "Authorization"
+
+    def __call__(self, request: HttpRequest) -> Optional[Coroutine[Any, Any, Optional[Any]]]:
+        auth_value = request.headers.get(self.header)
+        if not auth_value:
+            return None
+        parts = auth_value.split(" ")
+        if parts[0].lower() != self.openapi_scheme:
+            return None
+        return self.authenticate(request, " ".join(parts[1:]))
+
+    @abstractmethod
+    async def authenticate(self, request: HttpRequest, token: str) -> Optional[Any]:
+        pass  # pragma: no cover
+
+
+class AsyncHttpJwtAuth(JwtAuthMixin, AsyncHttpBearer):
+    @instrument("authenticate", root=True)
+    async def authenticate(self, request: HttpRequest, token: str) -> bool:
+        token = self.decode_authorization(request.headers["Authorization"])
+
+        access_token = verified_token_cache.get(token)
+        if access_token is None:
+            try:
+                access_token = await adecode_token(token, token_type=TokenTypes.ACCESS, verify=True)
+            except PyJWTError as e:
+                raise AuthenticationError(e)
+            verified_token_cache.set(token, access_token)
+        elif ninja_simple_jwt_settings.JWT_ACCESS_TOKEN_REVOCATION:
+            try:
+                await averify_not_revoked(access_token)
+            except PyJWTError as e:
+                raise AuthenticationError(e)
+
+        if ninja_simple_jwt_settings.TOKEN_USER_CLS is not None:
+            request.user = import_string(ninja_simple_jwt_settings.TOKEN_USER_CLS)(access_token)
+        else:
+            user = await self.aget_request_user(request)
+            self.set_token_claims_to_user(user, access_token)
+
+        return True
+
+    @staticmethod
+    async def aget_request_user(request: HttpRequest) -> AbstractBaseUser | AnonymousUser:
+        """Resolve the lazy request.user without touching the session from the event loop."""
+        user = request.user
+        if not isinstance(user, LazyObject):
+            return user
+
+        if hasattr(request, "auser"):
+            user = await request.auser()
+        else:
+            user = await sync_to_async(get_user)(request)
+        request.user = user
+        return user
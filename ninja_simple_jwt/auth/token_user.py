@@ -0,0 +1,57 @@
+from typing import Any
+
+from ninja_simple_jwt.jwt.claim_mapping import ClaimMapping
+
+
+class TokenUser:
+    """Stateless user principal built from access token claims.
+
+    User attributes are resolved through TOKEN_CLAIM_USER_ATTRIBUTE_MAP, so `token_user.username` returns the claim
+    mapped to the `username` attribute. No database, session or auth middleware is involved.
+    """
+
+    __slots__ = ("token",)
+
+    is_anonymous = False
+    is_authenticated = True
+
+    def __init__(self, token: dict) -> None:
+        self.token = token
+
+    def __getattr__(self, attr: str) -> Any:
+        claim = ClaimMapping.plan.user_attribute_claims.get(attr)
+        if claim is None:
+            raise AttributeError(f"{self.__class__.__name__} has no attribute {attr!r}")
+        return self.token.get(claim)
+
+    def _get_mapped_attribute(self, attr: str, default: Any) -> Any:
+        claim = ClaimMapping.plan.user_attribute_claims.get(attr)
+        return default if claim is None else self.token.get(claim, default)
+
+    @property
+    def pk(self) -> Any:
+        return self._get_mapped_attribute("id", None)
+
+    @property
+    def is_staff(self) -> bool:
+        return bool(self._get_mapped_attribute("is_staff", False))
+
+    @property
+    def is_superuser(self) -> bool:
+        return bool(self._get_mapped_attribute("is_superuser", False))
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self._get_mapped_attribute("is_active", True))
+
+    def get_username(self) -> Any:
+        return self._get_mapped_attribute("username", None)
+
+    def __str__(self) -> str:
+        return str(self.get_username())
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, TokenUser) and self.pk == other.pk
+
+    def __hash__(self) -> int:
+        return hash(self.pk)
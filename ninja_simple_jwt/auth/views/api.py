@@ -1,8 +1,12 @@
 from datetime import datetime, timezone
 
+from asgiref.sync import sync_to_async
+from django.contrib import auth
 from django.contrib.auth import authenticate
+from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.signals import user_logged_in
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags
 from jwt.exceptions import PyJWTError
 from ninja import Router
 from ninja.errors import AuthenticationError
@@ -15,38 +19,57 @@ from ninja_simple_jwt.auth.views.schemas import (
     SignInRequest,
     WebSignInResponse,
 )
+from ninja_simple_jwt.jwt.jwks import JwksDocument
 from ninja_simple_jwt.jwt.token_operations import (
-    TokenTypes,
-    decode_token,
-    get_access_token_for_user,
+    aget_access_token_from_refresh_token,
+    aget_token_pair_for_user,
+    arevoke_refresh_token,
+    arotate_refresh_token,
     get_access_token_from_refresh_token,
-    get_refresh_token_for_user,
+    get_token_pair_for_user,
+    revoke_refresh_token,
+    rotate_refresh_token,
 )
+from ninja_simple_jwt.metrics import instrument
 from ninja_simple_jwt.settings import ninja_simple_jwt_settings
 from ninja_simple_jwt.utils import make_authentication_params
 
+aauthenticate = getattr(auth, "aauthenticate", None) or sync_to_async(authenticate)  # added in Django 5.0
+
+authenticate_user = instrument("authenticate_user")(authenticate)
+aauthenticate_user = instrument("authenticate_user")(aauthenticate)
+
 mobile_auth_router = Router()
 web_auth_router = Router()
+async_mobile_auth_router = Router()
+async_web_auth_router = Router()
+jwks_router = Router()
 
 
 @mobile_auth_router.post("/sign-in", response=MobileSignInResponse, url_name="mobile_signin")
+@instrument("mobile_sign_in", root=True)
 def mobile_sign_in(request: HttpRequest, payload: SignInRequest) -> dict:
     payload_data = payload.dict()
-    user = authenticate(request, **make_authentication_params(payload_data))
+    user = authenticate_user(request, **make_authentication_params(payload_data))
 
     if user is None:
         raise AuthenticationError()
 
     user_logged_in.send(sender=user.__class__, request=request, user=user)
-    refresh_token, _ = get_refresh_token_for_user(user)
-    access_token, _ = get_access_token_for_user(user)
+    (refresh_token, _), (access_token, _) = get_token_pair_for_user(user)
     return {"refresh": refresh_token, "access": access_token}
 
 
-@mobile_auth_router.post("/token-refresh", response=MobileTokenRefreshResponse, url_name="mobile_token_refresh")
+@mobile_auth_router.post(
+    "/token-refresh", response=MobileTokenRefreshResponse, url_name="mobile_token_refresh", exclude_none=True
+)
+@instrument("mobile_token_refresh", root=True)
 def mobile_token_refresh(request: HttpRequest, payload: MobileTokenRefreshRequest) -> dict:
     payload_data = payload.dict()
     try:
+        if ninja_simple_jwt_settings.JWT_REFRESH_TOKEN_ROTATION:
+            (refresh_token, _), (access_token, _) = rotate_refresh_token(payload_data["refresh"])
+            return {"refresh": refresh_token, "access": access_token}
         access_token, _ = get_access_token_from_refresh_token(payload_data["refresh"])
     except PyJWTError:
         raise AuthenticationError()
@@ -54,51 +77,184 @@ def mobile_token_refresh(request: HttpRequest, payload: MobileTokenRefreshReques
     return {"access": access_token}
 
 
+@mobile_auth_router.post("/sign-out", response={204: Empty}, url_name="mobile_sign_out")
+@instrument("mobile_sign_out", root=True)
+def mobile_sign_out(request: HttpRequest, payload: MobileTokenRefreshRequest) -> tuple[int, str]:
+    payload_data = payload.dict()
+    try:
+        revoke_refresh_token(payload_data["refresh"])
+    except PyJWTError:
+        raise AuthenticationError()
+    return 204, ""
+
+
 @web_auth_router.post("/sign-in", response=WebSignInResponse, url_name="web_signin")
+@instrument("web_sign_in", root=True)
 def web_sign_in(request: HttpRequest, payload: SignInRequest, response: HttpResponse) -> dict:
     payload_data = payload.dict()
-    user = authenticate(request, **make_authentication_params(payload_data))
+    user = authenticate_user(request, **make_authentication_params(payload_data))
 
     if user is None:
         raise AuthenticationError()
 
     user_logged_in.send(sender=user.__class__, request=request, user=user)
-    refresh_token, refresh_token_payload = get_refresh_token_for_user(user)
-    access_token, _ = get_access_token_for_user(user)
-    response.set_cookie(
-        key=ninja_simple_jwt_settings.JWT_REFRESH_COOKIE_NAME,
-        value=refresh_token,
-        expires=datetime.fromtimestamp(refresh_token_payload["exp"], timezone.utc),
-        httponly=ninja_simple_jwt_settings.WEB_REFRESH_COOKIE_HTTP_ONLY,
-        samesite=ninja_simple_jwt_settings.WEB_REFRESH_COOKIE_SAME_SITE_POLICY,
-        secure=ninja_simple_jwt_settings.WEB_REFRESH_COOKIE_SECURE,
-        path=ninja_simple_jwt_settings.WEB_REFRESH_COOKIE_PATH,
-    )
+    (refresh_token, refresh_token_payload), (access_token, _) = get_token_pair_for_user(user)
+    _set_refresh_token_cookie(response, refresh_token, refresh_token_payload)
     return {"access": access_token}
 
 
 @web_auth_router.post("/token-refresh", response=WebSignInResponse, url_name="web_token_refresh")
-def web_token_refresh(request: HttpRequest) -> dict:
+@instrument("web_token_refresh", root=True)
+def web_token_refresh(request: HttpRequest, response: HttpResponse) -> dict:
     cookie = request.COOKIES.get(ninja_simple_jwt_settings.JWT_REFRESH_COOKIE_NAME)
     if cookie is None:
         raise AuthenticationError()
     try:
-        access_token, _ = get_access_token_from_refresh_token(cookie)
+        if ninja_simple_jwt_settings.JWT_REFRESH_TOKEN_ROTATION:
+            (refresh_token, refresh_token_payload), (access_token, _) = rotate_refresh_token(cookie)
+            _set_refresh_token_cookie(response, refresh_token, refresh_token_payload)
+        else:
+            access_token, _ = get_access_token_from_refresh_token(cookie)
     except PyJWTError:
         raise AuthenticationError()
     return {"access": access_token}
 
 
 @web_auth_router.post("/sign-out", response={204: Empty}, url_name="web_sign_out")
+@instrument("web_sign_out", root=True)
 def web_sign_out(request: HttpRequest, response: HttpResponse) -> tuple[int, str]:
     cookie = request.COOKIES.get(ninja_simple_jwt_settings.JWT_REFRESH_COOKIE_NAME)
     if cookie is None:
         raise AuthenticationError()
     try:
-        decode_token(cookie, token_type=TokenTypes.REFRESH, verify=True)
+        revoke_refresh_token(cookie)
+    except PyJWTError:
+        raise AuthenticationError()
+    _delete_refresh_token_cookie(response)
+    return 204, ""
+
+
+@async_mobile_auth_router.post("/sign-in", response=MobileSignInResponse, url_name="async_mobile_signin")
+@instrument("async_mobile_sign_in", root=True)
+async def async_mobile_sign_in(request: HttpRequest, payload: SignInRequest) -> dict:
+    payload_data = payload.dict()
+    user = await aauthenticate_user(request, **make_authentication_params(payload_data))
+
+    if user is None:
+        raise AuthenticationError()
+
+    await _asend_user_logged_in(request, user)
+    (refresh_token, _), (access_token, _) = await aget_token_pair_for_user(user)
+    return {"refresh": refresh_token, "access": access_token}
+
+
+@async_mobile_auth_router.post(
+    "/token-refresh", response=MobileTokenRefreshResponse, url_name="async_mobile_token_refresh", exclude_none=True
+)
+@instrument("async_mobile_token_refresh", root=True)
+async def async_mobile_token_refresh(request: HttpRequest, payload: MobileTokenRefreshRequest) -> dict:
+    payload_data = payload.dict()
+    try:
+        if ninja_simple_jwt_settings.JWT_REFRESH_TOKEN_ROTATION:
+            (refresh_token, _), (access_token, _) = await arotate_refresh_token(payload_data["refresh"])
+            return {"refresh": refresh_token, "access": access_token}
+        access_token, _ = await aget_access_token_from_refresh_token(payload_data["refresh"])
+    except PyJWTError:
+        raise AuthenticationError()
+
+    return {"access": access_token}
+
+
+@async_mobile_auth_router.post("/sign-out", response={204: Empty}, url_name="async_mobile_sign_out")
+@instrument("async_mobile_sign_out", root=True)
+async def async_mobile_sign_out(request: HttpRequest, payload: MobileTokenRefreshRequest) -> tuple[int, str]:
+    payload_data = payload.dict()
+    try:
+        await arevoke_refresh_token(payload_data["refresh"])
+    except PyJWTError:
+        raise AuthenticationError()
+    return 204, ""
+
+
+@async_web_auth_router.post("/sign-in", response=WebSignInResponse, url_name="async_web_signin")
+@instrument("async_web_sign_in", root=True)
+async def async_web_sign_in(request: HttpRequest, payload: SignInRequest, response: HttpResponse) -> dict:
+    payload_data = payload.dict()
+    user = await aauthenticate_user(request, **make_authentication_params(payload_data))
+
+    if user is None:
+        raise AuthenticationError()
+
+    await _asend_user_logged_in(request, user)
+    (refresh_token, refresh_token_payload), (access_token, _) = await aget_token_pair_for_user(user)
+    _set_refresh_token_cookie(response, refresh_token, refresh_token_payload)
+    return {"access": access_token}
+
+
+@async_web_auth_router.post("/token-refresh", response=WebSignInResponse, url_name="async_web_token_refresh")
+@instrument("async_web_token_refresh", root=True)
+async def async_web_token_refresh(request: HttpRequest, response: HttpResponse) -> dict:
+    cookie = request.COOKIES.get(ninja_simple_jwt_settings.JWT_REFRESH_COOKIE_NAME)
+    if cookie is None:
+        raise AuthenticationError()
+    try:
+        if ninja_simple_jwt_settings.JWT_REFRESH_TOKEN_ROTATION:
+            (refresh_token, refresh_token_payload), (access_token, _) = await arotate_refresh_token(cookie)
+            _set_refresh_token_cookie(response, refresh_token, refresh_token_payload)
+        else:
+            access_token, _ = await aget_access_token_from_refresh_token(cookie)
+    except PyJWTError:
+        raise AuthenticationError()
+    return {"access": access_token}
+
+
+@async_web_auth_router.post("/sign-out", response={204: Empty}, url_name="async_web_sign_out")
+@instrument("async_web_sign_out", root=True)
+async def async_web_sign_out(request: HttpRequest, response: HttpResponse) -> tuple[int, str]:
+    cookie = request.COOKIES.get(ninja_simple_jwt_settings.JWT_REFRESH_COOKIE_NAME)
+    if cookie is None:
+        raise AuthenticationError()
+    try:
+        await arevoke_refresh_token(cookie)
     except PyJWTError:
         raise AuthenticationError()
+    _delete_refresh_token_cookie(response)
+    return 204, ""
+
+
+@jwks_router.get("/.well-known/jwks.json", auth=None, url_name="jwks")
+def jwks(request: HttpRequest) -> HttpResponse:
+    jwks_document, etag = JwksDocument.get()
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in if_none_match or "*" in if_none_match:
+        response: HttpResponse = HttpResponseNotModified()
+    else:
+        response = JsonResponse(jwks_document, json_dumps_params=JwksDocument.json_dumps_params)
+    response["ETag"] = etag
+    response["Cache-Control"] = f"public, max-age={ninja_simple_jwt_settings.JWT_JWKS_MAX_AGE}"
+    return response
+
+
+def _set_refresh_token_cookie(response: HttpResponse, refresh_token: str, refresh_token_payload: dict) -> None:
+    response.set_cookie(
+        key=ninja_simple_jwt_settings.JWT_REFRESH_COOKIE_NAME,
+        value=refresh_token,
+        expires=datetime.fromtimestamp(refresh_token_payload["exp"], timezone.utc),
+        httponly=ninja_simple_jwt_settings.WEB_REFRESH_COOKIE_HTTP_ONLY,
+        samesite=ninja_simple_jwt_settings.WEB_REFRESH_COOKIE_SAME_SITE_POLICY,
+        secure=ninja_simple_jwt_settings.WEB_REFRESH_COOKIE_SECURE,
+        path=ninja_simple_jwt_settings.WEB_REFRESH_COOKIE_PATH,
+    )
+
+
+def _delete_refresh_token_cookie(response: HttpResponse) -> None:
     response.delete_cookie(
         key=ninja_simple_jwt_settings.JWT_REFRESH_COOKIE_NAME, path=ninja_simple_jwt_settings.WEB_REFRESH_COOKIE_PATH
     )
-    return 204, ""
+
+
+async def _asend_user_logged_in(request: HttpRequest, user: AbstractBaseUser) -> None:
+    if hasattr(user_logged_in, "asend"):
+        await user_logged_in.asend(sender=user.__class__, request=request, user=user)
+    else:  # Django < 5.0
+        await sync_to_async(user_logged_in.send)(sender=user.__class__, request=request, user=user)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from ninja import Schema
 
 
@@ -17,6 +19,7 @@ class MobileTokenRefreshRequest(Schema):
 
 class MobileTokenRefreshResponse(Schema):
     access: str
+    refresh: Optional[str] = None
 
 
 class WebSignInResponse(Schema):
@@ -0,0 +1,104 @@
+from typing import Any, Callable, Optional
+
+from cryptography.exceptions import UnsupportedAlgorithm
+from django.core.checks import CheckMessage, Error, Warning, register  # pylint: disable=W0622
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair, get_key_id
+from ninja_simple_jwt.jwt.revocation import can_list_revoked_tokens
+from ninja_simple_jwt.jwt.user_revalidation import get_user_pk_claim
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+KEY_PARSING_ERRORS = (ValueError, TypeError, UnsupportedAlgorithm)
+
+
+@register()
+def check_jwt_keys(app_configs: Any, **kwargs: Any) -> list[CheckMessage]:  # pylint: disable=unused-argument
+    """Report missing or invalid signing keys, and other misconfiguration, at startup rather than on first request."""
+    messages: list[CheckMessage] = []
+    if (
+        ninja_simple_jwt_settings.JWT_REFRESH_TOKEN_ROTATION
+        and ninja_simple_jwt_settings.JWT_REVOCATION_STORE_CLS is None
+    ):
+        messages.append(
+            Warning(
+                "JWT_REFRESH_TOKEN_ROTATION is enabled without JWT_REVOCATION_STORE_CLS, rotated refresh tokens stay "
+                "valid until they expire.",
+                id="ninja_simple_jwt.W003",
+            )
+        )
+    store_cls = ninja_simple_jwt_settings.JWT_REVOCATION_STORE_CLS
+    if (
+        store_cls is not None
+        and ninja_simple_jwt_settings.JWT_REVOCATION_BLOOM_FILTER
+        and not can_list_revoked_tokens(import_string(store_cls))
+    ):
+        messages.append(
+            Error(
+                f"JWT_REVOCATION_BLOOM_FILTER needs a store that can list revoked tokens, {store_cls} cannot.",
+                hint='Use "ninja_simple_jwt.jwt.revocation.DatabaseRevocationStore".',
+                id="ninja_simple_jwt.E007",
+            )
+        )
+    if ninja_simple_jwt_settings.JWT_REFRESH_USER_REVALIDATION:
+        try:
+            get_user_pk_claim()
+        except ImproperlyConfigured as e:
+            messages.append(Error(str(e), id="ninja_simple_jwt.E006"))
+
+    source = ninja_simple_jwt_settings.JWT_PUBLIC_KEY_SOURCE
+    if source == "jwks":
+        if not ninja_simple_jwt_settings.JWT_JWKS_URL:
+            messages.append(
+                Error('JWT_JWKS_URL must be set when JWT_PUBLIC_KEY_SOURCE is "jwks".', id="ninja_simple_jwt.E001")
+            )
+        return messages
+    if source != "storage":
+        messages.append(Error(f"Unknown JWT_PUBLIC_KEY_SOURCE {source!r}.", id="ninja_simple_jwt.E002"))
+        return messages
+
+    private_key = _check_key(
+        lambda: InMemoryJwtKeyPair.parsed_private_key,
+        ninja_simple_jwt_settings.JWT_PRIVATE_KEY_PATH,
+        messages,
+        missing_id="ninja_simple_jwt.W001",
+        invalid_id="ninja_simple_jwt.E003",
+    )
+    public_key = _check_key(
+        lambda: InMemoryJwtKeyPair.parsed_public_key,
+        ninja_simple_jwt_settings.JWT_PUBLIC_KEY_PATH,
+        messages,
+        missing_id="ninja_simple_jwt.W002",
+        invalid_id="ninja_simple_jwt.E004",
+    )
+    if private_key is not None and public_key is not None:
+        if get_key_id(private_key.public_key()) != get_key_id(public_key):
+            messages.append(
+                Error(
+                    "JWT public key does not match the private key.",
+                    hint="Run `manage.py make_signing_key` to create a new key pair.",
+                    id="ninja_simple_jwt.E005",
+                )
+            )
+    return messages
+
+
+def _check_key(
+    load_key: Callable[[], Any], path: str, messages: list[CheckMessage], missing_id: str, invalid_id: str
+) -> Optional[Any]:
+    try:
+        return load_key()
+    except FileNotFoundError:
+        messages.append(
+            Warning(
+                f"JWT key {path!r} was not found.",
+                hint="Run `manage.py make_signing_key` to create a key pair.",
+                id=missing_id,
+            )
+        )
+    except OSError as e:
+        messages.append(Error(f"JWT key {path!r} could not be read: {e}", id=invalid_id))
+    except KEY_PARSING_ERRORS as e:
+        messages.append(Error(f"JWT key {path!r} is not a valid PEM key: {e}", id=invalid_id))
+    return None
@@ -0,0 +1,33 @@
+import time
+from typing import Optional, Tuple
+
+from ninja_simple_jwt.jwt.expiring_lru_cache import ExpiringLruCache
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+
+class AccessTokenMemo(ExpiringLruCache):
+    """Bounded LRU memo of the last access token issued from each refresh token, keyed by the refresh token jti.
+
+    A refresh repeated within JWT_ACCESS_TOKEN_REUSE_WINDOW gets the memoized access token instead of a newly signed
+    one, as long as it is still valid and was signed with the current signing key.
+    """
+
+    @property
+    def max_size(self) -> int:
+        if ninja_simple_jwt_settings.JWT_ACCESS_TOKEN_REUSE_WINDOW.total_seconds() <= 0:
+            return 0
+        return ninja_simple_jwt_settings.JWT_ACCESS_TOKEN_REUSE_SIZE
+
+    def get(self, refresh_jti: str, kid: str) -> Optional[Tuple[str, dict]]:
+        entry = self._get(refresh_jti, is_valid=lambda entry: entry[0] == kid)
+        if entry is None:
+            return None
+        _, access_token, payload = entry
+        return access_token, dict(payload)
+
+    def set(self, refresh_jti: str, kid: str, access_token: str, payload: dict) -> None:
+        window = ninja_simple_jwt_settings.JWT_ACCESS_TOKEN_REUSE_WINDOW.total_seconds()
+        self._set(refresh_jti, (kid, access_token, dict(payload)), min(time.time() + window, payload["exp"]))
+
+
+access_token_memo = AccessTokenMemo()
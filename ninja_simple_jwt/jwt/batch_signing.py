@@ -0,0 +1,25 @@
+"""Token signing for the worker processes of `issue_tokens_for_users`.
+
+This module imports nothing from Django, so spawned workers start without setting Django up.
+"""
+
+from typing import Any
+
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from jwt import api_jws
+
+_worker_signer: dict[str, Any] = {}
+
+
+def init_worker(pem_private_key: bytes, algorithm: str, kid: str) -> None:
+    _worker_signer.update(key=load_pem_private_key(pem_private_key, password=None), algorithm=algorithm, kid=kid)
+
+
+def sign_payloads(payloads: list[bytes]) -> list[str]:
+    """Sign serialized token payloads with the key passed to `init_worker`."""
+    return sign_payloads_with(_worker_signer["key"], _worker_signer["algorithm"], _worker_signer["kid"], payloads)
+
+
+def sign_payloads_with(key: Any, algorithm: str, kid: str, payloads: list[bytes]) -> list[str]:
+    headers = {"kid": kid}
+    return [api_jws.encode(payload, key, algorithm=algorithm, headers=headers) for payload in payloads]
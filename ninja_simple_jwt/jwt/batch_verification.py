@@ -0,0 +1,30 @@
+"""Token verification for the pool workers of `decode_tokens`.
+
+This module imports nothing from Django, so spawned workers start without setting Django up.
+"""
+
+from typing import Any, Union
+
+import jwt
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+from jwt import PyJWTError
+
+_worker_keys: dict[bytes, Any] = {}
+
+
+def verify_tokens(pem_public_key: bytes, algorithm: str, tokens: list[str]) -> list[Union[dict, PyJWTError]]:
+    """Verify tokens with a PEM public key, parsing each key once per worker."""
+    key = _worker_keys.get(pem_public_key)
+    if key is None:
+        key = _worker_keys.setdefault(pem_public_key, load_pem_public_key(pem_public_key))
+    return verify_tokens_with(key, algorithm, tokens)
+
+
+def verify_tokens_with(key: Any, algorithm: str, tokens: list[str]) -> list[Union[dict, PyJWTError]]:
+    results: list[Union[dict, PyJWTError]] = []
+    for token in tokens:
+        try:
+            results.append(jwt.decode(token, key, algorithms=[algorithm], options={"require": ["exp"]}))
+        except PyJWTError as e:
+            results.append(e)
+    return results
@@ -0,0 +1,41 @@
+import math
+from hashlib import blake2b
+from threading import Lock
+from typing import Iterator
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, sized for `capacity` items at `error_rate` false positives.
+
+    A lookup never misses an added item, so `item not in bloom_filter` proves the item was never added without asking
+    the backing store. Adding takes a lock, lookups do not.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    def add(self, item: str) -> None:
+        with self._lock:
+            for position in self._get_positions(item):
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._get_positions(item))
+
+    def _get_positions(self, item: str) -> Iterator[int]:
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        first_hash = int.from_bytes(digest[:8], "little")
+        second_hash = int.from_bytes(digest[8:], "little") | 1
+        return ((first_hash + i * second_hash) % self.size for i in range(self.hash_count))
@@ -0,0 +1,62 @@
+from operator import attrgetter
+from typing import Any, Callable, Optional
+
+from django.test.signals import setting_changed
+from django.utils.functional import classproperty
+
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+
+def _make_user_getter(user_attr: str | Callable[[Any], Any]) -> Callable[[Any], Any]:
+    if isinstance(user_attr, str):
+        return attrgetter(user_attr)
+    return user_attr
+
+
+class ClaimMappingPlan:
+    """TOKEN_CLAIM_USER_ATTRIBUTE_MAP compiled into getter/setter slots for both directions of the mapping."""
+
+    __slots__ = ("claims", "user_getters", "user_setters", "user_attribute_claims")
+
+    def __init__(self, claim_user_attribute_map: dict[str, str | Callable[[Any], Any]]) -> None:
+        self.claims: tuple[str, ...] = tuple(claim_user_attribute_map)
+        self.user_getters: tuple[tuple[str, Callable[[Any], Any]], ...] = tuple(
+            (claim, _make_user_getter(user_attr)) for claim, user_attr in claim_user_attribute_map.items()
+        )
+        self.user_setters: tuple[tuple[str, str], ...] = tuple(
+            (claim, user_attr if isinstance(user_attr, str) else claim)
+            for claim, user_attr in claim_user_attribute_map.items()
+        )
+        self.user_attribute_claims: dict[str, str] = {user_attr: claim for claim, user_attr in self.user_setters}
+
+    def get_claims_from_user(self, user: Any) -> dict:
+        return {claim: getter(user) for claim, getter in self.user_getters}
+
+    def get_claims_from_token(self, token: dict) -> dict:
+        return {claim: token.get(claim) for claim in self.claims}
+
+    def set_claims_to_user(self, user: Any, token: dict) -> None:
+        for claim, user_attr in self.user_setters:
+            setattr(user, user_attr, token.get(claim))
+
+
+class ClaimMapping:
+    _plan: Optional[ClaimMappingPlan] = None
+
+    @classproperty
+    def plan(self) -> ClaimMappingPlan:
+        if self._plan is None:
+            self._plan = ClaimMappingPlan(ninja_simple_jwt_settings.TOKEN_CLAIM_USER_ATTRIBUTE_MAP)
+        return self._plan
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._plan = None
+
+
+def clear_claim_mapping_plan(*args: Any, **kwargs: Any) -> None:
+    if kwargs["setting"] == "NINJA_SIMPLE_JWT":
+        ClaimMapping.clear()
+
+
+setting_changed.connect(clear_claim_mapping_plan)
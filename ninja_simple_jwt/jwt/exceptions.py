@@ -0,0 +1,13 @@
+from jwt import InvalidTokenError
+
+
+class IncorrectTokenTypeError(InvalidTokenError):
+    pass
+
+
+class RevokedTokenError(InvalidTokenError):
+    pass
+
+
+class ChangedUserError(InvalidTokenError):
+    pass
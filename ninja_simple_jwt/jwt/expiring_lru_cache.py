@@ -0,0 +1,64 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+
+
+class ExpiringLruCache:
+    """Bounded, thread-safe LRU cache whose entries expire at a `time.time()` timestamp.
+
+    Subclasses define `max_size`, read on every call so it follows setting changes (0 disables the cache), and their own
+    `get`/`set` on top of `_get` and `_set`.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        raise NotImplementedError()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+    def _get(self, key: Hashable, is_valid: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """Value of an unexpired entry, dropping the entry instead when `is_valid` rejects it."""
+        if self.max_size <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if time.time() >= expires_at or (is_valid is not None and not is_valid(value)):
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def _set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        max_size = self.max_size
+        if max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
@@ -0,0 +1,117 @@
+import mmap
+import os
+import struct
+import tempfile
+import time
+from contextlib import contextmanager
+from hashlib import sha256
+from types import ModuleType
+from typing import Callable, Iterator, NamedTuple, Optional
+
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+fcntl: Optional[ModuleType]
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+CHECK_INTERVAL = 1.0
+
+MAGIC = b"NSJWTKC1"
+HEADER = struct.Struct(f"<{len(MAGIC)}sQIII")
+
+
+class HostKeys(NamedTuple):
+    version: int
+    private_key: bytes
+    public_key: bytes
+    public_keyring: bytes
+
+
+class HostKeyCache:
+    """Key PEM files shared by the worker processes of a host through one memory-mapped file.
+
+    The file starts with a version derived from its content, so workers only read the header to compare versions, and
+    only copy and re-parse keys when they changed. A missing file, or one older than `max_age`, is refilled from key
+    storage by a single process while the others wait on a file lock.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._host_keys: Optional[HostKeys] = None  # last keys read or written, returned while the version matches
+
+    def load(self, read_key_files: Callable[[], tuple[bytes, bytes, bytes]], max_age: Optional[float]) -> HostKeys:
+        host_keys = self._read(max_age)
+        if host_keys is None:
+            with self._lock():
+                host_keys = self._read(max_age)  # another process may have refilled it while this one waited
+                if host_keys is None:
+                    host_keys = self.write(*read_key_files())
+        return host_keys
+
+    def write(self, private_key: bytes, public_key: bytes, public_keyring: bytes) -> HostKeys:
+        content = private_key + public_key + public_keyring
+        version = int.from_bytes(sha256(content).digest()[:8], "little")
+        header = HEADER.pack(MAGIC, version, len(private_key), len(public_key), len(public_keyring))
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".jwt-keys-")  # created with 0600 permissions
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header + content)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._host_keys = HostKeys(version, private_key, public_key, public_keyring)
+        return self._host_keys
+
+    def _read(self, max_age: Optional[float]) -> Optional[HostKeys]:
+        try:
+            with open(self.path, "rb") as f:
+                if max_age is not None and time.time() - os.fstat(f.fileno()).st_mtime >= max_age:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    magic, version, private_size, public_size, keyring_size = HEADER.unpack_from(content)
+                    if magic != MAGIC or len(content) != HEADER.size + private_size + public_size + keyring_size:
+                        return None
+                    host_keys = self._host_keys
+                    if host_keys is not None and host_keys.version == version:
+                        return host_keys
+                    public_start = HEADER.size + private_size
+                    keyring_start = public_start + public_size
+                    self._host_keys = HostKeys(
+                        version,
+                        content[HEADER.size : public_start],
+                        content[public_start:keyring_start],
+                        content[keyring_start:],
+                    )
+                    return self._host_keys
+        except (OSError, ValueError, struct.error):
+            return None
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "wb") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+_host_key_caches: dict[str, HostKeyCache] = {}
+
+
+def get_host_key_cache() -> Optional[HostKeyCache]:
+    path = ninja_simple_jwt_settings.JWT_HOST_KEY_CACHE_PATH
+    if path is None:
+        return None
+    host_key_cache = _host_key_caches.get(path)
+    if host_key_cache is None:
+        host_key_cache = _host_key_caches.setdefault(path, HostKeyCache(path))
+    return host_key_cache
@@ -1,8 +1,26 @@
-from typing import Any
+import json
+from json import JSONEncoder
+from types import ModuleType
+from typing import Any, Callable, Optional
 from uuid import UUID
 
 from django.core.serializers.json import DjangoJSONEncoder
 
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetimes and dataclasses are passed to the encoder's `default`, so orjson writes them the way the encoder does.
+ORJSON_OPTIONS = (
+    0
+    if orjson is None
+    else orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+_JSON_PRIMITIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+
 
 class TokenUserEncoder(DjangoJSONEncoder):
     def default(self, o: Any) -> Any:
@@ -10,3 +28,29 @@ class TokenUserEncoder(DjangoJSONEncoder):
             return str(o)
 
         return super().default(o)
+
+
+def dumps(obj: Any, json_encoder: Optional[type[JSONEncoder]] = None) -> bytes:
+    """Serialize obj as compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, default=None if json_encoder is None else json_encoder().default, option=ORJSON_OPTIONS
+        )
+    return json.dumps(obj, separators=(",", ":"), cls=json_encoder).encode()
+
+
+def to_json_primitive(value: Any, default: Callable[[Any], Any]) -> Any:
+    """Convert value into str, int, float, bool, None, list and dict, serializing other types with `default`.
+
+    Claims converted once this way serialize without calling back into the encoder for every token.
+    """
+    value_type = type(value)
+    if value_type in _JSON_PRIMITIVE_TYPES:
+        return value
+    if value_type is list or value_type is tuple:
+        return [to_json_primitive(item, default) for item in value]
+    if value_type is dict:
+        return {key: to_json_primitive(item, default) for key, item in value.items()}
+    if isinstance(value, (str, int, float)):
+        return value  # subclasses such as str enums serialize like their base type
+    return to_json_primitive(default(value), default)
@@ -0,0 +1,47 @@
+import json
+from hashlib import sha256
+from typing import Any, NamedTuple, Optional
+
+from cryptography.hazmat.primitives.asymmetric.ec import EllipticCurvePublicKey
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+from cryptography.hazmat.primitives.asymmetric.types import PublicKeyTypes
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm, RSAAlgorithm
+
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+
+def make_jwk(kid: str, public_key: PublicKeyTypes) -> dict:
+    if isinstance(public_key, RSAPublicKey):
+        jwk = RSAAlgorithm.to_jwk(public_key)
+    elif isinstance(public_key, EllipticCurvePublicKey):
+        jwk = ECAlgorithm.to_jwk(public_key)
+    else:
+        jwk = OKPAlgorithm.to_jwk(public_key)
+
+    return {**json.loads(jwk), "kid": kid, "use": "sig", "alg": ninja_simple_jwt_settings.JWT_ALGORITHM}
+
+
+class JwksContent(NamedTuple):
+    verification_keys: dict[str, PublicKeyTypes]
+    jwks: dict
+    etag: str
+
+
+class JwksDocument:
+    """JWKS for the current verification keys and its ETag, rebuilt only when the keys are reloaded."""
+
+    json_dumps_params: dict[str, Any] = {"separators": (",", ":")}
+    _content: Optional[JwksContent] = None
+
+    @classmethod
+    def get(cls) -> tuple[dict, str]:
+        """Return the JWKS and the strong ETag of its JSON serialized with `json_dumps_params`."""
+        verification_keys = InMemoryJwtKeyPair.verification_keys
+        content = cls._content
+        if content is None or content.verification_keys is not verification_keys:
+            jwks = {"keys": [make_jwk(kid, public_key) for kid, public_key in verification_keys.items()]}
+            etag = f'"{sha256(json.dumps(jwks, **cls.json_dumps_params).encode()).hexdigest()}"'
+            content = JwksContent(verification_keys, jwks, etag)
+            cls._content = content
+        return content.jwks, content.etag
@@ -1,9 +1,13 @@
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
+from django.core.exceptions import ImproperlyConfigured
 from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
 from django.utils.module_loading import import_string
 
-from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+from ninja_simple_jwt.jwt.host_key_cache import get_host_key_cache
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair, split_pem_public_keys
 from ninja_simple_jwt.settings import ninja_simple_jwt_settings
 
 
@@ -11,22 +15,53 @@ def make_and_save_key_pair() -> tuple[str, str]:
     jwt_private_key_storage = import_string(ninja_simple_jwt_settings.JWT_PRIVATE_KEY_STORAGE)
     jwt_public_key_storage = import_string(ninja_simple_jwt_settings.JWT_PUBLIC_KEY_STORAGE)
     pem_private_key, pem_public_key = make_keys()
+    if ninja_simple_jwt_settings.JWT_PUBLIC_KEYRING_PATH is not None:
+        _retire_current_public_key(jwt_public_key_storage)
     private_key_path = jwt_private_key_storage.save(
         name=ninja_simple_jwt_settings.JWT_PRIVATE_KEY_PATH, content=ContentFile(pem_private_key)
     )
     public_key_path = jwt_public_key_storage.save(
         name=ninja_simple_jwt_settings.JWT_PUBLIC_KEY_PATH, content=ContentFile(pem_public_key)
     )
+    host_key_cache = get_host_key_cache()
+    if host_key_cache is not None:
+        host_key_cache.write(*InMemoryJwtKeyPair.read_key_files())
     InMemoryJwtKeyPair.clear()
     return private_key_path, public_key_path
 
 
+def _retire_current_public_key(jwt_public_key_storage: Storage) -> None:
+    """Move the current public key to the front of the keyring, so tokens it signed keep verifying after rotation."""
+    try:
+        with jwt_public_key_storage.open(ninja_simple_jwt_settings.JWT_PUBLIC_KEY_PATH) as f:
+            current_public_keys = split_pem_public_keys(f.read())
+    except FileNotFoundError:
+        return
+
+    try:
+        with jwt_public_key_storage.open(ninja_simple_jwt_settings.JWT_PUBLIC_KEYRING_PATH) as f:
+            retired_public_keys = split_pem_public_keys(f.read())
+    except FileNotFoundError:
+        retired_public_keys = []
+
+    keyring = [*current_public_keys, *(key for key in retired_public_keys if key not in current_public_keys)]
+    jwt_public_key_storage.save(
+        name=ninja_simple_jwt_settings.JWT_PUBLIC_KEYRING_PATH,
+        content=ContentFile(b"".join(keyring[: ninja_simple_jwt_settings.JWT_PUBLIC_KEYRING_SIZE])),
+    )
+
+
 def make_keys() -> tuple[bytes, bytes]:
-    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    algorithm = ninja_simple_jwt_settings.JWT_ALGORITHM
+    private_key = _generate_private_key(algorithm)
 
     pem_private_key = private_key.private_bytes(
         encoding=serialization.Encoding.PEM,
-        format=serialization.PrivateFormat.TraditionalOpenSSL,
+        format=(
+            serialization.PrivateFormat.TraditionalOpenSSL
+            if algorithm == "RS256"
+            else serialization.PrivateFormat.PKCS8
+        ),
         encryption_algorithm=serialization.NoEncryption(),
     )
 
@@ -35,3 +70,13 @@ def make_keys() -> tuple[bytes, bytes]:
     )
 
     return pem_private_key, pem_public_key
+
+
+def _generate_private_key(algorithm: str) -> PrivateKeyTypes:
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ImproperlyConfigured(f"Unsupported JWT_ALGORITHM: {algorithm}")
@@ -1,24 +1,307 @@
+import logging
+import re
+import time
+from base64 import urlsafe_b64encode
+from hashlib import sha256
+from threading import Lock
+from typing import NamedTuple, Optional
+
+from asgiref.sync import sync_to_async
+from cryptography.exceptions import UnsupportedAlgorithm
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes, PublicKeyTypes
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    PublicFormat,
+    load_pem_private_key,
+    load_pem_public_key,
+)
 from django.utils.functional import classproperty
 from django.utils.module_loading import import_string
+from jwt import InvalidTokenError, PyJWTError
 
+from ninja_simple_jwt.jwt.host_key_cache import CHECK_INTERVAL, HostKeys, get_host_key_cache
+from ninja_simple_jwt.jwt.remote_jwks import UNKNOWN_KID_REFRESH_INTERVAL, remote_jwks
+from ninja_simple_jwt.jwt.verified_token_cache import verified_token_cache
+from ninja_simple_jwt.metrics import count_key_load, instrument
 from ninja_simple_jwt.settings import ninja_simple_jwt_settings
 
+logger = logging.getLogger(__name__)
+
+KEY_LOADING_ERRORS = (OSError, ValueError, TypeError, UnsupportedAlgorithm)
+
+PEM_PUBLIC_KEY_PATTERN = re.compile(rb"-----BEGIN PUBLIC KEY-----.+?-----END PUBLIC KEY-----\n?", re.DOTALL)
+
+
+def get_key_id(public_key: PublicKeyTypes) -> str:
+    """Derive a stable kid from the public key, so every process names the same key the same way."""
+    der_public_key = public_key.public_bytes(encoding=Encoding.DER, format=PublicFormat.SubjectPublicKeyInfo)
+    return urlsafe_b64encode(sha256(der_public_key).digest()[:16]).rstrip(b"=").decode()
+
+
+def split_pem_public_keys(pem_bundle: bytes) -> list[bytes]:
+    return PEM_PUBLIC_KEY_PATTERN.findall(pem_bundle)
+
+
+class SigningKey(NamedTuple):
+    """Private key PEM, the key parsed from it and its kid, published together so they never mismatch."""
+
+    pem: bytes
+    key: PrivateKeyTypes
+    kid: str
+
+
+class PublicKeys(NamedTuple):
+    """Public key PEM, the key parsed from it and the keys accepted for verification, published together so a reader
+    never sees one of them without the others.
+    """
+
+    pem: bytes
+    key: PublicKeyTypes
+    verification_keys: dict[str, PublicKeyTypes]
+
 
 class InMemoryJwtKeyPair:
-    _private_key = None
-    _public_key = None
+    """Keys read from storage once per process and kept parsed in memory.
+
+    Each key is loaded by a single thread while the others wait for it, instead of every thread of a cold worker
+    reading storage at once. With JWT_KEY_REFRESH_INTERVAL set, keys are reloaded after that interval so rotated keys
+    are picked up without a restart; one thread reloads while the others keep using the current keys. Once keys are
+    loaded, reading them takes no lock.
+
+    With JWT_HOST_KEY_CACHE_PATH set, keys are read from a file shared by the worker processes of the host instead of
+    from storage, and re-parsed only when its version changes.
+    """
+
+    _signing_key: Optional[SigningKey] = None
+    _public_keys: Optional[PublicKeys] = None
+    _private_key_expires_at = 0.0
+    _public_key_expires_at = 0.0
+    _private_key_version: Optional[int] = None
+    _public_key_version: Optional[int] = None
+    _private_key_lock = Lock()
+    _public_key_lock = Lock()
+
+    @classproperty
+    def signing_key(self) -> SigningKey:
+        """Private key with its kid, read as one value so a reload cannot pair a key with another key's kid."""
+        signing_key = self._signing_key
+        if signing_key is None or time.monotonic() >= self._private_key_expires_at:
+            return self._load_private_key()
+        return signing_key
 
     @classproperty
     def private_key(self) -> bytes:
-        if self._private_key is None:
-            self._private_key = self._get_private_jwt_key()
-        return self._private_key
+        return self.signing_key.pem
+
+    @classproperty
+    def public_keys(self) -> PublicKeys:
+        """Public key with the verification keys, read as one value so a reload cannot pair them with other keys."""
+        public_keys = self._public_keys
+        if public_keys is None or time.monotonic() >= self._public_key_expires_at:
+            return self._load_public_key()
+        return public_keys
 
     @classproperty
     def public_key(self) -> bytes:
-        if self._public_key is None:
-            self._public_key = self._get_public_jwt_key()
-        return self._public_key
+        return self.public_keys.pem
+
+    @classproperty
+    def parsed_private_key(self) -> PrivateKeyTypes:
+        """Private key loaded into a cryptography key object, so signing does not re-parse the PEM."""
+        return self.signing_key.key
+
+    @classproperty
+    def parsed_public_key(self) -> PublicKeyTypes:
+        """Public key loaded into a cryptography key object, so verification does not re-parse the PEM."""
+        return self.public_keys.key
+
+    @classproperty
+    def signing_key_id(self) -> str:
+        """kid stamped in the header of every token signed with the private key."""
+        return self.signing_key.kid
+
+    @classproperty
+    def verification_keys(self) -> dict[str, PublicKeyTypes]:
+        """Public keys accepted for verification indexed by kid.
+
+        With JWT_PUBLIC_KEY_SOURCE "storage" these are the current key plus retired keys in the keyring, with "jwks"
+        they are the keys published at JWT_JWKS_URL.
+        """
+        if ninja_simple_jwt_settings.JWT_PUBLIC_KEY_SOURCE == "jwks":
+            return remote_jwks.keys
+        return self.public_keys.verification_keys
+
+    @classmethod
+    def preload(cls) -> None:
+        """Load and parse the keys up front, so the first request after startup does not pay for storage I/O."""
+        attrs = ["verification_keys"]
+        if ninja_simple_jwt_settings.JWT_PUBLIC_KEY_SOURCE == "storage":
+            attrs.insert(0, "signing_key_id")
+        for attr in attrs:
+            try:
+                getattr(cls, attr)
+            except (*KEY_LOADING_ERRORS, PyJWTError) as e:
+                logger.warning("Could not preload JWT %s, it will be loaded on first use: %s", attr, e)
+
+    @classmethod
+    def get_verification_key(cls, kid: Optional[str]) -> PublicKeyTypes:
+        if kid is None:
+            if ninja_simple_jwt_settings.JWT_PUBLIC_KEY_SOURCE == "jwks":
+                raise InvalidTokenError("Missing key id in JWT.")
+            return cls.parsed_public_key
+        verification_key = cls.verification_keys.get(kid)
+        if verification_key is None:
+            if ninja_simple_jwt_settings.JWT_PUBLIC_KEY_SOURCE == "jwks":
+                # the issuer may have rotated to a key published after the last fetch
+                remote_jwks.request_refresh(min_age=UNKNOWN_KID_REFRESH_INTERVAL)
+            raise InvalidTokenError("Unknown key id in JWT.")
+        return verification_key
+
+    @classmethod
+    async def aget_parsed_private_key(cls) -> PrivateKeyTypes:
+        """Load the private key off the event loop, so storage I/O (ie: S3) does not block other requests."""
+        signing_key = cls._signing_key
+        if signing_key is None or time.monotonic() >= cls._private_key_expires_at:
+            return await sync_to_async(lambda: cls.parsed_private_key, thread_sensitive=False)()
+        return signing_key.key
+
+    @classmethod
+    async def aget_parsed_public_key(cls) -> PublicKeyTypes:
+        """Load the public key off the event loop, so storage I/O (ie: S3) does not block other requests."""
+        public_keys = cls._public_keys
+        if public_keys is None or time.monotonic() >= cls._public_key_expires_at:
+            return await sync_to_async(lambda: cls.parsed_public_key, thread_sensitive=False)()
+        return public_keys.key
+
+    @classmethod
+    async def aget_verification_keys(cls) -> dict[str, PublicKeyTypes]:
+        if ninja_simple_jwt_settings.JWT_PUBLIC_KEY_SOURCE == "jwks":
+            if not remote_jwks.has_keys:
+                return await sync_to_async(lambda: remote_jwks.keys, thread_sensitive=False)()
+            return remote_jwks.keys
+        public_keys = cls._public_keys
+        if public_keys is None or time.monotonic() >= cls._public_key_expires_at:
+            return await sync_to_async(lambda: cls.verification_keys, thread_sensitive=False)()
+        return public_keys.verification_keys
+
+    @classmethod
+    @instrument("load_private_key")
+    def _load_private_key(cls) -> SigningKey:
+        signing_key = cls._signing_key
+        # Only a cold start waits for the lock, a refresh already in progress keeps serving the current key.
+        if signing_key is None:
+            cls._private_key_lock.acquire()  # pylint: disable=consider-using-with
+        elif not cls._private_key_lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+            return signing_key
+        try:
+            signing_key = cls._signing_key
+            if signing_key is not None and time.monotonic() < cls._private_key_expires_at:
+                return signing_key  # loaded by the thread that held the lock
+            try:
+                host_keys = cls._get_host_keys()
+                if host_keys is None:
+                    private_key = cls._get_private_jwt_key()
+                elif signing_key is not None and host_keys.version == cls._private_key_version:
+                    cls._private_key_expires_at = cls._get_expiry()
+                    count_key_load("private", "unchanged")
+                    return signing_key
+                elif not host_keys.private_key:
+                    raise FileNotFoundError(ninja_simple_jwt_settings.JWT_PRIVATE_KEY_PATH)
+                else:
+                    private_key = host_keys.private_key
+                parsed_private_key = load_pem_private_key(private_key, password=None)
+            except KEY_LOADING_ERRORS as e:
+                count_key_load("private", "failed")
+                if signing_key is None:
+                    raise
+                logger.warning("Failed to reload JWT private key, keeping the current key: %s", e)
+            else:
+                count_key_load("private", "loaded")
+                signing_key = SigningKey(private_key, parsed_private_key, get_key_id(parsed_private_key.public_key()))
+                cls._signing_key = signing_key
+                cls._private_key_version = None if host_keys is None else host_keys.version
+            cls._private_key_expires_at = cls._get_expiry()
+            return signing_key
+        finally:
+            cls._private_key_lock.release()
+
+    @classmethod
+    @instrument("load_public_key")
+    def _load_public_key(cls) -> PublicKeys:
+        public_keys = cls._public_keys
+        # Only a cold start waits for the lock, a refresh already in progress keeps serving the current keys.
+        if public_keys is None:
+            cls._public_key_lock.acquire()  # pylint: disable=consider-using-with
+        elif not cls._public_key_lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+            return public_keys
+        try:
+            public_keys = cls._public_keys
+            if public_keys is not None and time.monotonic() < cls._public_key_expires_at:
+                return public_keys  # loaded by the thread that held the lock
+            try:
+                host_keys = cls._get_host_keys()
+                if host_keys is None:
+                    public_key = cls._get_public_jwt_key()
+                    public_keyring = cls._get_public_keyring()
+                elif public_keys is not None and host_keys.version == cls._public_key_version:
+                    cls._public_key_expires_at = cls._get_expiry()
+                    count_key_load("public", "unchanged")
+                    return public_keys
+                else:
+                    public_key = host_keys.public_key
+                    public_keyring = [
+                        load_pem_public_key(key) for key in split_pem_public_keys(host_keys.public_keyring)
+                    ]
+                parsed_public_key = load_pem_public_key(public_key)
+                verification_keys = {get_key_id(key): key for key in public_keyring}
+            except KEY_LOADING_ERRORS as e:
+                count_key_load("public", "failed")
+                if public_keys is None:
+                    raise
+                logger.warning("Failed to reload JWT public keys, keeping the current keys: %s", e)
+            else:
+                count_key_load("public", "loaded")
+                verification_keys[get_key_id(parsed_public_key)] = parsed_public_key
+                if public_keys is not None and verification_keys.keys() != public_keys.verification_keys.keys():
+                    verified_token_cache.clear()
+                public_keys = PublicKeys(public_key, parsed_public_key, verification_keys)
+                cls._public_keys = public_keys
+                cls._public_key_version = None if host_keys is None else host_keys.version
+            cls._public_key_expires_at = cls._get_expiry()
+            return public_keys
+        finally:
+            cls._public_key_lock.release()
+
+    @staticmethod
+    def _get_expiry() -> float:
+        if ninja_simple_jwt_settings.JWT_HOST_KEY_CACHE_PATH is not None:
+            return time.monotonic() + CHECK_INTERVAL
+        refresh_interval = ninja_simple_jwt_settings.JWT_KEY_REFRESH_INTERVAL
+        if refresh_interval is None:
+            return float("inf")
+        return time.monotonic() + refresh_interval.total_seconds()
+
+    @classmethod
+    def _get_host_keys(cls) -> Optional[HostKeys]:
+        host_key_cache = get_host_key_cache()
+        if host_key_cache is None:
+            return None
+        refresh_interval = ninja_simple_jwt_settings.JWT_KEY_REFRESH_INTERVAL
+        return host_key_cache.load(
+            cls.read_key_files, max_age=None if refresh_interval is None else refresh_interval.total_seconds()
+        )
+
+    @classmethod
+    def read_key_files(cls) -> tuple[bytes, bytes, bytes]:
+        """Read the private key, public key and keyring PEM from storage, for the host key cache.
+
+        A missing private key reads as empty, so hosts that only verify tokens can share their keys too.
+        """
+        try:
+            private_key = cls._get_private_jwt_key()
+        except FileNotFoundError:
+            private_key = b""
+        return private_key, cls._get_public_jwt_key(), cls._get_public_keyring_pem()
 
     @staticmethod
     def _get_private_jwt_key() -> bytes:
@@ -32,7 +315,32 @@ class InMemoryJwtKeyPair:
         with jwt_key_storage.open(ninja_simple_jwt_settings.JWT_PUBLIC_KEY_PATH) as f:
             return f.read()
 
+    @staticmethod
+    def _get_public_keyring_pem() -> bytes:
+        if ninja_simple_jwt_settings.JWT_PUBLIC_KEYRING_PATH is None:
+            return b""
+
+        jwt_key_storage = import_string(ninja_simple_jwt_settings.JWT_PUBLIC_KEY_STORAGE)
+        try:
+            with jwt_key_storage.open(ninja_simple_jwt_settings.JWT_PUBLIC_KEYRING_PATH) as f:
+                return f.read()
+        except FileNotFoundError:
+            return b""
+
+    @classmethod
+    def _get_public_keyring(cls) -> list[PublicKeyTypes]:
+        return [
+            load_pem_public_key(pem_public_key)
+            for pem_public_key in split_pem_public_keys(cls._get_public_keyring_pem())
+        ]
+
     @classmethod
     def clear(cls) -> None:
-        cls._public_key = None
-        cls._private_key = None
+        cls._signing_key = None
+        cls._public_keys = None
+        cls._private_key_expires_at = 0.0
+        cls._public_key_expires_at = 0.0
+        cls._private_key_version = None
+        cls._public_key_version = None
+        remote_jwks.clear()
+        verified_token_cache.clear()
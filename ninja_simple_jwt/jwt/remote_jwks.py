@@ -0,0 +1,157 @@
+import json
+import logging
+import time
+from threading import Lock, Thread
+from typing import Callable, Optional
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from cryptography.hazmat.primitives.asymmetric.types import PublicKeyTypes
+from jwt import PyJWK, PyJWTError
+from jwt.exceptions import PyJWKClientError
+
+from ninja_simple_jwt.jwt.verified_token_cache import verified_token_cache
+from ninja_simple_jwt.metrics import count_key_load
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+logger = logging.getLogger(__name__)
+
+REFRESH_AHEAD_RATIO = 0.8
+UNKNOWN_KID_REFRESH_INTERVAL = 30.0  # seconds between refreshes requested for tokens with an unknown kid
+
+
+class RemoteJwks:
+    """Public keys fetched from JWT_JWKS_URL, indexed by kid.
+
+    Keys are refreshed in a background thread once REFRESH_AHEAD_RATIO of JWT_JWKS_LIFETIME has passed, and stale keys
+    keep being served while that refresh runs, up to JWT_JWKS_STALE_LIFETIME past expiry. Only a cold start (or keys
+    older than that) blocks the request path, and concurrent callers then share a single fetch. Fetches run outside
+    `_lock`, which is only held to claim a refresh and to swap in its result.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = Lock()
+        self._fetch_lock = Lock()
+        self._keys: Optional[dict[str, PublicKeyTypes]] = None
+        self._etag: Optional[str] = None
+        self._fetched_at = 0.0
+        self._retry_at = 0.0
+        self._refreshing = False
+
+    @property
+    def has_keys(self) -> bool:
+        """Whether `keys` can be served without blocking on a fetch."""
+        return self._keys is not None and self._clock() - self._fetched_at < self._max_age
+
+    @property
+    def keys(self) -> dict[str, PublicKeyTypes]:
+        keys = self._keys
+        if keys is None or self._clock() - self._fetched_at >= self._max_age:
+            return self._fetch_blocking()
+
+        if self._clock() - self._fetched_at >= self._refresh_after:
+            self.request_refresh()
+        return keys
+
+    def request_refresh(self, min_age: float = 0.0) -> None:
+        """Start a background refresh, unless one is running, the last attempt failed too recently, or the keys were
+        fetched less than `min_age` seconds ago.
+        """
+        if self._refreshing or not self._lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+            return
+        try:
+            if self._refreshing or self._clock() < self._retry_at or self._clock() - self._fetched_at < min_age:
+                return
+            self._refreshing = True
+        finally:
+            self._lock.release()
+        Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = None
+            self._etag = None
+            self._fetched_at = 0.0
+            self._retry_at = 0.0
+
+    def _fetch_blocking(self) -> dict[str, PublicKeyTypes]:
+        with self._fetch_lock:
+            keys = self._keys
+            if keys is not None and self._clock() - self._fetched_at < self._max_age:
+                return keys  # another thread fetched while this one waited for the lock
+            if self._clock() < self._retry_at:
+                raise PyJWKClientError("Failed to fetch JWKS recently, not retrying yet.")
+            self._refresh()
+            return self._keys  # type: ignore[return-value]
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self._refresh()
+        except PyJWKClientError as e:
+            logger.warning("Failed to refresh JWKS, serving stale keys: %s", e)
+        finally:
+            self._refreshing = False
+
+    def _refresh(self) -> None:
+        lifetime = ninja_simple_jwt_settings.JWT_JWKS_LIFETIME.total_seconds()
+        try:
+            fetched = self._fetch()
+        except Exception as e:  # pylint: disable=W0703
+            count_key_load("jwks", "failed")
+            with self._lock:
+                self._retry_at = self._clock() + lifetime * (1 - REFRESH_AHEAD_RATIO)
+            if isinstance(e, PyJWKClientError):
+                raise
+            raise PyJWKClientError(f"Failed to fetch JWKS: {e}") from e
+
+        count_key_load("jwks", "unchanged" if fetched is None else "loaded")
+        with self._lock:
+            if fetched is not None:
+                keys, self._etag = fetched
+                if self._keys is not None and keys.keys() != self._keys.keys():
+                    verified_token_cache.clear()
+                self._keys = keys
+            self._fetched_at = self._clock()
+
+    def _fetch(self) -> Optional[tuple[dict[str, PublicKeyTypes], Optional[str]]]:
+        """Fetch and parse the JWKS, or return None if the server replied 304 Not Modified."""
+        url = ninja_simple_jwt_settings.JWT_JWKS_URL
+        headers = {"Accept": "application/json"}
+        if self._etag is not None and self._keys is not None:
+            headers["If-None-Match"] = self._etag
+
+        try:
+            with urlopen(Request(url, headers=headers), timeout=ninja_simple_jwt_settings.JWT_JWKS_TIMEOUT) as response:
+                jwks = json.load(response)
+                etag = response.headers.get("ETag")
+        except HTTPError as e:
+            if e.code == 304:
+                return None
+            raise PyJWKClientError(f"Failed to fetch JWKS from {url}: {e}")
+        except (OSError, ValueError) as e:
+            raise PyJWKClientError(f"Failed to fetch JWKS from {url}: {e}")
+
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            try:
+                keys[jwk["kid"]] = PyJWK(jwk).key
+            except (KeyError, PyJWTError):
+                logger.warning("Skipping unusable key in JWKS from %s", url)
+        if not keys:
+            raise PyJWKClientError(f"JWKS from {url} has no usable signing keys.")
+        return keys, etag
+
+    @property
+    def _max_age(self) -> float:
+        return (
+            ninja_simple_jwt_settings.JWT_JWKS_LIFETIME.total_seconds()
+            + ninja_simple_jwt_settings.JWT_JWKS_STALE_LIFETIME.total_seconds()
+        )
+
+    @property
+    def _refresh_after(self) -> float:
+        return ninja_simple_jwt_settings.JWT_JWKS_LIFETIME.total_seconds() * REFRESH_AHEAD_RATIO
+
+
+remote_jwks = RemoteJwks()
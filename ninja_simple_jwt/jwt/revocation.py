@@ -0,0 +1,225 @@
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from django.apps import apps
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.test.signals import setting_changed
+from django.utils.functional import classproperty
+from django.utils.module_loading import import_string
+
+from ninja_simple_jwt.jwt.bloom_filter import BloomFilter
+from ninja_simple_jwt.jwt.synced_snapshot import SyncedSnapshot
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationStore:
+    """Revoked token jti, kept until the token expires. Subclasses implement `revoke` and `is_revoked`."""
+
+    def revoke(self, jti: str, exp: int) -> bool:
+        """Revoke jti until exp, returning False if it was already revoked."""
+        raise NotImplementedError()
+
+    def is_revoked(self, jti: str) -> bool:
+        raise NotImplementedError()
+
+    def is_revoked_in_memory(self, jti: str) -> Optional[bool]:  # pylint: disable=unused-argument
+        """Answer `is_revoked` without I/O when possible, or return None when the store has to be queried."""
+        return None
+
+    def get_revoked_since(self, since: Optional[datetime]) -> Iterable[str]:
+        """jti of unexpired tokens revoked since `since`, so a BloomFilterRevocationStore can mirror the store."""
+        raise NotImplementedError(f"{self.__class__.__name__} cannot list revoked tokens.")
+
+    def purge_expired(self) -> int:
+        """Delete entries of tokens that have expired, returning how many were deleted."""
+        return 0
+
+
+class CacheRevocationStore(RevocationStore):
+    """Revoked jti kept in the JWT_REVOCATION_CACHE_ALIAS cache, expiring together with the token."""
+
+    key_prefix = "ninja_simple_jwt:revoked:"
+
+    def __init__(self) -> None:
+        self.cache = caches[ninja_simple_jwt_settings.JWT_REVOCATION_CACHE_ALIAS]
+
+    def revoke(self, jti: str, exp: int) -> bool:
+        timeout = exp - int(time.time())
+        if timeout <= 0:
+            return True
+        return self.cache.add(f"{self.key_prefix}{jti}", True, timeout=timeout)
+
+    def is_revoked(self, jti: str) -> bool:
+        return self.cache.get(f"{self.key_prefix}{jti}") is not None
+
+
+class DatabaseRevocationStore(RevocationStore):
+    """Revoked jti kept in the RevokedToken table.
+
+    Expired rows are purged at most once per JWT_REVOCATION_PURGE_INTERVAL while revoking, or with the
+    `purge_revoked_tokens` command.
+    """
+
+    def __init__(self) -> None:
+        self.model = apps.get_model("ninja_simple_jwt", "RevokedToken")
+        self._purge_at = 0.0
+
+    def revoke(self, jti: str, exp: int) -> bool:
+        if time.monotonic() >= self._purge_at:
+            self._purge_at = time.monotonic() + ninja_simple_jwt_settings.JWT_REVOCATION_PURGE_INTERVAL.total_seconds()
+            self.purge_expired()
+
+        try:
+            with transaction.atomic():
+                self.model.objects.create(jti=jti, expires_at=datetime.fromtimestamp(exp, timezone.utc))
+        except IntegrityError:
+            return False
+        return True
+
+    def is_revoked(self, jti: str) -> bool:
+        return self.model.objects.filter(jti=jti, expires_at__gt=datetime.now(timezone.utc)).exists()
+
+    def get_revoked_since(self, since: Optional[datetime]) -> Iterable[str]:
+        revoked_tokens = self.model.objects.filter(expires_at__gt=datetime.now(timezone.utc))
+        if since is not None:
+            revoked_tokens = revoked_tokens.filter(revoked_at__gte=since)
+        return revoked_tokens.values_list("jti", flat=True).iterator()
+
+    def purge_expired(self) -> int:
+        deleted, _ = self.model.objects.filter(expires_at__lte=datetime.now(timezone.utc)).delete()
+        return deleted
+
+
+class BloomFilterRevocationStore(SyncedSnapshot[BloomFilter], RevocationStore):
+    """In-process Bloom filter in front of another store, answering "not revoked" without querying it.
+
+    The filter is filled from the store on first use and then synced with tokens revoked by other processes every
+    JWT_REVOCATION_BLOOM_SYNC_INTERVAL, so a token revoked elsewhere can pass for up to that interval. Only jti the
+    filter may contain are looked up in the store. The filter is sized once for JWT_REVOCATION_BLOOM_CAPACITY at
+    JWT_REVOCATION_BLOOM_ERROR_RATE, and rebuilt every JWT_REVOCATION_PURGE_INTERVAL to drop expired tokens.
+    """
+
+    def __init__(self, store: RevocationStore) -> None:
+        super().__init__()
+        self.store = store
+        # Counters are not locked, they may undercount under contention but cost nothing on the hot path.
+        self.lookups = 0
+        self.store_lookups = 0
+        self.store_revoked = 0
+
+    def revoke(self, jti: str, exp: int) -> bool:
+        bloom_filter = self._get()
+        revoked = self.store.revoke(jti, exp)
+        bloom_filter.add(jti)
+        return revoked
+
+    def is_revoked(self, jti: str) -> bool:
+        self.lookups += 1
+        if jti not in self._get():
+            return False
+        return self._is_revoked_in_store(jti)
+
+    def is_revoked_in_memory(self, jti: str) -> Optional[bool]:
+        bloom_filter = self._get_in_memory()
+        if bloom_filter is None or jti in bloom_filter:
+            return None
+        self.lookups += 1
+        return False
+
+    def get_revoked_since(self, since: Optional[datetime]) -> Iterable[str]:
+        return self.store.get_revoked_since(since)
+
+    def purge_expired(self) -> int:
+        return self.store.purge_expired()
+
+    @property
+    def sync_interval(self) -> timedelta:
+        return ninja_simple_jwt_settings.JWT_REVOCATION_BLOOM_SYNC_INTERVAL
+
+    @property
+    def rebuild_interval(self) -> timedelta:
+        return ninja_simple_jwt_settings.JWT_REVOCATION_PURGE_INTERVAL
+
+    def stats(self) -> dict:
+        bloom_filter = self._value
+        lookups, store_lookups, store_revoked = self.lookups, self.store_lookups, self.store_revoked
+        return {
+            "items": 0 if bloom_filter is None else bloom_filter.count,
+            "capacity": ninja_simple_jwt_settings.JWT_REVOCATION_BLOOM_CAPACITY,
+            "error_rate": ninja_simple_jwt_settings.JWT_REVOCATION_BLOOM_ERROR_RATE,
+            "size_bytes": 0 if bloom_filter is None else bloom_filter.size_bytes,
+            "lookups": lookups,
+            "store_lookups": store_lookups,
+            "store_revoked": store_revoked,
+            "store_lookup_rate": store_lookups / lookups if lookups else 0.0,
+            "false_positive_rate": (store_lookups - store_revoked) / lookups if lookups else 0.0,
+        }
+
+    def _is_revoked_in_store(self, jti: str) -> bool:
+        self.store_lookups += 1
+        revoked = self.store.is_revoked(jti)
+        if revoked:
+            self.store_revoked += 1
+        return revoked
+
+    def _build(self) -> BloomFilter:
+        capacity = ninja_simple_jwt_settings.JWT_REVOCATION_BLOOM_CAPACITY
+        bloom_filter = BloomFilter(capacity, ninja_simple_jwt_settings.JWT_REVOCATION_BLOOM_ERROR_RATE)
+        for jti in self.store.get_revoked_since(None):
+            bloom_filter.add(jti)
+        if bloom_filter.count > capacity:
+            logger.warning(
+                "%s revoked tokens exceed JWT_REVOCATION_BLOOM_CAPACITY %s, more checks will query the store.",
+                bloom_filter.count,
+                capacity,
+            )
+        return bloom_filter
+
+    def _update(self, value: BloomFilter, since: datetime) -> None:
+        for jti in self.store.get_revoked_since(since):
+            value.add(jti)
+
+
+def can_list_revoked_tokens(store_cls: type[RevocationStore]) -> bool:
+    """Whether the store implements `get_revoked_since`, which a BloomFilterRevocationStore is filled from."""
+    return store_cls.get_revoked_since is not RevocationStore.get_revoked_since
+
+
+class TokenRevocation:
+    _store: Optional[RevocationStore] = None
+    _loaded = False
+
+    @classproperty
+    def store(self) -> Optional[RevocationStore]:
+        """Configured revocation store, or None when JWT_REVOCATION_STORE_CLS is not set."""
+        if not self._loaded:
+            store_cls = ninja_simple_jwt_settings.JWT_REVOCATION_STORE_CLS
+            store = None if store_cls is None else import_string(store_cls)()
+            if store is not None and ninja_simple_jwt_settings.JWT_REVOCATION_BLOOM_FILTER:
+                if not can_list_revoked_tokens(type(store)):
+                    raise ImproperlyConfigured(
+                        f"JWT_REVOCATION_BLOOM_FILTER needs a store that can list revoked tokens, {store_cls} cannot."
+                    )
+                store = BloomFilterRevocationStore(store)
+            self._store = store
+            self._loaded = True
+        return self._store
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._store = None
+        cls._loaded = False
+
+
+def clear_token_revocation_store(*args: Any, **kwargs: Any) -> None:
+    if kwargs["setting"] == "NINJA_SIMPLE_JWT":
+        TokenRevocation.clear()
+
+
+setting_changed.connect(clear_token_revocation_store)
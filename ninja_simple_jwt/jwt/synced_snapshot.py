@@ -0,0 +1,76 @@
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SyncedSnapshot(Generic[T]):
+    """In-process value mirroring database rows, so the request path reads memory instead of querying.
+
+    The value is built on first use, updated with the rows changed by other processes every `sync_interval`, and
+    rebuilt every `rebuild_interval` to drop rows that no longer matter. Only the first build waits for the lock, a
+    sync already in progress keeps serving the current value.
+
+    Subclasses define `sync_interval` and `rebuild_interval`, read on every sync so they follow setting changes,
+    `_build` and `_update`.
+    """
+
+    sync_overlap = timedelta(minutes=1)  # tolerate clock skew between the processes writing change timestamps
+
+    def __init__(self) -> None:
+        self._value: Optional[T] = None
+        self._synced_at: Optional[datetime] = None
+        self._sync_at = 0.0
+        self._rebuild_at = 0.0
+        self._lock = Lock()
+
+    @property
+    def sync_interval(self) -> timedelta:
+        raise NotImplementedError()
+
+    @property
+    def rebuild_interval(self) -> timedelta:
+        raise NotImplementedError()
+
+    def _build(self) -> T:
+        raise NotImplementedError()
+
+    def _update(self, value: T, since: datetime) -> None:
+        """Apply the rows changed since `since` to the value."""
+        raise NotImplementedError()
+
+    def _get_in_memory(self) -> Optional[T]:
+        """Current value, or None when it has to be built or synced first."""
+        value = self._value
+        if value is None or time.monotonic() >= self._sync_at:
+            return None
+        return value
+
+    def _get(self) -> T:
+        value = self._value
+        if value is not None and time.monotonic() < self._sync_at:
+            return value
+
+        if value is None:
+            self._lock.acquire()  # pylint: disable=consider-using-with
+        elif not self._lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+            return value
+        try:
+            value = self._value
+            if value is not None and time.monotonic() < self._sync_at:
+                return value  # synced by the thread that held the lock
+            now = datetime.now(timezone.utc)
+            synced_at = self._synced_at
+            if value is None or synced_at is None or time.monotonic() >= self._rebuild_at:
+                value = self._build()
+                self._value = value
+                self._rebuild_at = time.monotonic() + self.rebuild_interval.total_seconds()
+            else:
+                self._update(value, synced_at - self.sync_overlap)
+            self._synced_at = now
+            self._sync_at = time.monotonic() + self.sync_interval.total_seconds()
+            return value
+        finally:
+            self._lock.release()
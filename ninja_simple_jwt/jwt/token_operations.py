@@ -1,16 +1,36 @@
+import asyncio
+import os
+from calendar import timegm
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from datetime import datetime
 from enum import Enum
+from functools import partial
 from json import JSONEncoder
-from typing import Any, Optional, Tuple
+from multiprocessing import get_context
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple, Union
 from uuid import uuid4
 
 import jwt
+from asgiref.sync import sync_to_async
+from cryptography.hazmat.primitives.asymmetric.types import PublicKeyTypes
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
 from django.contrib.auth.models import AbstractBaseUser
+from django.db.models import QuerySet
 from django.utils import timezone
 from django.utils.module_loading import import_string
-from jwt import ExpiredSignatureError, InvalidKeyError, InvalidTokenError
+from jwt import InvalidKeyError, InvalidTokenError, PyJWTError, api_jws
 
+from ninja_simple_jwt.jwt.access_token_memo import access_token_memo
+from ninja_simple_jwt.jwt.batch_signing import init_worker, sign_payloads, sign_payloads_with
+from ninja_simple_jwt.jwt.batch_verification import verify_tokens, verify_tokens_with
+from ninja_simple_jwt.jwt.claim_mapping import ClaimMapping
+from ninja_simple_jwt.jwt.exceptions import ChangedUserError, IncorrectTokenTypeError, RevokedTokenError
+from ninja_simple_jwt.jwt.json_encode import dumps, to_json_primitive
 from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+from ninja_simple_jwt.jwt.revocation import TokenRevocation
+from ninja_simple_jwt.jwt.user_revalidation import UserRevalidation
+from ninja_simple_jwt.metrics import instrument
 from ninja_simple_jwt.settings import ninja_simple_jwt_settings
 
 
@@ -19,7 +39,11 @@ class TokenTypes(str, Enum):
     REFRESH = "refresh"
 
 
+_REGISTERED_CLAIMS = frozenset(("jti", "exp", "iat", "token_type"))
+
+
 TokenUserJsonEncoder = import_string(ninja_simple_jwt_settings.TOKEN_USER_ENCODER_CLS)
+_token_user_encoder = TokenUserJsonEncoder()
 
 
 def get_refresh_token_for_user(user: AbstractBaseUser) -> Tuple[str, dict]:
@@ -32,74 +56,513 @@ def get_access_token_for_user(user: AbstractBaseUser) -> Tuple[str, dict]:
     return encode_token(payload, TokenTypes.ACCESS, json_encoder=TokenUserJsonEncoder)
 
 
+async def aget_refresh_token_for_user(user: AbstractBaseUser) -> Tuple[str, dict]:
+    payload = get_token_payload_for_user(user)
+    await InMemoryJwtKeyPair.aget_parsed_private_key()
+    return await _run_crypto_operation(encode_token, payload, TokenTypes.REFRESH, json_encoder=TokenUserJsonEncoder)
+
+
+async def aget_access_token_for_user(user: AbstractBaseUser) -> Tuple[str, dict]:
+    payload = get_token_payload_for_user(user)
+    await InMemoryJwtKeyPair.aget_parsed_private_key()
+    return await _run_crypto_operation(encode_token, payload, TokenTypes.ACCESS, json_encoder=TokenUserJsonEncoder)
+
+
+@instrument("claim_mapping")
 def get_token_payload_for_user(user: AbstractBaseUser) -> dict:
-    return {
-        claim: getattr(user, user_attr) if isinstance(user_attr, str) else user_attr(user)
-        for claim, user_attr in ninja_simple_jwt_settings.TOKEN_CLAIM_USER_ATTRIBUTE_MAP.items()
-    }
+    """User claims, with values TOKEN_USER_ENCODER_CLS would serialize (ie: datetime, UUID) already converted."""
+    return to_json_primitive(ClaimMapping.plan.get_claims_from_user(user), _token_user_encoder.default)
 
 
 def get_access_token_from_refresh_token(refresh_token: str) -> Tuple[str, dict]:
+    """Issue an access token, reusing one issued from refresh_token within JWT_ACCESS_TOKEN_REUSE_WINDOW."""
     decoded = decode_token(refresh_token, token_type=TokenTypes.REFRESH, verify=True)
-    payload = {claim: decoded.get(claim) for claim in ninja_simple_jwt_settings.TOKEN_CLAIM_USER_ATTRIBUTE_MAP}
-    return encode_token(payload, TokenTypes.ACCESS)
+    verify_user_unchanged(decoded)
+    kid = InMemoryJwtKeyPair.signing_key_id
+    memoized = access_token_memo.get(decoded["jti"], kid)
+    if memoized is not None and not (_is_revocable(TokenTypes.ACCESS) and _is_revoked(memoized[1])):
+        return memoized
+    return _issue_memoized_access_token(decoded, kid)
+
+
+async def aget_access_token_from_refresh_token(refresh_token: str) -> Tuple[str, dict]:
+    await InMemoryJwtKeyPair.aget_parsed_private_key()
+    decoded = await adecode_token(refresh_token, token_type=TokenTypes.REFRESH, verify=True)
+    await averify_user_unchanged(decoded)
+    kid = InMemoryJwtKeyPair.signing_key_id
+    memoized = access_token_memo.get(decoded["jti"], kid)
+    if memoized is not None and not (_is_revocable(TokenTypes.ACCESS) and await _ais_revoked(memoized[1])):
+        return memoized
+    return await _run_crypto_operation(_issue_memoized_access_token, decoded, kid)
+
+
+def _issue_memoized_access_token(decoded: dict, kid: str) -> Tuple[str, dict]:
+    payload = ClaimMapping.plan.get_claims_from_token(decoded)
+    access_token, access_token_payload = encode_token(payload, TokenTypes.ACCESS)
+    access_token_memo.set(decoded["jti"], kid, access_token, access_token_payload)
+    return access_token, access_token_payload
+
+
+def rotate_refresh_token(refresh_token: str) -> Tuple[Tuple[str, dict], Tuple[str, dict]]:
+    """Revoke refresh_token and issue a new refresh and access token carrying the same user claims.
+
+    A refresh token can be rotated only once, a second use fails as revoked.
+    """
+    decoded = decode_token(refresh_token, token_type=TokenTypes.REFRESH, verify=True)
+    verify_user_unchanged(decoded)
+    _revoke_rotated_token(decoded)
+    return _issue_rotated_token_pair(decoded)
+
+
+async def arotate_refresh_token(refresh_token: str) -> Tuple[Tuple[str, dict], Tuple[str, dict]]:
+    await InMemoryJwtKeyPair.aget_parsed_private_key()
+    decoded = await adecode_token(refresh_token, token_type=TokenTypes.REFRESH, verify=True)
+    await averify_user_unchanged(decoded)
+    if TokenRevocation.store is not None:
+        await sync_to_async(_revoke_rotated_token)(decoded)  # the revocation store may query the database
+    return await _run_crypto_operation(_issue_rotated_token_pair, decoded)
+
+
+def _revoke_rotated_token(decoded: dict) -> None:
+    store = TokenRevocation.store
+    if store is not None and not store.revoke(decoded["jti"], decoded["exp"]):
+        raise RevokedTokenError("Token has been revoked.")
+
+
+def _issue_rotated_token_pair(decoded: dict) -> Tuple[Tuple[str, dict], Tuple[str, dict]]:
+    payload = ClaimMapping.plan.get_claims_from_token(decoded)
+    now = timezone.now()
+    serialized_payload = _serialize_shared_claims(payload)
+    return (
+        _encode_serialized_token(payload, serialized_payload, TokenTypes.REFRESH, now),
+        _encode_serialized_token(payload, serialized_payload, TokenTypes.ACCESS, now),
+    )
+
+
+def revoke_refresh_token(refresh_token: str) -> dict:
+    """Verify refresh_token and revoke it if a revocation store is configured, returning its claims."""
+    return _revoke_token(refresh_token, TokenTypes.REFRESH)
+
+
+async def arevoke_refresh_token(refresh_token: str) -> dict:
+    return await _arevoke_token(refresh_token, TokenTypes.REFRESH)
+
+
+def revoke_access_token(access_token: str) -> dict:
+    """Verify access_token and revoke it if a revocation store is configured, returning its claims.
+
+    Revoked access tokens are only rejected with JWT_ACCESS_TOKEN_REVOCATION enabled.
+    """
+    return _revoke_token(access_token, TokenTypes.ACCESS)
+
+
+async def arevoke_access_token(access_token: str) -> dict:
+    return await _arevoke_token(access_token, TokenTypes.ACCESS)
+
+
+def verify_not_revoked(payload: dict) -> None:
+    if _is_revoked(payload):
+        raise RevokedTokenError("Token has been revoked.")
+
+
+async def averify_not_revoked(payload: dict) -> None:
+    if await _ais_revoked(payload):
+        raise RevokedTokenError("Token has been revoked.")
+
+
+def verify_user_unchanged(payload: dict) -> None:
+    """With JWT_REFRESH_USER_REVALIDATION, reject refresh tokens of users that are inactive or changed since."""
+    snapshot = UserRevalidation.snapshot
+    if snapshot is not None and not snapshot.is_valid(payload):
+        raise ChangedUserError("User is inactive or has changed since the token was issued.")
+
+
+async def averify_user_unchanged(payload: dict) -> None:
+    snapshot = UserRevalidation.snapshot
+    if snapshot is not None and snapshot.is_valid_in_memory(payload) is not True:
+        await sync_to_async(verify_user_unchanged)(payload)  # the snapshot may sync from the database
+
+
+def _is_revoked(payload: dict) -> bool:
+    store = TokenRevocation.store
+    return store is not None and store.is_revoked(payload["jti"])
+
+
+async def _ais_revoked(payload: dict) -> bool:
+    store = TokenRevocation.store
+    if store is None:
+        return False
+    revoked = store.is_revoked_in_memory(payload["jti"])
+    if revoked is not None:
+        return revoked
+    return await sync_to_async(store.is_revoked)(payload["jti"])  # the revocation store may query the database
+
+
+def _revoke_token(token: str, token_type: TokenTypes) -> dict:
+    decoded = decode_token(token, token_type=token_type, verify=True)
+    store = TokenRevocation.store
+    if store is not None:
+        store.revoke(decoded["jti"], decoded["exp"])
+    return decoded
+
+
+async def _arevoke_token(token: str, token_type: TokenTypes) -> dict:
+    decoded = await adecode_token(token, token_type=token_type, verify=True)
+    store = TokenRevocation.store
+    if store is not None:
+        await sync_to_async(store.revoke)(decoded["jti"], decoded["exp"])  # the store may query the database
+    return decoded
+
+
+def get_token_pair_for_user(user: AbstractBaseUser) -> Tuple[Tuple[str, dict], Tuple[str, dict]]:
+    """Issue a refresh and an access token for user, building and serializing the user claims only once."""
+    payload = get_token_payload_for_user(user)
+    now = timezone.now()
+    serialized_payload = _serialize_shared_claims(payload, TokenUserJsonEncoder)
+    return (
+        _encode_serialized_token(payload, serialized_payload, TokenTypes.REFRESH, now),
+        _encode_serialized_token(payload, serialized_payload, TokenTypes.ACCESS, now),
+    )
+
+
+async def aget_token_pair_for_user(user: AbstractBaseUser) -> Tuple[Tuple[str, dict], Tuple[str, dict]]:
+    await InMemoryJwtKeyPair.aget_parsed_private_key()
+    return await _run_crypto_operation(get_token_pair_for_user, user)
+
+
+IssuedTokens = Tuple[Any, dict[TokenTypes, Tuple[str, dict]]]
+_TokenPayloadChunk = list[Tuple[Any, list[Tuple[TokenTypes, bytes, dict]]]]
+
+
+def issue_tokens_for_users(
+    users: QuerySet,
+    token_types: Sequence[TokenTypes] = (TokenTypes.ACCESS,),
+    workers: Optional[int] = None,
+    chunk_size: int = 200,
+) -> Iterator[IssuedTokens]:
+    """Issue tokens for every user in the queryset, yielding (user pk, {token type: (token, payload)}) in order.
 
+    Users are streamed with `iterator()`, loading only the fields the claims are built from, and their claims are
+    serialized once for all token types. Tokens are signed in chunks on a pool of `workers` processes
+    (`os.cpu_count()` by default), or in this process with `workers=0`.
+    """
+    chunks = _make_token_payload_chunks(
+        _only_claim_fields(users).iterator(chunk_size=chunk_size), token_types, timezone.now(), chunk_size
+    )
+    signing_key = InMemoryJwtKeyPair.signing_key
+    algorithm = ninja_simple_jwt_settings.JWT_ALGORITHM
+
+    if workers == 0:
+        sign = partial(sign_payloads_with, signing_key.key, algorithm, signing_key.kid)
+        for chunk in chunks:
+            yield from _collect_issued_tokens(chunk, sign([token_payload for _, token_payload, _ in _flatten(chunk)]))
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=init_worker,
+        initargs=(signing_key.pem, algorithm, signing_key.kid),
+    ) as executor:
+        pending: deque[Tuple[_TokenPayloadChunk, Future]] = deque()
+        for chunk in chunks:
+            pending.append(
+                (chunk, executor.submit(sign_payloads, [token_payload for _, token_payload, _ in _flatten(chunk)]))
+            )
+            if len(pending) > 2 * workers:  # bound memory while keeping every worker busy
+                chunk, future = pending.popleft()
+                yield from _collect_issued_tokens(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from _collect_issued_tokens(chunk, future.result())
+
+
+def _only_claim_fields(users: QuerySet) -> QuerySet:
+    """Restrict the queryset to the fields named in TOKEN_CLAIM_USER_ATTRIBUTE_MAP, unless a claim is computed."""
+    field_names = {field.name for field in users.model._meta.concrete_fields}
+    user_attrs = ninja_simple_jwt_settings.TOKEN_CLAIM_USER_ATTRIBUTE_MAP.values()
+    if not all(isinstance(user_attr, str) and user_attr in field_names for user_attr in user_attrs):
+        return users
+    return users.only(*user_attrs)
+
+
+def _make_token_payload_chunks(
+    users: Iterable[AbstractBaseUser], token_types: Sequence[TokenTypes], now: datetime, chunk_size: int
+) -> Iterator[_TokenPayloadChunk]:
+    chunk: _TokenPayloadChunk = []
+    for user in users:
+        payload = get_token_payload_for_user(user)
+        serialized_payload = _serialize_shared_claims(payload, TokenUserJsonEncoder)
+        chunk.append(
+            (
+                user.pk,
+                [
+                    (token_type, *_make_serialized_token_payload(payload, serialized_payload, token_type, now))
+                    for token_type in token_types
+                ],
+            )
+        )
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _flatten(chunk: _TokenPayloadChunk) -> Iterator[Tuple[TokenTypes, bytes, dict]]:
+    for _, token_payloads in chunk:
+        yield from token_payloads
 
+
+def _collect_issued_tokens(chunk: _TokenPayloadChunk, tokens: list[str]) -> Iterator[IssuedTokens]:
+    payload_count = sum(len(token_payloads) for _, token_payloads in chunk)
+    if len(tokens) != payload_count:
+        raise RuntimeError(f"Signing returned {len(tokens)} tokens for {payload_count} token payloads.")
+    signed_tokens = iter(tokens)
+    for pk, token_payloads in chunk:
+        yield pk, {
+            token_type: (token, payload_data)
+            for (token_type, _, payload_data), token in zip(token_payloads, signed_tokens)
+        }
+
+
+@instrument("encode_token")
 def encode_token(
     payload: dict, token_type: TokenTypes, json_encoder: Optional[type[JSONEncoder]] = None, **additional_headers: Any
 ) -> Tuple[str, dict]:
-    now = timezone.now()
+    payload_data = {**payload, **_make_registered_claims(token_type, timezone.now())}
+    if isinstance(payload_data.get("nbf"), datetime):  # as jwt.encode does
+        payload_data["nbf"] = timegm(payload_data["nbf"].utctimetuple())
+
+    signing_key = InMemoryJwtKeyPair.signing_key
+    return (
+        api_jws.encode(
+            dumps(payload_data, json_encoder),
+            signing_key.key,
+            algorithm=ninja_simple_jwt_settings.JWT_ALGORITHM,
+            headers={"kid": signing_key.kid, **additional_headers},
+        ),
+        payload_data,
+    )
+
+
+def _make_registered_claims(token_type: TokenTypes, now: datetime) -> dict:
     if token_type == TokenTypes.REFRESH:
         expiry = now + ninja_simple_jwt_settings.JWT_REFRESH_TOKEN_LIFETIME
     else:
         expiry = now + ninja_simple_jwt_settings.JWT_ACCESS_TOKEN_LIFETIME
 
-    payload_data = {
-        **payload,
+    return {
         "jti": uuid4().hex,
         "exp": int(expiry.timestamp()),
         "iat": int(now.timestamp()),
         "token_type": token_type,
     }
 
+
+def _serialize_shared_claims(payload: dict, json_encoder: Optional[type[JSONEncoder]] = None) -> bytes:
+    """Serialize user claims as the inside of a JSON object, leaving out claims set per token."""
+    shared_claims = {claim: value for claim, value in payload.items() if claim not in _REGISTERED_CLAIMS}
+    return dumps(shared_claims, json_encoder)[1:-1]
+
+
+@instrument("encode_token")
+def _encode_serialized_token(
+    payload: dict, serialized_payload: bytes, token_type: TokenTypes, now: datetime
+) -> Tuple[str, dict]:
+    token_payload, payload_data = _make_serialized_token_payload(payload, serialized_payload, token_type, now)
+
+    signing_key = InMemoryJwtKeyPair.signing_key
     return (
-        jwt.encode(
-            payload_data,
-            InMemoryJwtKeyPair.private_key,
-            algorithm="RS256",
-            headers=additional_headers,
-            json_encoder=json_encoder,
+        api_jws.encode(
+            token_payload,
+            signing_key.key,
+            algorithm=ninja_simple_jwt_settings.JWT_ALGORITHM,
+            headers={"kid": signing_key.kid},
         ),
         payload_data,
     )
 
 
+def _make_serialized_token_payload(
+    payload: dict, serialized_payload: bytes, token_type: TokenTypes, now: datetime
+) -> Tuple[bytes, dict]:
+    registered_claims = _make_registered_claims(token_type, now)
+    separator = b"," if serialized_payload else b""
+    token_payload = b"{" + serialized_payload + separator + dumps(registered_claims)[1:]
+    return token_payload, {**payload, **registered_claims}
+
+
+@instrument("decode_token")
 def decode_token(token: str, token_type: TokenTypes, verify: bool = True) -> dict:
     if verify is True:
-        decoded = jwt.decode(token, InMemoryJwtKeyPair.public_key, algorithms=["RS256"])
-        _verify_exp(decoded)
-        _verify_jti(decoded)
-        _verify_token_type(decoded, token_type)
+        decoded = _decode_verified_token(token, token_type)
+        if _is_revocable(token_type):
+            verify_not_revoked(decoded)
     else:
         decoded = jwt.get_unverified_header(token)
     return decoded
 
 
-def _verify_exp(payload: dict) -> None:
-    now = timezone.now()
-    token_expiry_unix_time = payload["exp"]
-    token_expiry = timezone.make_aware(datetime.fromtimestamp(token_expiry_unix_time))
-    if now >= token_expiry:
-        raise ExpiredSignatureError("JWT has expired.")
+def _decode_verified_token(token: str, token_type: TokenTypes) -> dict:
+    decoded = jwt.decode(
+        token,
+        _get_verification_key(token),
+        algorithms=[ninja_simple_jwt_settings.JWT_ALGORITHM],
+        options={"require": ["exp"]},
+    )
+    _verify_claims(decoded, token_type)
+    return decoded
 
 
-def _verify_jti(payload: dict) -> None:
-    if "jti" not in payload:
-        raise InvalidKeyError("Invalid jti claim in JWT.")
+def _get_verification_key(token: str) -> PublicKeyTypes:
+    verification_keys = InMemoryJwtKeyPair.verification_keys
+    if len(verification_keys) == 1:
+        return next(iter(verification_keys.values()))
+    return InMemoryJwtKeyPair.get_verification_key(jwt.get_unverified_header(token).get("kid"))
 
 
-def _verify_token_type(payload: dict, token_type: TokenTypes) -> None:
+@instrument("decode_token")
+async def adecode_token(token: str, token_type: TokenTypes, verify: bool = True) -> dict:
+    if verify is not True:
+        return jwt.get_unverified_header(token)
+
+    await InMemoryJwtKeyPair.aget_verification_keys()
+    decoded = await _run_crypto_operation(_decode_verified_token, token, token_type)
+    if _is_revocable(token_type):
+        await averify_not_revoked(decoded)
+    return decoded
+
+
+DecodedToken = Union[dict, PyJWTError]
+
+
+@instrument("decode_tokens")
+def decode_tokens(
+    tokens: Iterable[str], token_type: TokenTypes, executor: Optional[Executor] = None, chunk_size: int = 100
+) -> list[DecodedToken]:
+    """Verify a batch of tokens, returning the claims of each token, or the error it failed with, in order.
+
+    Identical tokens are verified once, and tokens are grouped by kid so each verification key is looked up once. With
+    an `executor` (a thread or process pool), the tokens of each group are verified on it in chunks of `chunk_size`.
+    """
+    tokens = list(tokens)
+    results = _verify_tokens(tokens, token_type, executor, chunk_size)
+    if _is_revocable(token_type):
+        _verify_tokens_not_revoked(results)
+    return [dict(result) if isinstance(result, dict) else result for result in map(results.__getitem__, tokens)]
+
+
+@instrument("decode_tokens")
+async def adecode_tokens(
+    tokens: Iterable[str], token_type: TokenTypes, executor: Optional[Executor] = None, chunk_size: int = 100
+) -> list[DecodedToken]:
+    await InMemoryJwtKeyPair.aget_verification_keys()
+    tokens = list(tokens)
+    results = await _run_crypto_operation(_verify_tokens, tokens, token_type, executor, chunk_size)
+    if _is_revocable(token_type) and TokenRevocation.store is not None:
+        await sync_to_async(_verify_tokens_not_revoked)(results)  # the revocation store may query the database
+    return [dict(result) if isinstance(result, dict) else result for result in map(results.__getitem__, tokens)]
+
+
+def _verify_tokens(
+    tokens: list[str], token_type: TokenTypes, executor: Optional[Executor], chunk_size: int
+) -> dict[str, DecodedToken]:
+    """Verify the signature and claims of each distinct token, mapping it to its claims or the error it failed with."""
+    results: dict[str, DecodedToken] = {}
+    groups = list(_group_tokens_by_verification_key(dict.fromkeys(tokens), results))
+    for token, result in _verify_token_signatures(groups, executor, chunk_size):
+        results[token] = _verify_decoded_token(result, token_type) if isinstance(result, dict) else result
+    return results
+
+
+def _verify_token_signatures(
+    groups: list[Tuple[PublicKeyTypes, list[str]]], executor: Optional[Executor], chunk_size: int
+) -> Iterator[Tuple[str, DecodedToken]]:
+    """Verify the signature of each token against the key of its group, in this thread or on `executor`."""
+    algorithm = ninja_simple_jwt_settings.JWT_ALGORITHM
+    if executor is None:
+        for verification_key, group in groups:
+            yield from zip(group, verify_tokens_with(verification_key, algorithm, group))
+        return
+
+    pending: list[Tuple[list[str], Future]] = []
+    for verification_key, group in groups:
+        # keys are passed as PEM, parsed key objects cannot be sent to a process pool
+        pem_public_key = verification_key.public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo)
+        for start in range(0, len(group), chunk_size):
+            chunk = group[start : start + chunk_size]
+            pending.append((chunk, executor.submit(verify_tokens, pem_public_key, algorithm, chunk)))
+    for chunk, future in pending:
+        yield from zip(chunk, future.result())
+
+
+def _verify_tokens_not_revoked(results: dict[str, DecodedToken]) -> None:
+    for token, result in results.items():
+        if isinstance(result, dict):
+            try:
+                verify_not_revoked(result)
+            except PyJWTError as e:
+                results[token] = e
+
+
+def _group_tokens_by_verification_key(
+    tokens: Iterable[str], results: dict[str, DecodedToken]
+) -> Iterator[Tuple[PublicKeyTypes, list[str]]]:
+    """Group tokens by the key they are verified with, recording tokens without a usable key in results."""
+    verification_keys = InMemoryJwtKeyPair.verification_keys
+    if len(verification_keys) == 1:
+        (verification_key,) = verification_keys.values()
+        yield verification_key, list(tokens)
+        return
+
+    groups: dict[Optional[str], list[str]] = {}
+    for token in tokens:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except PyJWTError as e:
+            results[token] = e
+            continue
+        groups.setdefault(kid, []).append(token)
+
+    for kid, group in groups.items():
+        try:
+            verification_key = InMemoryJwtKeyPair.get_verification_key(kid)
+        except InvalidTokenError as e:
+            results.update(dict.fromkeys(group, e))
+            continue
+        yield verification_key, group
+
+
+def _verify_decoded_token(decoded: dict, token_type: TokenTypes) -> DecodedToken:
+    try:
+        _verify_claims(decoded, token_type)
+    except PyJWTError as e:
+        return e
+    return decoded
+
+
+async def _run_crypto_operation(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    if not ninja_simple_jwt_settings.JWT_ASYNC_OFFLOAD_CRYPTO:
+        return func(*args, **kwargs)
+
+    if ninja_simple_jwt_settings.JWT_ASYNC_CRYPTO_EXECUTOR is None:
+        return await sync_to_async(func, thread_sensitive=False)(*args, **kwargs)
+
+    executor = import_string(ninja_simple_jwt_settings.JWT_ASYNC_CRYPTO_EXECUTOR)
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+def _verify_claims(payload: dict, token_type: TokenTypes) -> None:
+    """Check the claims PyJWT does not know about; exp is already validated by jwt.decode."""
+    if "jti" not in payload:
+        raise InvalidKeyError("Invalid jti claim in JWT.")
     if "token_type" not in payload:
         raise InvalidKeyError("Missing token type in JWT.")
     if payload["token_type"] != token_type:
-        raise InvalidTokenError("Incorrect token type in JWT.")
+        raise IncorrectTokenTypeError("Incorrect token type in JWT.")
+
+
+def _is_revocable(token_type: TokenTypes) -> bool:
+    return token_type == TokenTypes.REFRESH or ninja_simple_jwt_settings.JWT_ACCESS_TOKEN_REVOCATION
@@ -0,0 +1,262 @@
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Iterable, Iterator, Optional
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, pre_save
+from django.test.signals import setting_changed
+from django.utils.functional import classproperty
+
+from ninja_simple_jwt.jwt.claim_mapping import ClaimMapping
+from ninja_simple_jwt.jwt.synced_snapshot import SyncedSnapshot
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+WATCHED_USER_FIELDS = ("is_active", "is_staff", "is_superuser")
+WATCHED_USER_RELATIONS = ("groups", "user_permissions")
+USER_STATE_ATTR = "_ninja_simple_jwt_user_state"
+
+
+class UserSnapshot(SyncedSnapshot[dict[str, tuple[bool, int]]]):
+    """In-process snapshot of the users whose refresh tokens must be rejected, so refreshes do not query the database.
+
+    It maps the pk of users whose is_active, is_staff, is_superuser, groups or permissions changed within
+    JWT_REFRESH_TOKEN_LIFETIME, as recorded in the UserStateChange table, to (is_active, changed at). Inactive users who
+    signed in within that lifetime, and so may still hold a refresh token, are added from the user table, which catches
+    deactivations made without signals (ie: `QuerySet.update()`). It is filled on first use, synced with changes
+    recorded by other processes every JWT_USER_SNAPSHOT_SYNC_INTERVAL, and rebuilt every
+    JWT_USER_SNAPSHOT_REBUILD_INTERVAL to drop changes older than any refresh token. A change made elsewhere can go
+    unnoticed for up to the sync interval, one made without signals for up to the rebuild interval.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.model = apps.get_model("ninja_simple_jwt", "UserStateChange")
+        self.user_model = get_user_model()
+        self.user_pk_claim = get_user_pk_claim()
+        field_names = {field.name for field in self.user_model._meta.fields}
+        self.watched_fields = tuple(field for field in WATCHED_USER_FIELDS if field in field_names)
+        self.watched_relations = {field.remote_field.through: field for field in get_watched_user_relations()}
+        self.tracks_sign_in = "is_active" in field_names and "last_login" in field_names
+
+    def is_valid(self, payload: dict) -> bool:
+        """Whether the user of a refresh token is active and has not changed since the token was issued.
+
+        Changes are compared to `iat` in whole seconds, so a token issued within the second before a change passes.
+        """
+        user_pk = payload.get(self.user_pk_claim)
+        if user_pk is None:
+            return False
+        state = self._get().get(str(user_pk))
+        if state is None:
+            return True
+        is_active, changed_at = state
+        return is_active and changed_at <= payload["iat"]
+
+    def is_valid_in_memory(self, payload: dict) -> Optional[bool]:
+        """Answer `is_valid` without I/O when possible, or return None when the snapshot has to be synced first."""
+        if self._get_in_memory() is None:
+            return None
+        return self.is_valid(payload)
+
+    def record_changes(self, user_pks: Iterable[Any]) -> None:
+        """Record that the users changed, rejecting refresh tokens issued to them before now."""
+        user_pks = {str(user_pk) for user_pk in user_pks}
+        active_users = self.user_model._default_manager.filter(pk__in=user_pks)  # pylint: disable=W0212
+        if "is_active" in self.watched_fields:
+            active_users = active_users.filter(is_active=True)
+        active_user_pks = {str(user_pk) for user_pk in active_users.values_list("pk", flat=True)}
+
+        now = datetime.now(timezone.utc)
+        with transaction.atomic():
+            for user_pk in user_pks:
+                self.model.objects.update_or_create(
+                    user_pk=user_pk, defaults={"is_active": user_pk in active_user_pks, "changed_at": now}
+                )
+
+        users = self._value
+        if users is not None:
+            users.update((user_pk, (user_pk in active_user_pks, int(now.timestamp()))) for user_pk in user_pks)
+
+    @property
+    def sync_interval(self) -> timedelta:
+        return ninja_simple_jwt_settings.JWT_USER_SNAPSHOT_SYNC_INTERVAL
+
+    @property
+    def rebuild_interval(self) -> timedelta:
+        return ninja_simple_jwt_settings.JWT_USER_SNAPSHOT_REBUILD_INTERVAL
+
+    def stats(self) -> dict:
+        users = self._value
+        return {"users": 0 if users is None else len(users), "synced_at": self._synced_at}
+
+    def _build(self) -> dict[str, tuple[bool, int]]:
+        oldest_token_issued_at = datetime.now(timezone.utc) - ninja_simple_jwt_settings.JWT_REFRESH_TOKEN_LIFETIME
+        users: dict[str, tuple[bool, int]] = {}
+        if self.tracks_sign_in:
+            inactive_users = self.user_model._default_manager.filter(  # pylint: disable=W0212
+                is_active=False, last_login__gte=oldest_token_issued_at
+            )
+            users.update((str(user_pk), (False, 0)) for user_pk in inactive_users.values_list("pk", flat=True))
+        users.update(self._get_changes_since(oldest_token_issued_at))
+        return users
+
+    def _update(self, value: dict[str, tuple[bool, int]], since: datetime) -> None:
+        value.update(self._get_changes_since(since))
+
+    def purge_expired(self) -> int:
+        """Delete changes older than any unexpired refresh token, returning how many were deleted."""
+        oldest_token_issued_at = datetime.now(timezone.utc) - ninja_simple_jwt_settings.JWT_REFRESH_TOKEN_LIFETIME
+        deleted, _ = self.model.objects.filter(changed_at__lt=oldest_token_issued_at).delete()
+        return deleted
+
+    def _get_changes_since(self, since: datetime) -> Iterator[tuple[str, tuple[bool, int]]]:
+        changes = self.model.objects.filter(changed_at__gte=since)
+        for user_pk, is_active, changed_at in changes.values_list("user_pk", "is_active", "changed_at").iterator():
+            yield user_pk, (is_active, int(changed_at.timestamp()))
+
+
+def get_user_pk_claim() -> str:
+    """Claim of TOKEN_CLAIM_USER_ATTRIBUTE_MAP holding the user pk."""
+    user_attribute_claims = ClaimMapping.plan.user_attribute_claims
+    pk_field = get_user_model()._meta.pk
+    pk_claim = None if pk_field is None else user_attribute_claims.get(pk_field.attname)
+    claim = pk_claim or user_attribute_claims.get("pk")
+    if claim is None:
+        raise ImproperlyConfigured(
+            "JWT_REFRESH_USER_REVALIDATION needs a TOKEN_CLAIM_USER_ATTRIBUTE_MAP claim for the user pk."
+        )
+    return claim
+
+
+def get_watched_user_relations() -> list[models.ManyToManyField]:
+    """The user's groups and user_permissions fields, those of WATCHED_USER_RELATIONS the user model has."""
+    relations = []
+    for name in WATCHED_USER_RELATIONS:
+        try:
+            field = get_user_model()._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if isinstance(field, models.ManyToManyField):
+            relations.append(field)
+    return relations
+
+
+class UserRevalidation:
+    _snapshot: Optional[UserSnapshot] = None
+    _loaded = False
+
+    @classproperty
+    def snapshot(self) -> Optional[UserSnapshot]:
+        """Snapshot refresh tokens are re-validated against, or None when JWT_REFRESH_USER_REVALIDATION is disabled."""
+        if not self._loaded:
+            self._snapshot = UserSnapshot() if ninja_simple_jwt_settings.JWT_REFRESH_USER_REVALIDATION else None
+            self._loaded = True
+        return self._snapshot
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._snapshot = None
+        cls._loaded = False
+
+
+def remember_user_state(instance: Any, **kwargs: Any) -> None:
+    """post_init receiver keeping the loaded is_active, is_staff and is_superuser, for `record_user_change`."""
+    snapshot = UserRevalidation.snapshot
+    if snapshot is not None:
+        instance.__dict__[USER_STATE_ATTR] = {
+            field: instance.__dict__[field] for field in snapshot.watched_fields if field in instance.__dict__
+        }
+
+
+def record_user_change(sender: Any, instance: Any, raw: bool = False, update_fields: Any = None, **kwargs: Any) -> None:
+    """pre_save receiver recording a change of the user's is_active, is_staff or is_superuser once committed.
+
+    Values are compared to those the instance was loaded with; only fields that were deferred, or instances loaded
+    before JWT_REFRESH_USER_REVALIDATION was enabled, are read from the database.
+    """
+    snapshot = UserRevalidation.snapshot
+    if snapshot is None or raw or instance._state.adding:  # pylint: disable=W0212
+        return
+    fields = [field for field in snapshot.watched_fields if update_fields is None or field in update_fields]
+    if not fields:
+        return  # ie: the last_login update on sign in
+    loaded = instance.__dict__.setdefault(USER_STATE_ATTR, {})
+    unknown_fields = [field for field in fields if field not in loaded]
+    if unknown_fields:
+        users = sender._default_manager  # pylint: disable=W0212
+        previous = users.filter(pk=instance.pk).values(*unknown_fields).first()
+        if previous is None:
+            return
+        loaded.update(previous)
+    if any(loaded[field] != getattr(instance, field) for field in fields):
+        transaction.on_commit(partial(snapshot.record_changes, [instance.pk]))
+    loaded.update((field, getattr(instance, field)) for field in fields)
+
+
+def record_user_deletion(instance: Any, **kwargs: Any) -> None:
+    snapshot = UserRevalidation.snapshot
+    if snapshot is not None:
+        transaction.on_commit(partial(snapshot.record_changes, [instance.pk]))
+
+
+def record_user_relation_change(
+    sender: Any, instance: Any, action: str, reverse: bool, pk_set: Optional[set], **kwargs: Any
+) -> None:
+    """m2m_changed receiver recording changes of the user's groups and permissions once committed.
+
+    Changes of the permissions of a group are not tracked.
+    """
+    snapshot = UserRevalidation.snapshot
+    if snapshot is None or action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        user_pks: Iterable[Any] = [instance.pk]
+    elif action == "pre_clear":
+        field = snapshot.watched_relations[sender]
+        related_users = sender._default_manager.filter(  # pylint: disable=W0212
+            **{field.m2m_reverse_field_name(): instance}
+        )
+        user_pks = list(related_users.values_list(field.m2m_column_name(), flat=True))
+    else:
+        user_pks = pk_set or ()
+    if user_pks:
+        transaction.on_commit(partial(snapshot.record_changes, user_pks))
+
+
+def connect_user_signals() -> None:
+    """Connect the receivers recording user changes while JWT_REFRESH_USER_REVALIDATION is enabled, and disconnect them
+    otherwise, so projects not using it do not pay for them on every user instantiation and save.
+    """
+    user_model = get_user_model()
+    receivers: list[tuple[Any, Any, Any, str]] = [
+        (post_init, remember_user_state, user_model, "ninja_simple_jwt_user_state"),
+        (pre_save, record_user_change, user_model, "ninja_simple_jwt_user_change"),
+        (post_delete, record_user_deletion, user_model, "ninja_simple_jwt_user_deletion"),
+    ]
+    receivers.extend(
+        (
+            m2m_changed,
+            record_user_relation_change,
+            field.remote_field.through,
+            f"ninja_simple_jwt_user_{field.name}_change",
+        )
+        for field in get_watched_user_relations()
+    )
+
+    for signal, receiver, sender, dispatch_uid in receivers:
+        if ninja_simple_jwt_settings.JWT_REFRESH_USER_REVALIDATION:
+            signal.connect(receiver, sender=sender, dispatch_uid=dispatch_uid)
+        else:
+            signal.disconnect(sender=sender, dispatch_uid=dispatch_uid)
+
+
+def clear_user_revalidation_snapshot(*args: Any, **kwargs: Any) -> None:
+    if kwargs["setting"] == "NINJA_SIMPLE_JWT":
+        UserRevalidation.clear()
+        connect_user_signals()
+
+
+setting_changed.connect(clear_user_revalidation_snapshot)
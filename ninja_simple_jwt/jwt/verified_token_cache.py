@@ -0,0 +1,27 @@
+from hashlib import sha256
+from typing import Optional
+
+from ninja_simple_jwt.jwt.expiring_lru_cache import ExpiringLruCache
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+
+class VerifiedTokenCache(ExpiringLruCache):
+    """Bounded LRU cache of verified token claims, keyed by token hash and expiring with the token's exp claim."""
+
+    @property
+    def max_size(self) -> int:
+        return ninja_simple_jwt_settings.JWT_VERIFIED_TOKEN_CACHE_SIZE
+
+    def get(self, token: str) -> Optional[dict]:
+        claims = self._get(self._make_key(token))
+        return None if claims is None else dict(claims)
+
+    def set(self, token: str, claims: dict) -> None:
+        self._set(self._make_key(token), dict(claims), claims["exp"])
+
+    @staticmethod
+    def _make_key(token: str) -> bytes:
+        return sha256(token.encode()).digest()
+
+
+verified_token_cache = VerifiedTokenCache()
@@ -0,0 +1,35 @@
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ninja_simple_jwt.profiling import RequestProfiler
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+
+class Command(BaseCommand):
+    help = "Print the auth request profiles recorded in the JWT_PROFILE_CACHE_ALIAS ring buffer, oldest first."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--json", action="store_true", help="Write one JSON profile per line.")
+        parser.add_argument("--clear", action="store_true", help="Empty the ring buffer after printing it.")
+
+    def handle(self, *args: Any, **kwargs: Any) -> None:
+        if ninja_simple_jwt_settings.JWT_PROFILE_CACHE_ALIAS is None:
+            raise CommandError("JWT_PROFILE_CACHE_ALIAS is not set, profiles are only kept in the server processes.")
+
+        for profile in RequestProfiler.get_cached_profiles():
+            if kwargs["json"]:
+                self.stdout.write(json.dumps(profile))
+                continue
+            started_at = datetime.fromtimestamp(profile["started_at"], timezone.utc).isoformat()
+            self.stdout.write(f"{started_at} {profile['stage']} {profile['duration_ms']:.1f} ms ({profile['reason']})")
+            for stage in profile["stages"]:
+                failure = f" failed: {stage['failure']}" if stage["failure"] else ""
+                self.stdout.write(
+                    f"  +{stage['offset_ms']:>8.1f} ms {stage['stage']:<28} {stage['duration_ms']:>8.1f} ms{failure}"
+                )
+
+        if kwargs["clear"]:
+            RequestProfiler.clear_cached_profiles()
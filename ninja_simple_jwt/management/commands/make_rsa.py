@@ -1,13 +1,11 @@
 from typing import Any
 
-from django.core.management.base import BaseCommand
+from ninja_simple_jwt.management.commands import make_signing_key
 
-from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
 
-
-class Command(BaseCommand):
-    help = "Create RSA key pair."
+class Command(make_signing_key.Command):
+    help = "Deprecated alias of make_signing_key: create signing key pair for the configured JWT_ALGORITHM."
 
     def handle(self, *args: Any, **kwargs: Any) -> None:
-        private_key_path, public_key_path = make_and_save_key_pair()
-        print(f"Key pair created: \n {private_key_path}\n {public_key_path}")
+        self.stderr.write("make_rsa is deprecated, use make_signing_key instead.")
+        super().handle(*args, **kwargs)
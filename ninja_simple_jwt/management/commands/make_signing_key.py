@@ -0,0 +1,15 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+
+class Command(BaseCommand):
+    help = "Create signing key pair for the configured JWT_ALGORITHM."
+    requires_system_checks: list[str] = []  # the key checks would otherwise stop a broken key from being replaced
+
+    def handle(self, *args: Any, **kwargs: Any) -> None:
+        private_key_path, public_key_path = make_and_save_key_pair()
+        print(f"{ninja_simple_jwt_settings.JWT_ALGORITHM} key pair created: \n {private_key_path}\n {public_key_path}")
@@ -0,0 +1,54 @@
+import json
+from contextlib import ExitStack
+from io import TextIOBase
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ninja_simple_jwt.jwt.token_operations import TokenTypes, issue_tokens_for_users
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+
+class Command(BaseCommand):
+    help = "Issue tokens for users, writing one JSON line per user as tokens are signed."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("usernames", nargs="*", help="Users to issue tokens for, defaults to all active users.")
+        parser.add_argument(
+            "--token-type",
+            action="append",
+            choices=[token_type.value for token_type in TokenTypes],
+            dest="token_types",
+            help="Type of token to issue, can be repeated. Defaults to access.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=None, help="Signing processes, defaults to CPU count; 0 signs in process."
+        )
+        parser.add_argument("--chunk-size", type=int, default=200, help="Users signed per worker task.")
+        parser.add_argument("--output", default="-", help="JSONL file to write, defaults to stdout.")
+
+    def handle(self, *args: Any, **kwargs: Any) -> None:
+        user_model = get_user_model()
+        users = user_model.objects.order_by("pk")
+        if any(field.name == "is_active" for field in user_model._meta.fields):
+            users = users.filter(is_active=True)
+        if kwargs["usernames"]:
+            users = users.filter(**{f"{ninja_simple_jwt_settings.USERNAME_FIELD}__in": kwargs["usernames"]})
+        token_types = [TokenTypes(token_type) for token_type in kwargs["token_types"] or [TokenTypes.ACCESS]]
+
+        output: TextIOBase
+        with ExitStack() as stack:
+            if kwargs["output"] == "-":
+                output = self.stdout
+            else:
+                output = stack.enter_context(open(kwargs["output"], "w", encoding="utf-8"))
+            for pk, tokens in issue_tokens_for_users(
+                users, token_types, workers=kwargs["workers"], chunk_size=kwargs["chunk_size"]
+            ):
+                line = {"pk": pk}
+                for token_type, (token, payload) in tokens.items():
+                    line[token_type.value] = token
+                    line[f"{token_type.value}_exp"] = payload["exp"]
+                output.write(json.dumps(line, cls=DjangoJSONEncoder) + "\n")
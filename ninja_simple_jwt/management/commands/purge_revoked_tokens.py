@@ -0,0 +1,15 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ninja_simple_jwt.jwt.revocation import TokenRevocation
+
+
+class Command(BaseCommand):
+    help = "Delete revoked token entries of tokens that have expired."
+
+    def handle(self, *args: Any, **kwargs: Any) -> None:
+        store = TokenRevocation.store
+        if store is None:
+            raise CommandError("JWT_REVOCATION_STORE_CLS is not set.")
+        print(f"Purged {store.purge_expired()} expired revoked tokens.")
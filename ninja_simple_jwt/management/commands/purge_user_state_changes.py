@@ -0,0 +1,15 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ninja_simple_jwt.jwt.user_revalidation import UserRevalidation
+
+
+class Command(BaseCommand):
+    help = "Delete recorded user changes older than any unexpired refresh token."
+
+    def handle(self, *args: Any, **kwargs: Any) -> None:
+        snapshot = UserRevalidation.snapshot
+        if snapshot is None:
+            raise CommandError("JWT_REFRESH_USER_REVALIDATION is not enabled.")
+        self.stdout.write(f"Purged {snapshot.purge_expired()} expired user changes.")
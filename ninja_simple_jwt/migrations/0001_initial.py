@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-17 19:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="RevokedToken",
+            fields=[
+                ("jti", models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+                ("revoked_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["jti", "expires_at"], name="revokedtoken_jti_exp_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-17 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ninja_simple_jwt", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserStateChange",
+            fields=[
+                ("user_pk", models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ("is_active", models.BooleanField()),
+                ("changed_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import models
+
+
+class RevokedToken(models.Model):
+    """jti of a revoked token, kept until the token would have expired anyway."""
+
+    jti = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["jti", "expires_at"], name="revokedtoken_jti_exp_idx")]
+
+    def __str__(self) -> str:
+        return self.jti
+
+
+class UserStateChange(models.Model):
+    """Last is_active or permission change of a user, kept while refresh tokens issued before it are unexpired."""
+
+    user_pk = models.CharField(max_length=255, primary_key=True)
+    is_active = models.BooleanField()
+    changed_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return self.user_pk
@@ -0,0 +1,142 @@
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from itertools import count
+from threading import Lock, Thread
+from typing import Optional
+
+from django.core.cache import caches
+
+from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+logger = logging.getLogger(__name__)
+
+
+class Profile:
+    """Per-stage breakdown of one auth request, started by its outermost instrumented stage."""
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.reason = ""
+        self.stages: list[tuple[str, float, float, Optional[str]]] = []
+
+    def record(self, stage: str, start: float, duration: float, failure_reason: Optional[str]) -> None:
+        self.stages.append((stage, start - self.start, duration, failure_reason))
+
+    def as_dict(self) -> dict:
+        return {
+            "stage": self.stage,
+            "started_at": self.started_at,
+            "duration_ms": self.duration * 1000,
+            "reason": self.reason,
+            "stages": [
+                {"stage": stage, "offset_ms": offset * 1000, "duration_ms": duration * 1000, "failure": failure}
+                for stage, offset, duration, failure in sorted(self.stages, key=lambda stage: stage[1])
+            ],
+        }
+
+
+current_profile: ContextVar[Optional[Profile]] = ContextVar("ninja_simple_jwt_profile", default=None)
+
+
+class RequestProfiler:
+    """Keeps profiles of requests slower than JWT_PROFILE_THRESHOLD, or of 1 in JWT_PROFILE_SAMPLE_RATE requests.
+
+    Profiles go to a ring buffer of the last JWT_PROFILE_BUFFER_SIZE profiles in this process. With
+    JWT_PROFILE_CACHE_ALIAS they are also written to a ring of as many slots in that cache, shared by every process, for
+    the `dump_auth_profiles` command to read. Kept profiles are queued and written by a background thread, so the
+    cache is never written from the request path, sync or async.
+    """
+
+    cache_key_prefix = "ninja_simple_jwt:profile:"
+
+    def __init__(self) -> None:
+        threshold = ninja_simple_jwt_settings.JWT_PROFILE_THRESHOLD
+        self.threshold = None if threshold is None else threshold.total_seconds()
+        self.sample_rate = ninja_simple_jwt_settings.JWT_PROFILE_SAMPLE_RATE
+        self.buffer_size = ninja_simple_jwt_settings.JWT_PROFILE_BUFFER_SIZE
+        self.profiles: deque[Profile] = deque(maxlen=self.buffer_size)
+        self._requests = count(1)
+        self._pending: deque[Profile] = deque(maxlen=self.buffer_size)
+        self._flushing = False
+        self._lock = Lock()
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return (
+            ninja_simple_jwt_settings.JWT_PROFILE_THRESHOLD is not None
+            or ninja_simple_jwt_settings.JWT_PROFILE_SAMPLE_RATE > 0
+        )
+
+    def finish(self, profile: Profile, duration: float) -> None:
+        request_number = next(self._requests)
+        if self.threshold is not None and duration >= self.threshold:
+            profile.reason = "slow"
+        elif self.sample_rate > 0 and request_number % self.sample_rate == 0:
+            profile.reason = "sampled"
+        else:
+            return
+
+        profile.duration = duration
+        self.profiles.append(profile)
+        if ninja_simple_jwt_settings.JWT_PROFILE_CACHE_ALIAS is not None:
+            self._pending.append(profile)
+            self._request_flush()
+
+    def flush(self) -> None:
+        """Write the queued profiles to the JWT_PROFILE_CACHE_ALIAS ring."""
+        profiles = []
+        while self._pending:
+            try:
+                profiles.append(self._pending.popleft())
+            except IndexError:
+                break  # emptied by a concurrent flush
+        if not profiles:
+            return
+
+        cache = caches[ninja_simple_jwt_settings.JWT_PROFILE_CACHE_ALIAS]
+        counter_key = f"{self.cache_key_prefix}counter"
+        cache.add(counter_key, 0, timeout=None)
+        first_slot = cache.incr(counter_key, len(profiles)) - len(profiles) + 1
+        cache.set_many(
+            {
+                f"{self.cache_key_prefix}{(first_slot + i) % self.buffer_size}": profile.as_dict()
+                for i, profile in enumerate(profiles)
+            },
+            timeout=None,
+        )
+
+    def _request_flush(self) -> None:
+        with self._lock:
+            if self._flushing:
+                return
+            self._flushing = True
+        Thread(target=self._flush_in_background, daemon=True).start()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:  # pylint: disable=W0703
+            logger.warning("Failed to write auth profiles to cache: %s", e)
+        finally:
+            with self._lock:
+                self._flushing = False
+        if self._pending:
+            self._request_flush()  # queued while the cache was being written
+
+    @classmethod
+    def get_cached_profiles(cls) -> list[dict]:
+        """Profiles in the JWT_PROFILE_CACHE_ALIAS ring, oldest first."""
+        cache = caches[ninja_simple_jwt_settings.JWT_PROFILE_CACHE_ALIAS]
+        keys = [f"{cls.cache_key_prefix}{slot}" for slot in range(ninja_simple_jwt_settings.JWT_PROFILE_BUFFER_SIZE)]
+        return sorted(cache.get_many(keys).values(), key=lambda profile: profile["started_at"])
+
+    @classmethod
+    def clear_cached_profiles(cls) -> None:
+        cache = caches[ninja_simple_jwt_settings.JWT_PROFILE_CACHE_ALIAS]
+        slots = range(ninja_simple_jwt_settings.JWT_PROFILE_BUFFER_SIZE)
+        cache.delete_many([f"{cls.cache_key_prefix}counter", *(f"{cls.cache_key_prefix}{slot}" for slot in slots)])
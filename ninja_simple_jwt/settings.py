@@ -9,13 +9,38 @@ USER_SETTINGS = getattr(settings, "NINJA_SIMPLE_JWT", None)
 
 
 class NinjaSimpleJwtSettingsDict(TypedDict):
+    JWT_ALGORITHM: NotRequired[str]
     JWT_PRIVATE_KEY_STORAGE: NotRequired[str]
     JWT_PUBLIC_KEY_STORAGE: NotRequired[str]
     JWT_PRIVATE_KEY_PATH: NotRequired[str]
     JWT_PUBLIC_KEY_PATH: NotRequired[str]
+    JWT_PUBLIC_KEYRING_PATH: NotRequired[Optional[str]]
+    JWT_PUBLIC_KEYRING_SIZE: NotRequired[int]
+    JWT_PUBLIC_KEY_SOURCE: NotRequired[str]
+    JWT_PRELOAD_KEYS: NotRequired[bool]
+    JWT_KEY_REFRESH_INTERVAL: NotRequired[Optional[timedelta]]
+    JWT_HOST_KEY_CACHE_PATH: NotRequired[Optional[str]]
+    JWT_JWKS_URL: NotRequired[Optional[str]]
+    JWT_JWKS_LIFETIME: NotRequired[timedelta]
+    JWT_JWKS_STALE_LIFETIME: NotRequired[timedelta]
+    JWT_JWKS_TIMEOUT: NotRequired[float]
     JWT_REFRESH_COOKIE_NAME: NotRequired[str]
     JWT_REFRESH_TOKEN_LIFETIME: NotRequired[timedelta]
     JWT_ACCESS_TOKEN_LIFETIME: NotRequired[timedelta]
+    JWT_ACCESS_TOKEN_REUSE_WINDOW: NotRequired[timedelta]
+    JWT_ACCESS_TOKEN_REUSE_SIZE: NotRequired[int]
+    JWT_REFRESH_TOKEN_ROTATION: NotRequired[bool]
+    JWT_REFRESH_USER_REVALIDATION: NotRequired[bool]
+    JWT_USER_SNAPSHOT_SYNC_INTERVAL: NotRequired[timedelta]
+    JWT_USER_SNAPSHOT_REBUILD_INTERVAL: NotRequired[timedelta]
+    JWT_ACCESS_TOKEN_REVOCATION: NotRequired[bool]
+    JWT_REVOCATION_STORE_CLS: NotRequired[Optional[str]]
+    JWT_REVOCATION_CACHE_ALIAS: NotRequired[str]
+    JWT_REVOCATION_PURGE_INTERVAL: NotRequired[timedelta]
+    JWT_REVOCATION_BLOOM_FILTER: NotRequired[bool]
+    JWT_REVOCATION_BLOOM_CAPACITY: NotRequired[int]
+    JWT_REVOCATION_BLOOM_ERROR_RATE: NotRequired[float]
+    JWT_REVOCATION_BLOOM_SYNC_INTERVAL: NotRequired[timedelta]
     WEB_REFRESH_COOKIE_SECURE: NotRequired[bool]
     WEB_REFRESH_COOKIE_HTTP_ONLY: NotRequired[bool]
     WEB_REFRESH_COOKIE_SAME_SITE_POLICY: NotRequired[str]
@@ -23,16 +48,51 @@ class NinjaSimpleJwtSettingsDict(TypedDict):
     USERNAME_FIELD: NotRequired[str]
     TOKEN_CLAIM_USER_ATTRIBUTE_MAP: NotRequired[dict[str, str | Callable[[Any], str | int | float | bool | None]]]
     TOKEN_USER_ENCODER_CLS: NotRequired[str]
+    TOKEN_USER_CLS: NotRequired[Optional[str]]
+    JWT_JWKS_MAX_AGE: NotRequired[int]
+    JWT_VERIFIED_TOKEN_CACHE_SIZE: NotRequired[int]
+    JWT_ASYNC_OFFLOAD_CRYPTO: NotRequired[bool]
+    JWT_ASYNC_CRYPTO_EXECUTOR: NotRequired[Optional[str]]
+    JWT_METRICS_SINK_CLS: NotRequired[Optional[str]]
+    JWT_PROFILE_THRESHOLD: NotRequired[Optional[timedelta]]
+    JWT_PROFILE_SAMPLE_RATE: NotRequired[int]
+    JWT_PROFILE_BUFFER_SIZE: NotRequired[int]
+    JWT_PROFILE_CACHE_ALIAS: NotRequired[Optional[str]]
 
 
 DEFAULTS: NinjaSimpleJwtSettingsDict = {
+    "JWT_ALGORITHM": "RS256",
     "JWT_PRIVATE_KEY_STORAGE": "ninja_simple_jwt.jwt.key_store.local_disk_key_storage",
     "JWT_PUBLIC_KEY_STORAGE": "ninja_simple_jwt.jwt.key_store.local_disk_key_storage",
     "JWT_PRIVATE_KEY_PATH": "jwt-signing.pem",
     "JWT_PUBLIC_KEY_PATH": "jwt-signing.pub",
+    "JWT_PUBLIC_KEYRING_PATH": None,
+    "JWT_PUBLIC_KEYRING_SIZE": 2,
+    "JWT_PUBLIC_KEY_SOURCE": "storage",
+    "JWT_PRELOAD_KEYS": False,
+    "JWT_KEY_REFRESH_INTERVAL": None,
+    "JWT_HOST_KEY_CACHE_PATH": None,
+    "JWT_JWKS_URL": None,
+    "JWT_JWKS_LIFETIME": timedelta(minutes=15),
+    "JWT_JWKS_STALE_LIFETIME": timedelta(hours=1),
+    "JWT_JWKS_TIMEOUT": 5,
     "JWT_REFRESH_COOKIE_NAME": "refresh",
     "JWT_REFRESH_TOKEN_LIFETIME": timedelta(days=30),
     "JWT_ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
+    "JWT_ACCESS_TOKEN_REUSE_WINDOW": timedelta(0),
+    "JWT_ACCESS_TOKEN_REUSE_SIZE": 10_000,
+    "JWT_REFRESH_TOKEN_ROTATION": False,
+    "JWT_REFRESH_USER_REVALIDATION": False,
+    "JWT_USER_SNAPSHOT_SYNC_INTERVAL": timedelta(seconds=5),
+    "JWT_USER_SNAPSHOT_REBUILD_INTERVAL": timedelta(hours=1),
+    "JWT_ACCESS_TOKEN_REVOCATION": False,
+    "JWT_REVOCATION_STORE_CLS": None,
+    "JWT_REVOCATION_CACHE_ALIAS": "default",
+    "JWT_REVOCATION_PURGE_INTERVAL": timedelta(hours=1),
+    "JWT_REVOCATION_BLOOM_FILTER": False,
+    "JWT_REVOCATION_BLOOM_CAPACITY": 100_000,
+    "JWT_REVOCATION_BLOOM_ERROR_RATE": 0.001,
+    "JWT_REVOCATION_BLOOM_SYNC_INTERVAL": timedelta(seconds=5),
     "WEB_REFRESH_COOKIE_SECURE": not settings.DEBUG,
     "WEB_REFRESH_COOKIE_HTTP_ONLY": True,
     "WEB_REFRESH_COOKIE_SAME_SITE_POLICY": "Strict",
@@ -51,6 +111,16 @@ DEFAULTS: NinjaSimpleJwtSettingsDict = {
         "is_active": "is_active",
     },
     "TOKEN_USER_ENCODER_CLS": "ninja_simple_jwt.jwt.json_encode.TokenUserEncoder",
+    "TOKEN_USER_CLS": None,
+    "JWT_JWKS_MAX_AGE": 3600,
+    "JWT_VERIFIED_TOKEN_CACHE_SIZE": 0,
+    "JWT_ASYNC_OFFLOAD_CRYPTO": False,
+    "JWT_ASYNC_CRYPTO_EXECUTOR": None,
+    "JWT_METRICS_SINK_CLS": None,
+    "JWT_PROFILE_THRESHOLD": None,
+    "JWT_PROFILE_SAMPLE_RATE": 0,
+    "JWT_PROFILE_BUFFER_SIZE": 100,
+    "JWT_PROFILE_CACHE_ALIAS": None,
 }
 
 EMPTY_SETTINGS: NinjaSimpleJwtSettingsDict = {}
@@ -0,0 +1,61 @@
+"""Compare decode_token against the previous multi-pass verification pipeline.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_decode_token
+"""
+
+import os
+import timeit
+from datetime import datetime
+
+import django
+
+
+def main(number: int = 2000, repeat: int = 7) -> None:
+    # pylint: disable=R0914
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+
+    # pylint: disable=C0415
+    import jwt
+    from django.utils import timezone
+
+    from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+    from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+    from ninja_simple_jwt.jwt.token_operations import TokenTypes, decode_token, encode_token
+
+    make_and_save_key_pair()
+    token, _ = encode_token({"user_id": 1}, TokenTypes.ACCESS)
+    public_key = InMemoryJwtKeyPair.parsed_public_key
+
+    def previous_decode_token() -> dict:
+        decoded = jwt.decode(token, public_key, algorithms=["RS256"])
+        token_expiry = timezone.make_aware(datetime.fromtimestamp(decoded["exp"]))
+        if timezone.now() >= token_expiry:
+            raise jwt.ExpiredSignatureError("JWT has expired.")
+        if "jti" not in decoded:
+            raise jwt.InvalidKeyError("Invalid jti claim in JWT.")
+        if "token_type" not in decoded:
+            raise jwt.InvalidKeyError("Missing token type in JWT.")
+        if decoded["token_type"] != TokenTypes.ACCESS:
+            raise jwt.InvalidTokenError("Incorrect token type in JWT.")
+        return decoded
+
+    cases = {
+        "previous decode_token": previous_decode_token,
+        "decode_token": lambda: decode_token(token, token_type=TokenTypes.ACCESS),
+    }
+
+    timings: dict[str, list[float]] = {name: [] for name in cases}
+    for _ in range(repeat):
+        for name, func in cases.items():
+            timings[name].append(timeit.timeit(func, number=number) / number * 1_000_000)
+
+    for name, values in timings.items():
+        print(f"{name:<24} {min(values):>10.2f} us/op")
+    saving = min(timings["previous decode_token"]) - min(timings["decode_token"])
+    print(f"saving per call: {saving:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
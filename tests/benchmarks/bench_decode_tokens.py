@@ -0,0 +1,58 @@
+"""Compare decode_tokens against a loop of decode_token over the same batch.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_decode_tokens
+"""
+
+import os
+import timeit
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable
+
+import django
+
+
+def main(batch_size: int = 1000, duplicate_ratio: float = 0.5, repeat: int = 5) -> None:
+    # pylint: disable=R0914
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+
+    # pylint: disable=C0415
+    from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+    from ninja_simple_jwt.jwt.token_operations import TokenTypes, decode_token, decode_tokens, encode_token
+
+    make_and_save_key_pair()
+    unique_count = max(1, int(batch_size * (1 - duplicate_ratio)))
+    unique_tokens = [encode_token({"user_id": i}, TokenTypes.ACCESS)[0] for i in range(unique_count)]
+    tokens = [unique_tokens[i % unique_count] for i in range(batch_size)]
+    workers = os.cpu_count() or 1
+
+    def decode_token_loop() -> list:
+        return [decode_token(token, token_type=TokenTypes.ACCESS) for token in tokens]
+
+    with (
+        ThreadPoolExecutor(max_workers=workers) as thread_pool,
+        ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as process_pool,
+    ):
+        cases: dict[str, Callable[[], Any]] = {
+            "decode_token loop": decode_token_loop,
+            "decode_tokens": lambda: decode_tokens(tokens, TokenTypes.ACCESS),
+            f"decode_tokens {workers} threads": lambda: decode_tokens(tokens, TokenTypes.ACCESS, executor=thread_pool),
+            f"decode_tokens {workers} processes": lambda: decode_tokens(
+                tokens, TokenTypes.ACCESS, executor=process_pool
+            ),
+        }
+        for func in cases.values():
+            func()  # warm up, starting the pool workers
+
+        print(f"{batch_size} tokens, {unique_count} unique")
+        timings = {name: min(timeit.repeat(func, number=1, repeat=repeat)) for name, func in cases.items()}
+
+    baseline = timings["decode_token loop"]
+    for name, seconds in timings.items():
+        print(f"{name:<32} {seconds * 1000:>10.2f} ms/batch {baseline / seconds:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compare signing/verifying with raw PEM bytes against the cached parsed key objects.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_key_parsing
+"""
+
+import os
+import timeit
+
+import django
+
+
+def main(number: int = 500) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+
+    import jwt  # pylint: disable=C0415
+
+    from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair  # pylint: disable=C0415
+    from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair  # pylint: disable=C0415
+
+    make_and_save_key_pair()
+    payload = {"user_id": 1, "username": "user"}
+    token = jwt.encode(payload, InMemoryJwtKeyPair.parsed_private_key, algorithm="RS256")
+
+    cases = {
+        "encode (PEM bytes)": lambda: jwt.encode(payload, InMemoryJwtKeyPair.private_key, algorithm="RS256"),
+        "encode (parsed key)": lambda: jwt.encode(payload, InMemoryJwtKeyPair.parsed_private_key, algorithm="RS256"),
+        "decode (PEM bytes)": lambda: jwt.decode(token, InMemoryJwtKeyPair.public_key, algorithms=["RS256"]),
+        "decode (parsed key)": lambda: jwt.decode(token, InMemoryJwtKeyPair.parsed_public_key, algorithms=["RS256"]),
+    }
+
+    results = {}
+    for name, func in cases.items():
+        results[name] = min(timeit.repeat(func, number=number, repeat=3)) / number * 1_000_000
+        print(f"{name:<24} {results[name]:>10.1f} us/op")
+
+    for operation in ("encode", "decode"):
+        saving = results[f"{operation} (PEM bytes)"] - results[f"{operation} (parsed key)"]
+        print(f"{operation} saving per call: {saving:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Throughput benchmarks for token operations, HttpJwtAuth and the auth endpoints.
+
+Run from the repository root:
+    python -m tests.benchmarks.runner --output bench.json
+    python -m tests.benchmarks.runner --compare bench.json
+
+Each case is run once per algorithm/key size and reports ops/sec, p50 and p99 latency. Sign-in endpoints use Django's
+MD5 password hasher so that the numbers reflect token work rather than password hashing.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Iterator, Optional
+
+import django
+
+
+def measure(func: Callable[[], Any], iterations: int, warmup: int = 5) -> dict:
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - start)
+
+    timings.sort()
+    total_seconds = sum(timings) / 1_000_000_000
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / total_seconds,
+        "p50_us": timings[int(0.50 * (iterations - 1))] / 1000,
+        "p99_us": timings[int(0.99 * (iterations - 1))] / 1000,
+        "mean_us": statistics.fmean(timings) / 1000,
+    }
+
+
+def key_configurations(algorithms: list[str], rsa_key_sizes: list[int]) -> Iterator[tuple[str, Optional[int]]]:
+    for algorithm in algorithms:
+        if algorithm == "RS256":
+            for key_size in rsa_key_sizes:
+                yield algorithm, key_size
+        else:
+            yield algorithm, None
+
+
+def write_keys(algorithm: str, key_size: Optional[int], directory: str) -> tuple[str, str]:
+    from cryptography.hazmat.primitives import serialization  # pylint: disable=C0415
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa  # pylint: disable=C0415
+
+    if algorithm == "RS256":
+        private_key: Any = rsa.generate_private_key(public_exponent=65537, key_size=key_size or 2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+
+    private_key_path = os.path.join(directory, f"{algorithm}-{key_size}.pem")
+    public_key_path = os.path.join(directory, f"{algorithm}-{key_size}.pub")
+    with open(private_key_path, "wb") as f:
+        f.write(
+            private_key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+        )
+    with open(public_key_path, "wb") as f:
+        f.write(
+            private_key.public_key().public_bytes(
+                encoding=serialization.Encoding.PEM, format=serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+        )
+    return private_key_path, public_key_path
+
+
+def make_cases(user: Any, password: str) -> dict[str, Callable[[], Any]]:
+    # pylint: disable=C0415,R0914
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import Client, RequestFactory
+    from django.urls import reverse
+
+    from ninja_simple_jwt.auth.ninja_auth import HttpJwtAuth
+    from ninja_simple_jwt.jwt.token_operations import (
+        TokenTypes,
+        TokenUserJsonEncoder,
+        decode_token,
+        encode_token,
+        get_refresh_token_for_user,
+        get_token_payload_for_user,
+    )
+    from ninja_simple_jwt.settings import ninja_simple_jwt_settings
+
+    payload = get_token_payload_for_user(user)
+    access_token, _ = encode_token(payload, TokenTypes.ACCESS, json_encoder=TokenUserJsonEncoder)
+    refresh_token, _ = get_refresh_token_for_user(user)
+    auth = HttpJwtAuth()
+    request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access_token}")
+    request.user = AnonymousUser()
+    client = Client()
+    sign_in_data = {"username": user.get_username(), "password": password}
+    refresh_cookie = f"{ninja_simple_jwt_settings.JWT_REFRESH_COOKIE_NAME}={refresh_token}"
+
+    def expect_ok(response: Any) -> Any:
+        if response.status_code != 200:
+            raise AssertionError(f"Unexpected status code {response.status_code}: {response.content!r}")
+        return response
+
+    return {
+        "encode_token": lambda: encode_token(payload, TokenTypes.ACCESS, json_encoder=TokenUserJsonEncoder),
+        "decode_token": lambda: decode_token(access_token, token_type=TokenTypes.ACCESS),
+        "get_token_payload_for_user": lambda: get_token_payload_for_user(user),
+        "HttpJwtAuth.authenticate": lambda: auth.authenticate(request, access_token),
+        "mobile_sign_in": lambda: expect_ok(
+            client.post(reverse("api-1.0.0:mobile_signin"), data=sign_in_data, content_type="application/json")
+        ),
+        "mobile_token_refresh": lambda: expect_ok(
+            client.post(
+                reverse("api-1.0.0:mobile_token_refresh"),
+                data={"refresh": refresh_token},
+                content_type="application/json",
+            )
+        ),
+        "web_sign_in": lambda: expect_ok(
+            client.post(reverse("api-1.0.0:web_signin"), data=sign_in_data, content_type="application/json")
+        ),
+        "web_token_refresh": lambda: expect_ok(
+            client.post(
+                reverse("api-1.0.0:web_token_refresh"), content_type="application/json", HTTP_COOKIE=refresh_cookie
+            )
+        ),
+    }
+
+
+def run(algorithms: list[str], rsa_key_sizes: list[int], iterations: int) -> dict:
+    # pylint: disable=C0415,R0914
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import override_settings, setup_test_environment
+
+    from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+    from ninja_simple_jwt.settings import DEFAULTS
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+    password = "password"
+    results: dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "timestamp": time.time(),
+        },
+        "results": [],
+    }
+
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]),
+    ):
+        user = get_user_model().objects.create_user(username="bench", password=password)
+
+        for algorithm, key_size in key_configurations(algorithms, rsa_key_sizes):
+            private_key_path, public_key_path = write_keys(algorithm, key_size, directory)
+            jwt_settings = {
+                **DEFAULTS,
+                "JWT_ALGORITHM": algorithm,
+                "JWT_PRIVATE_KEY_PATH": private_key_path,
+                "JWT_PUBLIC_KEY_PATH": public_key_path,
+            }
+            with override_settings(NINJA_SIMPLE_JWT=jwt_settings):
+                InMemoryJwtKeyPair.clear()
+                for name, func in make_cases(user, password).items():
+                    result = {"case": name, "algorithm": algorithm, "key_size": key_size, **measure(func, iterations)}
+                    results["results"].append(result)
+                    print_result(result)
+
+        InMemoryJwtKeyPair.clear()
+
+    return results
+
+
+def print_result(result: dict) -> None:
+    label = f"{result['algorithm']}{'-' + str(result['key_size']) if result['key_size'] else ''}"
+    print(
+        f"{label:<12} {result['case']:<28} {result['ops_per_sec']:>10.1f} ops/s"
+        f" p50 {result['p50_us']:>10.1f} us  p99 {result['p99_us']:>10.1f} us"
+    )
+
+
+def compare(previous: dict, current: dict) -> None:
+    def index(data: dict) -> dict:
+        return {(r["case"], r["algorithm"], r["key_size"]): r for r in data["results"]}
+
+    previous_results = index(previous)
+    print("\nChange in ops/sec against previous run:")
+    for key, result in index(current).items():
+        if key in previous_results:
+            change = result["ops_per_sec"] / previous_results[key]["ops_per_sec"] - 1
+            print(f"{key[1]:<6} {str(key[2] or ''):<5} {key[0]:<28} {change:>+8.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--algorithms", nargs="+", default=["RS256", "ES256", "EdDSA"])
+    parser.add_argument("--rsa-key-sizes", nargs="+", type=int, default=[2048, 3072])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    parser.add_argument("--compare", help="Compare ops/sec against a previous JSON result file.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+
+    results = run(args.algorithms, args.rsa_key_sizes, args.iterations)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
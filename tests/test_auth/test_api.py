@@ -1,12 +1,15 @@
 from datetime import datetime, timedelta
+from hashlib import sha256
 from typing import Any
 
+import jwt
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 from freezegun import freeze_time
 
 from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
 from ninja_simple_jwt.jwt.token_operations import get_refresh_token_for_user
 from ninja_simple_jwt.settings import DEFAULTS
 
@@ -212,3 +215,154 @@ class TestWebSignOut(TestAuthEndPoints):
 
         self.assertEqual(401, response.status_code, "Correct status code.")
         self.assertNotIn("refresh-token", response.cookies, "Response header Set-Cookie does not has refresh token.")
+
+
+class TestRefreshTokenRevocation(TestAuthEndPoints):
+    def revocation_settings(self, **kwargs: Any) -> dict:
+        return self.merge_settings(
+            JWT_REVOCATION_STORE_CLS="ninja_simple_jwt.jwt.revocation.DatabaseRevocationStore", **kwargs
+        )
+
+    def test_mobile_refresh_rotates_refresh_token(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+
+        with self.settings(NINJA_SIMPLE_JWT=self.revocation_settings(JWT_REFRESH_TOKEN_ROTATION=True)):
+            refresh_token, _ = get_refresh_token_for_user(user)
+            response = self.client.post(
+                reverse("api-1.0.0:mobile_token_refresh"),
+                data={"refresh": refresh_token},
+                content_type="application/json",
+            )
+            reused_response = self.client.post(
+                reverse("api-1.0.0:mobile_token_refresh"),
+                data={"refresh": refresh_token},
+                content_type="application/json",
+            )
+            rotated_response = self.client.post(
+                reverse("api-1.0.0:mobile_token_refresh"),
+                data={"refresh": response.json()["refresh"]},
+                content_type="application/json",
+            )
+
+        self.assertEqual(200, response.status_code, "Correct status code.")
+        self.assertIn("access", response.json(), "Response data contains access token.")
+        self.assertNotEqual(refresh_token, response.json()["refresh"], "Response data contains new refresh token.")
+        self.assertEqual(401, reused_response.status_code, "Rotated refresh token cannot be reused.")
+        self.assertEqual(200, rotated_response.status_code, "New refresh token can be used.")
+
+    def test_mobile_refresh_without_rotation_returns_access_token_only(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+        refresh_token, _ = get_refresh_token_for_user(user)
+
+        response = self.client.post(
+            reverse("api-1.0.0:mobile_token_refresh"),
+            data={"refresh": refresh_token},
+            content_type="application/json",
+        )
+
+        self.assertEqual(["access"], list(response.json()), "Response data contains access token only.")
+
+    def test_web_refresh_rotates_refresh_cookie(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.revocation_settings(
+                JWT_REFRESH_TOKEN_ROTATION=True, JWT_REFRESH_COOKIE_NAME="refresh"
+            )
+        ):
+            refresh_token, _ = get_refresh_token_for_user(user)
+            response = self.client.post(
+                reverse("api-1.0.0:web_token_refresh"),
+                content_type="application/json",
+                HTTP_COOKIE=f"refresh={refresh_token}",
+            )
+
+        self.assertEqual(200, response.status_code, "Correct status code.")
+        self.assertNotEqual(refresh_token, response.cookies["refresh"].value, "Refresh cookie is rotated.")
+
+    def test_web_sign_out_revokes_refresh_token(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+
+        with self.settings(NINJA_SIMPLE_JWT=self.revocation_settings(JWT_REFRESH_COOKIE_NAME="refresh")):
+            refresh_token, _ = get_refresh_token_for_user(user)
+            self.client.post(
+                reverse("api-1.0.0:web_sign_out"),
+                content_type="application/json",
+                HTTP_COOKIE=f"refresh={refresh_token}",
+            )
+            response = self.client.post(
+                reverse("api-1.0.0:web_token_refresh"),
+                content_type="application/json",
+                HTTP_COOKIE=f"refresh={refresh_token}",
+            )
+
+        self.assertEqual(401, response.status_code, "Signed out refresh token cannot be used.")
+
+    def test_mobile_sign_out_revokes_refresh_token(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+
+        with self.settings(NINJA_SIMPLE_JWT=self.revocation_settings()):
+            refresh_token, _ = get_refresh_token_for_user(user)
+            sign_out_response = self.client.post(
+                reverse("api-1.0.0:mobile_sign_out"),
+                data={"refresh": refresh_token},
+                content_type="application/json",
+            )
+            response = self.client.post(
+                reverse("api-1.0.0:mobile_token_refresh"),
+                data={"refresh": refresh_token},
+                content_type="application/json",
+            )
+
+        self.assertEqual(204, sign_out_response.status_code, "Correct status code.")
+        self.assertEqual(401, response.status_code, "Signed out refresh token cannot be used.")
+
+
+class TestJwks(TestAuthEndPoints):
+    def test_jwks_serves_public_key(self) -> None:
+        response = self.client.get(reverse("api-1.0.0:jwks"))
+
+        self.assertEqual(200, response.status_code, "Correct status code.")
+        keys = response.json()["keys"]
+        self.assertEqual(1, len(keys), "JWKS has the public key.")
+        self.assertEqual(InMemoryJwtKeyPair.signing_key_id, keys[0]["kid"], "JWK has the signing key id.")
+        self.assertEqual("RSA", keys[0]["kty"], "JWK has the key type.")
+        self.assertIn("max-age=3600", response["Cache-Control"], "Response can be cached.")
+        self.assertTrue(response["ETag"].startswith('"'), "Response has a strong ETag.")
+
+    def test_jwks_body_matches_etag(self) -> None:
+        response = self.client.get(reverse("api-1.0.0:jwks"))
+
+        self.assertEqual("application/json", response["Content-Type"], "JWKS is served as JSON.")
+        self.assertEqual(f'"{sha256(response.content).hexdigest()}"', response["ETag"], "ETag is the body digest.")
+
+    def test_jwks_max_age_follows_setting(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_JWKS_MAX_AGE=60)):
+            response = self.client.get(reverse("api-1.0.0:jwks"))
+
+        self.assertEqual("public, max-age=60", response["Cache-Control"], "max-age is configurable.")
+
+    def test_jwks_can_verify_token(self) -> None:
+        token, _ = get_refresh_token_for_user(get_user_model().objects.create_user(username="user"))
+
+        response = self.client.get(reverse("api-1.0.0:jwks"))
+        public_key = jwt.PyJWK(response.json()["keys"][0]).key
+
+        self.assertEqual("user", jwt.decode(token, public_key, algorithms=["RS256"])["username"])
+
+    def test_jwks_not_modified(self) -> None:
+        etag = self.client.get(reverse("api-1.0.0:jwks"))["ETag"]
+
+        response = self.client.get(reverse("api-1.0.0:jwks"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(304, response.status_code, "Unchanged JWKS is not sent again.")
+        self.assertEqual(etag, response["ETag"], "304 response has the ETag.")
+
+    def test_jwks_etag_changes_after_rotation(self) -> None:
+        etag = self.client.get(reverse("api-1.0.0:jwks"))["ETag"]
+        make_and_save_key_pair()
+
+        response = self.client.get(reverse("api-1.0.0:jwks"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(200, response.status_code, "New keys are served after rotation.")
+        self.assertNotEqual(etag, response["ETag"], "ETag changes with the keys.")
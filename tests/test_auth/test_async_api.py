@@ -0,0 +1,229 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from freezegun import freeze_time
+
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.token_operations import get_refresh_token_for_user
+from ninja_simple_jwt.settings import DEFAULTS
+
+crypto_executor = ThreadPoolExecutor(max_workers=2)
+
+
+class TestAsyncAuthEndPoints(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        make_and_save_key_pair()
+
+
+class TestAsyncMobileSignIn(TestAsyncAuthEndPoints):
+    def test_user_can_sign_in(self) -> None:
+        username = "user"
+        password = "password"
+        user = get_user_model().objects.create_user(username=username, password=password)
+
+        response = self.client.post(
+            reverse("api-1.0.0:async_mobile_signin"),
+            data={"username": username, "password": password},
+            content_type="application/json",
+        )
+
+        self.assertEqual(200, response.status_code, "Correct status code.")
+        self.assertIn("refresh", response.json(), "Response data contains refresh token.")
+        self.assertIn("access", response.json(), "Response data contains access token.")
+
+        user.refresh_from_db()
+        self.assertIsNotNone(user.last_login, "User.last_login updated.")
+
+    def test_user_can_sign_in_with_crypto_offloaded_to_executor(self) -> None:
+        username = "user"
+        password = "password"
+        get_user_model().objects.create_user(username=username, password=password)
+
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(
+                JWT_ASYNC_OFFLOAD_CRYPTO=True,
+                JWT_ASYNC_CRYPTO_EXECUTOR="tests.test_auth.test_async_api.crypto_executor",
+            )
+        ):
+            response = self.client.post(
+                reverse("api-1.0.0:async_mobile_signin"),
+                data={"username": username, "password": password},
+                content_type="application/json",
+            )
+
+        self.assertEqual(200, response.status_code, "Correct status code.")
+        self.assertIn("access", response.json(), "Response data contains access token.")
+
+    def test_wrong_password_cannot_sign_in(self) -> None:
+        get_user_model().objects.create_user(username="user", password="password")
+
+        response = self.client.post(
+            reverse("api-1.0.0:async_mobile_signin"),
+            data={"username": "user", "password": "wrong"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(401, response.status_code, "Wrong password cannot sign in.")
+
+
+class TestAsyncMobileRefresh(TestAsyncAuthEndPoints):
+    def test_user_can_refresh_token(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+        refresh_token, _ = get_refresh_token_for_user(user)
+
+        response = self.client.post(
+            reverse("api-1.0.0:async_mobile_token_refresh"),
+            data={"refresh": refresh_token},
+            content_type="application/json",
+        )
+
+        self.assertEqual(200, response.status_code, "Correct status code.")
+        self.assertIn("access", response.json(), "Response data contains access token.")
+
+
+class TestAsyncWebSignIn(TestAsyncAuthEndPoints):
+    def test_user_can_sign_in(self) -> None:
+        username = "user"
+        password = "password"
+        get_user_model().objects.create_user(username=username, password=password)
+
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(
+                JWT_REFRESH_TOKEN_LIFETIME=timedelta(days=31),
+                WEB_REFRESH_COOKIE_PATH="/tests/refresh_api_path",
+            )
+        ):
+            with freeze_time("2024-01-11 12:00:01"):
+                response = self.client.post(
+                    reverse("api-1.0.0:async_web_signin"),
+                    data={"username": username, "password": password},
+                    content_type="application/json",
+                )
+
+        self.assertEqual(200, response.status_code, "Correct status code.")
+        self.assertNotIn("refresh", response.json(), "Response body should not contain refresh token.")
+        self.assertIn("refresh", response.cookies, "Response header Set-Cookie has refresh token.")
+        self.assertEqual(
+            "/tests/refresh_api_path", response.cookies["refresh"]["path"], "Refresh token cookie has correct path."
+        )
+
+
+class TestAsyncWebRefresh(TestAsyncAuthEndPoints):
+    def test_user_token_refresh_valid(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+        refresh_token, _ = get_refresh_token_for_user(user)
+
+        response = self.client.post(
+            reverse("api-1.0.0:async_web_token_refresh"),
+            content_type="application/json",
+            HTTP_COOKIE=f"refresh={refresh_token}",
+        )
+
+        self.assertEqual(200, response.status_code, "Correct status code.")
+        self.assertIn("access", response.json(), "Response body has access token.")
+
+    def test_user_token_refresh_invalid(self) -> None:
+        response = self.client.post(
+            reverse("api-1.0.0:async_web_token_refresh"),
+            content_type="application/json",
+            HTTP_COOKIE="refresh=bad_token",
+        )
+
+        self.assertEqual(401, response.status_code, "Correct status code.")
+
+
+class TestAsyncWebSignOut(TestAsyncAuthEndPoints):
+    def test_user_sign_out_with_valid_refresh_token(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+        refresh_token, _ = get_refresh_token_for_user(user)
+
+        response = self.client.post(
+            reverse("api-1.0.0:async_web_sign_out"),
+            content_type="application/json",
+            HTTP_COOKIE=f"refresh={refresh_token}",
+        )
+
+        self.assertEqual(204, response.status_code, "Correct status code.")
+        self.assertEqual("", response.cookies["refresh"].value, "Refresh token cookie is deleted.")
+
+
+class TestAsyncRefreshTokenRevocation(TestAsyncAuthEndPoints):
+    def test_mobile_refresh_rotates_refresh_token(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+        refresh_token, _ = get_refresh_token_for_user(user)
+
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(
+                JWT_REVOCATION_STORE_CLS="ninja_simple_jwt.jwt.revocation.DatabaseRevocationStore",
+                JWT_REFRESH_TOKEN_ROTATION=True,
+            )
+        ):
+            response = self.client.post(
+                reverse("api-1.0.0:async_mobile_token_refresh"),
+                data={"refresh": refresh_token},
+                content_type="application/json",
+            )
+            reused_response = self.client.post(
+                reverse("api-1.0.0:async_mobile_token_refresh"),
+                data={"refresh": refresh_token},
+                content_type="application/json",
+            )
+
+        self.assertEqual(200, response.status_code, "Correct status code.")
+        self.assertIn("refresh", response.json(), "Response data contains new refresh token.")
+        self.assertEqual(401, reused_response.status_code, "Rotated refresh token cannot be reused.")
+
+    def test_rotation_signs_tokens_on_crypto_executor(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+        refresh_token, _ = get_refresh_token_for_user(user)
+
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(
+                JWT_REVOCATION_STORE_CLS="ninja_simple_jwt.jwt.revocation.DatabaseRevocationStore",
+                JWT_REFRESH_TOKEN_ROTATION=True,
+                JWT_ASYNC_OFFLOAD_CRYPTO=True,
+                JWT_ASYNC_CRYPTO_EXECUTOR="tests.test_auth.test_async_api.crypto_executor",
+            )
+        ):
+            with mock.patch.object(crypto_executor, "submit", wraps=crypto_executor.submit) as submit:
+                response = self.client.post(
+                    reverse("api-1.0.0:async_mobile_token_refresh"),
+                    data={"refresh": refresh_token},
+                    content_type="application/json",
+                )
+
+        self.assertEqual(200, response.status_code, "Correct status code.")
+        offloaded = [call.args[0].func.__name__ for call in submit.call_args_list]
+        self.assertEqual(["_decode_verified_token", "_issue_rotated_token_pair"], offloaded, "Crypto is offloaded.")
+
+    def test_mobile_sign_out_revokes_refresh_token(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+        refresh_token, _ = get_refresh_token_for_user(user)
+
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(
+                JWT_REVOCATION_STORE_CLS="ninja_simple_jwt.jwt.revocation.DatabaseRevocationStore"
+            )
+        ):
+            sign_out_response = self.client.post(
+                reverse("api-1.0.0:async_mobile_sign_out"),
+                data={"refresh": refresh_token},
+                content_type="application/json",
+            )
+            response = self.client.post(
+                reverse("api-1.0.0:async_mobile_token_refresh"),
+                data={"refresh": refresh_token},
+                content_type="application/json",
+            )
+
+        self.assertEqual(204, sign_out_response.status_code, "Correct status code.")
+        self.assertEqual(401, response.status_code, "Signed out refresh token cannot be used.")
@@ -1,10 +1,21 @@
 from typing import Any
 
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
+from ninja.errors import AuthenticationError
 
-from ninja_simple_jwt.auth.ninja_auth import HttpJwtAuth
+from ninja_simple_jwt.auth.ninja_auth import AsyncHttpJwtAuth, HttpJwtAuth
+from ninja_simple_jwt.auth.token_user import TokenUser
 from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.token_operations import (
+    TokenTypes,
+    encode_token,
+    get_access_token_for_user,
+    revoke_access_token,
+)
+from ninja_simple_jwt.jwt.verified_token_cache import verified_token_cache
 from ninja_simple_jwt.settings import DEFAULTS
 
 
@@ -37,3 +48,127 @@ class TestHttpJwtAuth(TestNinjaAuth):
         ):
             HttpJwtAuth.set_token_claims_to_user(user, token_data)
             self.assertEqual(user.username, username, "Customized settings should set the token claims to the user.")
+
+    def test_authenticate_uses_verified_token_cache(self) -> None:
+        user = get_user_model().objects.create_user(username="user")
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_VERIFIED_TOKEN_CACHE_SIZE=10)):
+            token, _ = get_access_token_for_user(user)
+            for _ in range(3):
+                request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+                request.user = AnonymousUser()
+                HttpJwtAuth().authenticate(request, token)
+
+            stats = verified_token_cache.stats()
+
+        self.assertEqual(1, stats["misses"], "Token is verified once.")
+        self.assertEqual(2, stats["hits"], "Later requests are served from cache.")
+
+    def test_authenticate_attaches_token_user(self) -> None:
+        token, _ = encode_token({"user_id": 1, "username": "user"}, TokenTypes.ACCESS)
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(TOKEN_USER_CLS="ninja_simple_jwt.auth.token_user.TokenUser")
+        ):
+            HttpJwtAuth().authenticate(request, token)
+
+            self.assertIsInstance(request.user, TokenUser, "Token user is attached without auth middleware.")
+            self.assertEqual(1, request.user.pk, "Token user is built from the token claims.")
+
+
+class TestAccessTokenRevocation(TestNinjaAuth):
+    def revocation_settings(self, **kwargs: Any) -> dict:
+        return self.merge_settings(
+            **{
+                "JWT_REVOCATION_STORE_CLS": "ninja_simple_jwt.jwt.revocation.DatabaseRevocationStore",
+                "JWT_REVOCATION_BLOOM_FILTER": True,
+                "JWT_ACCESS_TOKEN_REVOCATION": True,
+                **kwargs,
+            }
+        )
+
+    def test_revoked_access_token_is_rejected(self) -> None:
+        token, _ = encode_token({}, TokenTypes.ACCESS)
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        request.user = AnonymousUser()
+
+        with self.settings(NINJA_SIMPLE_JWT=self.revocation_settings(JWT_VERIFIED_TOKEN_CACHE_SIZE=10)):
+            self.assertTrue(HttpJwtAuth().authenticate(request, token), "Token is valid before revocation.")
+            revoke_access_token(token)
+
+            with self.assertRaises(AuthenticationError):
+                HttpJwtAuth().authenticate(request, token)  # served from the verified token cache
+
+    def test_revoked_access_token_is_accepted_when_revocation_is_disabled(self) -> None:
+        token, _ = encode_token({}, TokenTypes.ACCESS)
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        request.user = AnonymousUser()
+
+        with self.settings(NINJA_SIMPLE_JWT=self.revocation_settings(JWT_ACCESS_TOKEN_REVOCATION=False)):
+            revoke_access_token(token)
+
+            self.assertTrue(HttpJwtAuth().authenticate(request, token), "Access tokens are not checked.")
+
+    async def test_async_revoked_access_token_is_rejected(self) -> None:
+        token, _ = encode_token({}, TokenTypes.ACCESS)
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        request.user = AnonymousUser()
+
+        with self.settings(NINJA_SIMPLE_JWT=self.revocation_settings()):
+            self.assertTrue(await AsyncHttpJwtAuth().authenticate(request, token), "Token is valid before revocation.")
+            await sync_to_async(revoke_access_token)(token)
+
+            with self.assertRaises(AuthenticationError):
+                await AsyncHttpJwtAuth().authenticate(request, token)
+
+
+class TestAsyncHttpJwtAuth(TestNinjaAuth):
+    async def test_authenticate_sets_token_claims_to_user(self) -> None:
+        token, _ = encode_token({"username": "user"}, TokenTypes.ACCESS)
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        request.user = AnonymousUser()
+
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(TOKEN_CLAIM_USER_ATTRIBUTE_MAP={"username": "username"})
+        ):
+            result = await AsyncHttpJwtAuth().authenticate(request, token)
+
+        self.assertTrue(result, "Valid token is authenticated.")
+        self.assertEqual("user", request.user.username, "Token claims are set to the user.")
+
+    async def test_authenticate_with_crypto_offloaded(self) -> None:
+        token, _ = encode_token({"username": "user"}, TokenTypes.ACCESS)
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        request.user = AnonymousUser()
+
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(
+                TOKEN_CLAIM_USER_ATTRIBUTE_MAP={"username": "username"}, JWT_ASYNC_OFFLOAD_CRYPTO=True
+            )
+        ):
+            result = await AsyncHttpJwtAuth().authenticate(request, token)
+
+        self.assertTrue(result, "Valid token is authenticated in a worker thread.")
+        self.assertEqual("user", request.user.username, "Token claims are set to the user.")
+
+    async def test_authenticate_invalid_token_raises_authentication_error(self) -> None:
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION="Bearer not.real.token")
+        request.user = AnonymousUser()
+
+        with self.assertRaises(AuthenticationError):
+            await AsyncHttpJwtAuth().authenticate(request, "not.real.token")
+
+    def test_auth_is_recognized_as_async(self) -> None:
+        self.assertTrue(AsyncHttpJwtAuth().is_async, "Django-ninja awaits the authenticate coroutine.")
+
+    async def test_call_returns_authenticate_coroutine_for_bearer_header(self) -> None:
+        token, _ = encode_token({}, TokenTypes.ACCESS)
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        request.user = AnonymousUser()
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            result = AsyncHttpJwtAuth()(request)
+            if result is None:
+                self.fail("Bearer header is authenticated.")
+            self.assertTrue(await result, "Django-ninja awaits the result of the call.")
+        self.assertIsNone(AsyncHttpJwtAuth()(RequestFactory().get("/")), "Requests without a token are not awaited.")
@@ -0,0 +1,41 @@
+from typing import Any
+
+from django.test import TestCase
+
+from ninja_simple_jwt.auth.token_user import TokenUser
+from ninja_simple_jwt.settings import DEFAULTS
+
+
+class TestTokenUser(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def test_token_user_resolves_mapped_attributes(self) -> None:
+        user = TokenUser({"user_id": 1, "username": "user", "is_staff": True, "is_superuser": False})
+
+        self.assertTrue(user.is_authenticated, "Token user is authenticated.")
+        self.assertFalse(user.is_anonymous, "Token user is not anonymous.")
+        self.assertEqual(1, user.pk, "pk comes from the claim mapped to id.")
+        self.assertEqual(1, user.id, "Mapped attribute is resolved from its claim.")
+        self.assertEqual("user", user.get_username(), "Username comes from the claim mapped to username.")
+        self.assertTrue(user.is_staff, "is_staff comes from the token.")
+        self.assertFalse(user.is_superuser, "is_superuser comes from the token.")
+
+    def test_token_user_uses_custom_claim_mapping(self) -> None:
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(TOKEN_CLAIM_USER_ATTRIBUTE_MAP={"sub": "id", "name": lambda u: ""})
+        ):
+            user = TokenUser({"sub": 7, "name": "Bebe Chen"})
+
+            self.assertEqual(7, user.pk, "pk follows the configured mapping.")
+            self.assertEqual("Bebe Chen", user.name, "Callable mapping is exposed under the claim name.")
+            self.assertFalse(user.is_staff, "Unmapped is_staff defaults to False.")
+            with self.assertRaises(AttributeError):
+                getattr(user, "email")
+
+    def test_token_user_has_no_instance_dict(self) -> None:
+        user = TokenUser({})
+
+        with self.assertRaises(AttributeError):
+            setattr(user, "foo", "bar")
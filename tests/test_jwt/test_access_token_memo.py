@@ -0,0 +1,141 @@
+from datetime import timedelta
+from threading import Thread
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from freezegun import freeze_time
+
+from ninja_simple_jwt.jwt.access_token_memo import AccessTokenMemo, access_token_memo
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.token_operations import (
+    TokenTypes,
+    decode_token,
+    get_access_token_from_refresh_token,
+    get_refresh_token_for_user,
+    revoke_access_token,
+)
+from ninja_simple_jwt.settings import DEFAULTS
+
+
+class TestAccessTokenMemo(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, "JWT_ACCESS_TOKEN_REUSE_WINDOW": timedelta(seconds=10), **kwargs}
+
+    def setUp(self) -> None:
+        self.memo = AccessTokenMemo()
+
+    def test_memo_disabled_by_default(self) -> None:
+        self.memo.set("jti", "kid", "token", {"exp": 1704975301})
+
+        self.assertIsNone(self.memo.get("jti", "kid"), "Nothing is memoized by default.")
+
+    def test_memo_entry_is_reused_within_window(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            with freeze_time("2024-01-11 12:00:01") as frozen_time:
+                self.memo.set("jti", "kid", "token", {"exp": 1704975301})
+                self.assertEqual(("token", {"exp": 1704975301}), self.memo.get("jti", "kid"), "Reused in window.")
+                self.assertIsNone(self.memo.get("jti", "other-kid"), "Not reused after the signing key changed.")
+
+                self.memo.set("jti", "kid", "token", {"exp": 1704975301})
+                frozen_time.tick(timedelta(seconds=10))
+                self.assertIsNone(self.memo.get("jti", "kid"), "Not reused after the window.")
+
+    def test_memo_entry_is_not_reused_past_access_token_expiry(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            with freeze_time("2024-01-11 12:00:01") as frozen_time:
+                self.memo.set("jti", "kid", "token", {"exp": 1704974405})
+                frozen_time.tick(timedelta(seconds=5))
+                self.assertIsNone(self.memo.get("jti", "kid"), "Expired access token is not reused.")
+
+    def test_memo_evicts_least_recently_used(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_ACCESS_TOKEN_REUSE_SIZE=2)):
+            with freeze_time("2024-01-11 12:00:01"):
+                self.memo.set("a", "kid", "token-a", {"exp": 1704975301})
+                self.memo.set("b", "kid", "token-b", {"exp": 1704975301})
+                self.memo.get("a", "kid")
+                self.memo.set("c", "kid", "token-c", {"exp": 1704975301})
+
+                self.assertIsNotNone(self.memo.get("a", "kid"), "Recently used entry is kept.")
+                self.assertIsNone(self.memo.get("b", "kid"), "Least recently used entry is evicted.")
+                self.assertEqual(2, self.memo.stats()["size"])
+
+    def test_memo_is_thread_safe(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_ACCESS_TOKEN_REUSE_SIZE=50)):
+
+            def use_memo(thread: int) -> None:
+                for i in range(500):
+                    self.memo.set(f"{thread}-{i}", "kid", "token", {"exp": 2**40})
+                    self.memo.get(f"{thread}-{i // 2}", "kid")
+
+            threads = [Thread(target=use_memo, args=(thread,)) for thread in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(50, self.memo.stats()["size"], "Memo stays bounded under concurrent use.")
+
+
+class TestRefreshReusesAccessToken(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        make_and_save_key_pair()
+        access_token_memo.clear()
+        self.user = get_user_model().objects.create_user(username="user")
+
+    def tearDown(self) -> None:
+        access_token_memo.clear()
+
+    def test_repeated_refresh_reuses_access_token(self) -> None:
+        refresh_token, _ = get_refresh_token_for_user(self.user)
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_ACCESS_TOKEN_REUSE_WINDOW=timedelta(seconds=10))):
+            first_token, first_payload = get_access_token_from_refresh_token(refresh_token)
+            second_token, second_payload = get_access_token_from_refresh_token(refresh_token)
+            make_and_save_key_pair()
+            third_token, _ = get_access_token_from_refresh_token(get_refresh_token_for_user(self.user)[0])
+
+        self.assertEqual(first_token, second_token, "Access token is reused.")
+        self.assertEqual(first_payload, second_payload, "Access token payload is reused.")
+        self.assertNotEqual(first_token, third_token, "Other refresh token gets its own access token.")
+
+    def test_revoked_access_token_is_not_reused(self) -> None:
+        refresh_token, _ = get_refresh_token_for_user(self.user)
+        revocation_settings = self.merge_settings(
+            JWT_ACCESS_TOKEN_REUSE_WINDOW=timedelta(seconds=30),
+            JWT_ACCESS_TOKEN_REVOCATION=True,
+            JWT_REVOCATION_STORE_CLS="ninja_simple_jwt.jwt.revocation.DatabaseRevocationStore",
+        )
+
+        with self.settings(NINJA_SIMPLE_JWT=revocation_settings):
+            first_token, _ = get_access_token_from_refresh_token(refresh_token)
+            revoke_access_token(first_token)
+            second_token, _ = get_access_token_from_refresh_token(refresh_token)
+            decoded = decode_token(second_token, token_type=TokenTypes.ACCESS)
+
+        self.assertNotEqual(first_token, second_token, "Revoked access token is not reused.")
+        self.assertIsNotNone(decoded, "New access token is valid.")
+
+    def test_refresh_signs_new_access_token_by_default(self) -> None:
+        refresh_token, _ = get_refresh_token_for_user(self.user)
+
+        first_token, _ = get_access_token_from_refresh_token(refresh_token)
+        second_token, _ = get_access_token_from_refresh_token(refresh_token)
+
+        self.assertNotEqual(first_token, second_token, "Access token is signed on every refresh.")
+
+    def test_web_token_refresh_reuses_access_token(self) -> None:
+        refresh_token, _ = get_refresh_token_for_user(self.user)
+        self.client.cookies[DEFAULTS["JWT_REFRESH_COOKIE_NAME"]] = refresh_token
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_ACCESS_TOKEN_REUSE_WINDOW=timedelta(seconds=10))):
+            responses = [self.client.post(reverse("api-1.0.0:web_token_refresh")) for _ in range(3)]
+
+        self.assertEqual([200] * 3, [response.status_code for response in responses])
+        self.assertEqual(1, len({response.json()["access"] for response in responses}), "Tabs share one token.")
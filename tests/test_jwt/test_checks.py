@@ -0,0 +1,84 @@
+import os
+from typing import Any
+
+from django.apps import apps
+from django.test import TestCase
+
+from ninja_simple_jwt.checks import check_jwt_keys
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+from ninja_simple_jwt.settings import DEFAULTS
+
+OTHER_PUBLIC_KEY_PATH = "jwt-signing-other.pub"
+
+
+class TestCheckJwtKeys(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        make_and_save_key_pair()
+
+    def tearDown(self) -> None:
+        if os.path.exists(OTHER_PUBLIC_KEY_PATH):
+            os.remove(OTHER_PUBLIC_KEY_PATH)
+        InMemoryJwtKeyPair.clear()
+
+    def get_message_ids(self, **kwargs: Any) -> list[str]:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(**kwargs)):
+            InMemoryJwtKeyPair.clear()
+            return [message.id for message in check_jwt_keys(None)]
+
+    def test_valid_key_pair_passes(self) -> None:
+        self.assertEqual([], self.get_message_ids())
+
+    def test_missing_private_key_is_a_warning(self) -> None:
+        self.assertEqual(["ninja_simple_jwt.W001"], self.get_message_ids(JWT_PRIVATE_KEY_PATH="missing.pem"))
+
+    def test_invalid_public_key_is_an_error(self) -> None:
+        with open(OTHER_PUBLIC_KEY_PATH, "w", encoding="utf-8") as f:
+            f.write("not a key")
+
+        self.assertEqual(["ninja_simple_jwt.E004"], self.get_message_ids(JWT_PUBLIC_KEY_PATH=OTHER_PUBLIC_KEY_PATH))
+
+    def test_mismatched_key_pair_is_an_error(self) -> None:
+        os.replace(DEFAULTS["JWT_PUBLIC_KEY_PATH"], OTHER_PUBLIC_KEY_PATH)
+        make_and_save_key_pair()
+
+        self.assertEqual(["ninja_simple_jwt.E005"], self.get_message_ids(JWT_PUBLIC_KEY_PATH=OTHER_PUBLIC_KEY_PATH))
+
+    def test_jwks_source_requires_url(self) -> None:
+        self.assertEqual(["ninja_simple_jwt.E001"], self.get_message_ids(JWT_PUBLIC_KEY_SOURCE="jwks"))
+
+
+class TestPreloadKeys(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        make_and_save_key_pair()
+
+    def test_ready_preloads_keys_when_enabled(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_PRELOAD_KEYS=True)):
+            InMemoryJwtKeyPair.clear()
+            apps.get_app_config("ninja_simple_jwt").ready()
+
+        self.assertIsNotNone(InMemoryJwtKeyPair._signing_key, "Private key is preloaded.")  # pylint: disable=W0212
+        self.assertIsNotNone(InMemoryJwtKeyPair._public_keys, "Public keys are preloaded.")  # pylint: disable=W0212
+
+    def test_ready_does_not_load_keys_by_default(self) -> None:
+        InMemoryJwtKeyPair.clear()
+        apps.get_app_config("ninja_simple_jwt").ready()
+
+        self.assertIsNone(InMemoryJwtKeyPair._signing_key, "Keys are loaded lazily.")  # pylint: disable=W0212
+
+    def test_preload_logs_keys_that_cannot_be_loaded(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_PRIVATE_KEY_PATH="missing.pem")):
+            InMemoryJwtKeyPair.clear()
+            with self.assertLogs("ninja_simple_jwt.jwt.key_retrieval", "WARNING"):
+                InMemoryJwtKeyPair.preload()
+
+            public_keys = InMemoryJwtKeyPair._public_keys  # pylint: disable=W0212
+            self.assertIsNotNone(public_keys, "Public key is still preloaded.")
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+from typing import Any
+
+from django.test import TestCase
+
+from ninja_simple_jwt.jwt.claim_mapping import ClaimMapping, ClaimMappingPlan
+from ninja_simple_jwt.settings import DEFAULTS
+
+
+class TestClaimMappingPlan(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        self.plan = ClaimMappingPlan({"user_id": "id", "name": lambda user: f"{user.first_name} {user.last_name}"})
+
+    def test_get_claims_from_user(self) -> None:
+        user = SimpleNamespace(id=1, first_name="Bebe", last_name="Chen")
+
+        self.assertEqual({"user_id": 1, "name": "Bebe Chen"}, self.plan.get_claims_from_user(user))
+
+    def test_get_claims_from_token(self) -> None:
+        token = {"user_id": 1, "name": "Bebe Chen", "jti": "abc"}
+
+        self.assertEqual({"user_id": 1, "name": "Bebe Chen"}, self.plan.get_claims_from_token(token))
+
+    def test_set_claims_to_user(self) -> None:
+        user = SimpleNamespace()
+
+        self.plan.set_claims_to_user(user, {"user_id": 1, "name": "Bebe Chen"})
+
+        self.assertEqual(1, user.id, "String mapping sets the user attribute.")
+        self.assertEqual("Bebe Chen", user.name, "Callable mapping sets the claim name on the user.")
+
+    def test_plan_is_recompiled_when_settings_change(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(TOKEN_CLAIM_USER_ATTRIBUTE_MAP={"user_id": "id"})):
+            plan = ClaimMapping.plan
+            self.assertIs(plan, ClaimMapping.plan, "Plan is compiled once.")
+            self.assertEqual(("user_id",), plan.claims)
+
+        self.assertEqual(tuple(DEFAULTS["TOKEN_CLAIM_USER_ATTRIBUTE_MAP"]), ClaimMapping.plan.claims)
@@ -0,0 +1,100 @@
+import os
+from datetime import timedelta
+from typing import Any
+from unittest import mock
+
+from django.test import TestCase
+from freezegun import freeze_time
+
+from ninja_simple_jwt.jwt.host_key_cache import HostKeyCache
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+from ninja_simple_jwt.jwt.token_operations import TokenTypes, decode_token, encode_token
+from ninja_simple_jwt.settings import DEFAULTS
+
+HOST_KEY_CACHE_PATH = "jwt-keys.cache"
+
+
+class TestHostKeyCache(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, "JWT_HOST_KEY_CACHE_PATH": HOST_KEY_CACHE_PATH, **kwargs}
+
+    def setUp(self) -> None:
+        self.remove_cache_files()
+
+    def tearDown(self) -> None:
+        self.remove_cache_files()
+        InMemoryJwtKeyPair.clear()
+
+    @staticmethod
+    def remove_cache_files() -> None:
+        for path in (HOST_KEY_CACHE_PATH, f"{HOST_KEY_CACHE_PATH}.lock"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_make_and_save_key_pair_writes_host_key_cache(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            make_and_save_key_pair()
+
+            with mock.patch.object(InMemoryJwtKeyPair, "read_key_files") as read_key_files:
+                token, _ = encode_token({"name": "bebe"}, TokenTypes.ACCESS)
+                decoded = decode_token(token, token_type=TokenTypes.ACCESS)
+
+        self.assertEqual("bebe", decoded["name"])
+        read_key_files.assert_not_called()
+
+    def test_missing_cache_file_is_filled_from_storage_once(self) -> None:
+        make_and_save_key_pair()
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            InMemoryJwtKeyPair.clear()
+            with mock.patch.object(
+                InMemoryJwtKeyPair, "read_key_files", wraps=InMemoryJwtKeyPair.read_key_files
+            ) as read_key_files:
+                signing_key_id = InMemoryJwtKeyPair.signing_key_id
+                InMemoryJwtKeyPair.clear()  # another worker process
+                self.assertEqual(signing_key_id, InMemoryJwtKeyPair.signing_key_id)
+
+        self.assertEqual(1, read_key_files.call_count, "Storage is read once per host.")
+        self.assertTrue(os.path.exists(HOST_KEY_CACHE_PATH), "Cache file is written.")
+
+    def test_keys_are_reparsed_only_when_version_changes(self) -> None:
+        with freeze_time() as frozen_time:
+            with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+                make_and_save_key_pair()
+                private_key = InMemoryJwtKeyPair.parsed_private_key
+
+                frozen_time.tick(timedelta(seconds=2))
+                self.assertIs(private_key, InMemoryJwtKeyPair.parsed_private_key, "Unchanged keys are not re-parsed.")
+
+                with mock.patch.object(InMemoryJwtKeyPair, "clear"):
+                    make_and_save_key_pair()  # rotated by another process on the host
+
+                self.assertIs(private_key, InMemoryJwtKeyPair.parsed_private_key, "Version is checked periodically.")
+                frozen_time.tick(timedelta(seconds=2))
+                self.assertIsNot(private_key, InMemoryJwtKeyPair.parsed_private_key, "Rotated keys are picked up.")
+
+    def test_corrupt_cache_file_is_refilled(self) -> None:
+        make_and_save_key_pair()
+        with open(HOST_KEY_CACHE_PATH, "wb") as f:
+            f.write(b"garbage")
+
+        host_keys = HostKeyCache(HOST_KEY_CACHE_PATH).load(InMemoryJwtKeyPair.read_key_files, max_age=None)
+
+        self.assertEqual(InMemoryJwtKeyPair.public_key, host_keys.public_key, "Keys are read from storage.")
+
+    def test_keys_are_copied_only_when_version_changes(self) -> None:
+        make_and_save_key_pair()
+        HostKeyCache(HOST_KEY_CACHE_PATH).write(*InMemoryJwtKeyPair.read_key_files())
+        host_key_cache = HostKeyCache(HOST_KEY_CACHE_PATH)  # another worker process
+
+        host_keys = host_key_cache.load(InMemoryJwtKeyPair.read_key_files, max_age=None)
+        self.assertIs(host_keys, host_key_cache.load(InMemoryJwtKeyPair.read_key_files, max_age=None))
+
+        make_and_save_key_pair()
+        HostKeyCache(HOST_KEY_CACHE_PATH).write(*InMemoryJwtKeyPair.read_key_files())
+        rotated_host_keys = host_key_cache.load(InMemoryJwtKeyPair.read_key_files, max_age=None)
+
+        self.assertNotEqual(host_keys.version, rotated_host_keys.version)
+        self.assertEqual(InMemoryJwtKeyPair.read_key_files()[1], rotated_host_keys.public_key, "Rotated keys are read.")
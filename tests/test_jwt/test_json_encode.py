@@ -1,10 +1,13 @@
 import json
-from datetime import datetime
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
 from uuid import uuid4
 
 from django.test import TestCase
 
-from ninja_simple_jwt.jwt.json_encode import TokenUserEncoder
+from ninja_simple_jwt.jwt import json_encode
+from ninja_simple_jwt.jwt.json_encode import TokenUserEncoder, dumps, to_json_primitive
 
 
 class TestDjangoUserEncoder(TestCase):
@@ -21,3 +24,30 @@ class TestDjangoUserEncoder(TestCase):
         result = json.dumps(test_uuid, cls=TokenUserEncoder)
 
         self.assertEqual(f'"{str(test_uuid)}"', result)
+
+
+class TestDumps(TestCase):
+    def setUp(self) -> None:
+        self.data = {
+            "user_id": uuid4(),
+            "last_login": datetime(2024, 1, 11, 12, 0, 1, 123456, tzinfo=timezone.utc),
+            "birthday": date(2000, 2, 29),
+            "balance": Decimal("1.50"),
+            "groups": ("staff", 2),
+            "is_active": True,
+            "email": None,
+        }
+
+    def test_orjson_output_matches_json_output(self) -> None:
+        with patch("ninja_simple_jwt.jwt.json_encode.orjson", None):
+            json_output = dumps(self.data, TokenUserEncoder)
+
+        self.assertIsNotNone(json_encode.orjson, "orjson is installed for the fast path.")
+        self.assertEqual(json_output, dumps(self.data, TokenUserEncoder), "Both serializers produce the same JSON.")
+        self.assertIn(b'"last_login":"2024-01-11T12:00:01.123Z"', json_output, "Datetime is serialized by the encoder.")
+
+    def test_to_json_primitive_serializes_values_once(self) -> None:
+        primitive = to_json_primitive(self.data, TokenUserEncoder().default)
+
+        self.assertEqual(json.loads(dumps(self.data, TokenUserEncoder)), primitive, "Same values as the encoder.")
+        self.assertEqual(dumps(self.data, TokenUserEncoder), dumps(primitive), "Serializes without the encoder.")
@@ -0,0 +1,56 @@
+from io import StringIO
+from typing import Any
+
+from cryptography.hazmat.primitives.asymmetric.ec import EllipticCurvePrivateKey
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase
+
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair, make_keys
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+from ninja_simple_jwt.jwt.token_operations import TokenTypes, decode_token, encode_token
+from ninja_simple_jwt.settings import DEFAULTS
+
+
+class TestMakeKeys(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def test_make_keys_for_each_algorithm(self) -> None:
+        expected_key_types = {"RS256": RSAPrivateKey, "ES256": EllipticCurvePrivateKey, "EdDSA": Ed25519PrivateKey}
+
+        for algorithm, key_type in expected_key_types.items():
+            with self.subTest(algorithm=algorithm):
+                with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_ALGORITHM=algorithm)):
+                    pem_private_key, _ = make_keys()
+
+                self.assertIsInstance(load_pem_private_key(pem_private_key, password=None), key_type)
+
+    def test_make_keys_with_unsupported_algorithm_raises_exception(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_ALGORITHM="HS256")):
+            with self.assertRaises(ImproperlyConfigured):
+                make_keys()
+
+    def test_token_round_trip_for_each_algorithm(self) -> None:
+        for algorithm in ("RS256", "ES256", "EdDSA"):
+            with self.subTest(algorithm=algorithm):
+                with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_ALGORITHM=algorithm)):
+                    make_and_save_key_pair()
+                    token, _ = encode_token({"name": "bebe"}, TokenTypes.ACCESS)
+                    decoded = decode_token(token, token_type=TokenTypes.ACCESS)
+
+                self.assertEqual("bebe", decoded["name"], "Token signed and verified with configured algorithm.")
+
+    def test_make_rsa_is_deprecated_alias_of_make_signing_key(self) -> None:
+        stderr = StringIO()
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_ALGORITHM="ES256")):
+            call_command("make_rsa", stdout=StringIO(), stderr=stderr)
+            private_key = InMemoryJwtKeyPair.parsed_private_key
+
+        self.assertIsInstance(private_key, EllipticCurvePrivateKey, "Key pair is created for the JWT_ALGORITHM.")
+        self.assertIn("make_signing_key", stderr.getvalue(), "Deprecation points to the new command.")
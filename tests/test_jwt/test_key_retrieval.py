@@ -0,0 +1,160 @@
+import os
+import time
+from datetime import timedelta
+from threading import Thread
+from typing import Any
+from unittest import mock
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
+from django.test import TestCase
+from freezegun import freeze_time
+from jwt import InvalidSignatureError, InvalidTokenError
+
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair, get_key_id, split_pem_public_keys
+from ninja_simple_jwt.jwt.token_operations import TokenTypes, decode_token, encode_token
+from ninja_simple_jwt.settings import DEFAULTS
+
+KEYRING_PATH = "jwt-signing-keyring.pub"
+
+
+class TestInMemoryJwtKeyPair(TestCase):
+    def setUp(self) -> None:
+        make_and_save_key_pair()
+
+    def test_parsed_keys_are_key_objects(self) -> None:
+        self.assertIsInstance(InMemoryJwtKeyPair.parsed_private_key, RSAPrivateKey, "Private key is parsed.")
+        self.assertIsInstance(InMemoryJwtKeyPair.parsed_public_key, RSAPublicKey, "Public key is parsed.")
+
+    def test_parsed_keys_are_cached(self) -> None:
+        self.assertIs(
+            InMemoryJwtKeyPair.parsed_private_key,
+            InMemoryJwtKeyPair.parsed_private_key,
+            "Parsed private key is reused.",
+        )
+        self.assertIs(
+            InMemoryJwtKeyPair.parsed_public_key, InMemoryJwtKeyPair.parsed_public_key, "Parsed public key is reused."
+        )
+
+    def test_clear_resets_parsed_keys(self) -> None:
+        public_key = InMemoryJwtKeyPair.parsed_public_key
+
+        make_and_save_key_pair()
+
+        self.assertIsNot(public_key, InMemoryJwtKeyPair.parsed_public_key, "Parsed key is reloaded after clear.")
+
+
+class TestKeyLoading(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        make_and_save_key_pair()
+
+    def test_concurrent_cold_loads_read_storage_once(self) -> None:
+        read_private_key = InMemoryJwtKeyPair._get_private_jwt_key  # pylint: disable=W0212
+
+        def slow_read_private_key() -> bytes:
+            time.sleep(0.1)
+            return read_private_key()
+
+        with mock.patch.object(
+            InMemoryJwtKeyPair, "_get_private_jwt_key", side_effect=slow_read_private_key
+        ) as get_private_jwt_key:
+            threads = [Thread(target=lambda: InMemoryJwtKeyPair.parsed_private_key) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(1, get_private_jwt_key.call_count, "Private key is read from storage once.")
+
+    def test_keys_are_reloaded_after_refresh_interval(self) -> None:
+        with freeze_time() as frozen_time:
+            with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_KEY_REFRESH_INTERVAL=timedelta(minutes=5))):
+                InMemoryJwtKeyPair.clear()
+                signing_key_id = InMemoryJwtKeyPair.signing_key_id
+                with mock.patch.object(InMemoryJwtKeyPair, "clear"):
+                    make_and_save_key_pair()  # rotated by another process
+
+                frozen_time.tick(timedelta(minutes=4))
+                self.assertEqual(signing_key_id, InMemoryJwtKeyPair.signing_key_id, "Key is kept within interval.")
+
+                frozen_time.tick(timedelta(minutes=2))
+                self.assertNotEqual(signing_key_id, InMemoryJwtKeyPair.signing_key_id, "Rotated key is picked up.")
+                signing_key = InMemoryJwtKeyPair.signing_key
+                self.assertEqual(get_key_id(signing_key.key.public_key()), signing_key.kid, "kid matches the key.")
+                public_keys = InMemoryJwtKeyPair.public_keys
+                self.assertIs(public_keys.key, public_keys.verification_keys[signing_key.kid], "Keys match each other.")
+                token, _ = encode_token({}, TokenTypes.ACCESS)
+                decode_token(token, token_type=TokenTypes.ACCESS)
+
+    def test_current_keys_are_kept_when_reload_fails(self) -> None:
+        with freeze_time() as frozen_time:
+            with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_KEY_REFRESH_INTERVAL=timedelta(minutes=5))):
+                InMemoryJwtKeyPair.clear()
+                public_key = InMemoryJwtKeyPair.parsed_public_key
+                frozen_time.tick(timedelta(minutes=6))
+
+                with mock.patch.object(InMemoryJwtKeyPair, "_get_public_jwt_key", side_effect=FileNotFoundError):
+                    with self.assertLogs("ninja_simple_jwt.jwt.key_retrieval", "WARNING"):
+                        self.assertIs(public_key, InMemoryJwtKeyPair.parsed_public_key, "Current key is kept.")
+
+
+class TestKeyRotation(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        if os.path.exists(KEYRING_PATH):
+            os.remove(KEYRING_PATH)
+        make_and_save_key_pair()
+
+    def tearDown(self) -> None:
+        if os.path.exists(KEYRING_PATH):
+            os.remove(KEYRING_PATH)
+
+    def test_encode_token_stamps_kid_header(self) -> None:
+        token, _ = encode_token({}, TokenTypes.ACCESS)
+
+        self.assertEqual(InMemoryJwtKeyPair.signing_key_id, jwt.get_unverified_header(token)["kid"])
+        self.assertIn(InMemoryJwtKeyPair.signing_key_id, InMemoryJwtKeyPair.verification_keys)
+
+    def test_token_signed_with_retired_key_verifies_after_rotation(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_PUBLIC_KEYRING_PATH=KEYRING_PATH)):
+            old_token, _ = encode_token({"name": "bebe"}, TokenTypes.ACCESS)
+            make_and_save_key_pair()
+            new_token, _ = encode_token({"name": "bebe"}, TokenTypes.ACCESS)
+
+            self.assertEqual(2, len(InMemoryJwtKeyPair.verification_keys), "Keyring has current and retired key.")
+            self.assertEqual("bebe", decode_token(old_token, token_type=TokenTypes.ACCESS)["name"])
+            self.assertEqual("bebe", decode_token(new_token, token_type=TokenTypes.ACCESS)["name"])
+
+    def test_token_signed_with_replaced_key_fails_without_keyring(self) -> None:
+        old_token, _ = encode_token({}, TokenTypes.ACCESS)
+        make_and_save_key_pair()
+
+        with self.assertRaises(InvalidSignatureError):
+            decode_token(old_token, token_type=TokenTypes.ACCESS)
+
+    def test_unknown_kid_raises_invalid_token_error(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_PUBLIC_KEYRING_PATH=KEYRING_PATH)):
+            make_and_save_key_pair()
+            token, _ = encode_token({}, TokenTypes.ACCESS, kid="unknown")
+
+            with self.assertRaises(InvalidTokenError):
+                decode_token(token, token_type=TokenTypes.ACCESS)
+
+    def test_keyring_keeps_configured_number_of_retired_keys(self) -> None:
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(JWT_PUBLIC_KEYRING_PATH=KEYRING_PATH, JWT_PUBLIC_KEYRING_SIZE=2)
+        ):
+            for _ in range(4):
+                make_and_save_key_pair()
+
+            with open(KEYRING_PATH, "rb") as f:
+                self.assertEqual(2, len(split_pem_public_keys(f.read())), "Oldest retired keys are dropped.")
+            self.assertEqual(3, len(InMemoryJwtKeyPair.verification_keys))
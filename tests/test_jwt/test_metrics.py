@@ -0,0 +1,214 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from typing import Any
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from freezegun import freeze_time
+from jwt import PyJWTError
+from ninja.errors import AuthenticationError
+
+from ninja_simple_jwt.auth.ninja_auth import HttpJwtAuth
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+from ninja_simple_jwt.jwt.token_operations import TokenTypes, decode_token, encode_token
+from ninja_simple_jwt.metrics import InMemoryMetricsSink, Metrics, get_failure_reason
+from ninja_simple_jwt.profiling import RequestProfiler
+from ninja_simple_jwt.settings import DEFAULTS
+
+
+class TestMetrics(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, "JWT_METRICS_SINK_CLS": "ninja_simple_jwt.metrics.InMemoryMetricsSink", **kwargs}
+
+    def setUp(self) -> None:
+        make_and_save_key_pair()
+
+    @staticmethod
+    def failure_reason(token: str, token_type: TokenTypes) -> str:
+        try:
+            decode_token(token, token_type=token_type)
+        except PyJWTError as e:
+            return get_failure_reason(e)
+        return ""
+
+    def test_no_sink_is_configured_by_default(self) -> None:
+        self.assertIsNone(Metrics.sink, "Metrics are disabled by default.")
+
+    def test_failure_reasons(self) -> None:
+        token, _ = encode_token({}, TokenTypes.ACCESS)
+        with freeze_time(timedelta(days=-1)):
+            expired_token, _ = encode_token({}, TokenTypes.ACCESS)
+
+        self.assertEqual("expired", self.failure_reason(expired_token, TokenTypes.ACCESS))
+        self.assertEqual("wrong_token_type", self.failure_reason(token, TokenTypes.REFRESH))
+        self.assertEqual("malformed", self.failure_reason("garbage", TokenTypes.ACCESS))
+        make_and_save_key_pair()
+        self.assertEqual("bad_signature", self.failure_reason(token, TokenTypes.ACCESS))
+
+    def test_token_operations_are_timed_and_failures_counted(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            sink = Metrics.sink
+            token, _ = encode_token({}, TokenTypes.ACCESS)
+            decode_token(token, token_type=TokenTypes.ACCESS)
+            with self.assertRaises(PyJWTError):
+                decode_token(token, token_type=TokenTypes.REFRESH)
+
+        self.assertIsInstance(sink, InMemoryMetricsSink)
+        self.assertEqual(1, sink.histograms["encode_token"].count, "encode_token is timed.")
+        self.assertEqual(2, sink.histograms["decode_token"].count, "Failed calls are timed too.")
+        self.assertEqual({("decode_token", "wrong_token_type"): 1}, sink.failures, "Failure is counted by reason.")
+
+    def test_authenticate_failure_is_counted_with_token_error_reason(self) -> None:
+        with freeze_time(timedelta(days=-1)):
+            token, _ = encode_token({}, TokenTypes.ACCESS)
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        request.user = AnonymousUser()
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            sink = Metrics.sink
+            with self.assertRaises(AuthenticationError):
+                HttpJwtAuth().authenticate(request, token)
+
+        self.assertEqual(1, sink.failures[("authenticate", "expired")], "Reason is taken from the token error.")
+
+    def test_sign_in_view_stages_are_timed(self) -> None:
+        get_user_model().objects.create_user(username="user", password="password")
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            sink = Metrics.sink
+            response = self.client.post(
+                reverse("api-1.0.0:mobile_signin"),
+                data={"username": "user", "password": "password"},
+                content_type="application/json",
+            )
+
+        self.assertEqual(200, response.status_code)
+        for stage in ("mobile_sign_in", "authenticate_user", "claim_mapping"):
+            self.assertEqual(1, sink.histograms[stage].count, f"{stage} is timed.")
+        self.assertEqual(2, sink.histograms["encode_token"].count, "Refresh and access token signing is timed.")
+
+    def test_key_loads_are_counted(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            sink = Metrics.sink
+            InMemoryJwtKeyPair.clear()
+            InMemoryJwtKeyPair.preload()
+
+        self.assertEqual({("private", "loaded"): 1, ("public", "loaded"): 1}, sink.key_loads)
+
+    def test_render_prometheus_text_format(self) -> None:
+        sink = InMemoryMetricsSink()
+        sink.observe("decode_token", 0.0003)
+        sink.count_failure("decode_token", "expired")
+        sink.count_key_load("public", "loaded")
+
+        rendered = sink.render()
+
+        self.assertIn('ninja_simple_jwt_stage_seconds_bucket{stage="decode_token",le="0.00025"} 0', rendered)
+        self.assertIn('ninja_simple_jwt_stage_seconds_bucket{stage="decode_token",le="0.0005"} 1', rendered)
+        self.assertIn('ninja_simple_jwt_stage_seconds_bucket{stage="decode_token",le="+Inf"} 1', rendered)
+        self.assertIn('ninja_simple_jwt_stage_seconds_count{stage="decode_token"} 1', rendered)
+        self.assertIn('ninja_simple_jwt_failures_total{stage="decode_token",reason="expired"} 1', rendered)
+        self.assertIn('ninja_simple_jwt_key_loads_total{key="public",result="loaded"} 1', rendered)
+
+
+class TestRequestProfiler(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        make_and_save_key_pair()
+        self.token, _ = encode_token({}, TokenTypes.ACCESS)
+
+    def authenticate(self) -> None:
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        request.user = AnonymousUser()
+        HttpJwtAuth().authenticate(request, self.token)
+
+    def test_profiler_is_disabled_by_default(self) -> None:
+        self.assertIsNone(Metrics.profiler, "Profiling is disabled by default.")
+
+    def test_sampled_sign_in_records_stage_breakdown(self) -> None:
+        get_user_model().objects.create_user(username="user", password="password")
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_PROFILE_SAMPLE_RATE=1)):
+            profiler = Metrics.profiler
+            self.client.post(
+                reverse("api-1.0.0:mobile_signin"),
+                data={"username": "user", "password": "password"},
+                content_type="application/json",
+            )
+
+        self.assertEqual(1, len(profiler.profiles), "Sign-in request is profiled once.")
+        profile = profiler.profiles[0].as_dict()
+        self.assertEqual(("mobile_sign_in", "sampled"), (profile["stage"], profile["reason"]))
+        stages = [stage["stage"] for stage in profile["stages"]]
+        self.assertEqual("mobile_sign_in", stages[0], "Stages are ordered by start.")
+        for stage in ("authenticate_user", "claim_mapping", "encode_token"):
+            self.assertIn(stage, stages)
+
+    def test_one_in_n_requests_are_sampled(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_PROFILE_SAMPLE_RATE=3)):
+            profiler = Metrics.profiler
+            for _ in range(7):
+                self.authenticate()
+
+        self.assertEqual(2, len(profiler.profiles), "Every third request is profiled.")
+
+    def test_only_requests_over_threshold_are_recorded(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_PROFILE_THRESHOLD=timedelta(hours=1))):
+            profiler = Metrics.profiler
+            self.authenticate()
+        self.assertEqual(0, len(profiler.profiles), "Fast request is not recorded.")
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_PROFILE_THRESHOLD=timedelta(0))):
+            profiler = Metrics.profiler
+            InMemoryJwtKeyPair.clear()
+            self.authenticate()
+        profile = profiler.profiles[0].as_dict()
+        self.assertEqual("slow", profile["reason"])
+        self.assertIn("load_public_key", [stage["stage"] for stage in profile["stages"]], "Key reload is visible.")
+
+    def test_ring_buffer_is_bounded(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_PROFILE_SAMPLE_RATE=1, JWT_PROFILE_BUFFER_SIZE=2)):
+            profiler = Metrics.profiler
+            for _ in range(5):
+                self.authenticate()
+
+        self.assertEqual(2, len(profiler.profiles), "Only the latest profiles are kept.")
+
+    def test_dump_auth_profiles_command(self) -> None:
+        jwt_settings = self.merge_settings(
+            JWT_PROFILE_SAMPLE_RATE=1, JWT_PROFILE_BUFFER_SIZE=2, JWT_PROFILE_CACHE_ALIAS="default"
+        )
+        with self.settings(NINJA_SIMPLE_JWT=jwt_settings):
+            profiler = Metrics.profiler
+            with patch("ninja_simple_jwt.profiling.Thread") as thread:
+                for _ in range(3):
+                    self.authenticate()
+            self.assertEqual([], RequestProfiler.get_cached_profiles(), "Requests do not write to the cache.")
+            flush = profiler._flush_in_background  # pylint: disable=W0212
+            thread.assert_called_once_with(target=flush, daemon=True)
+            flush()
+
+            output = StringIO()
+            call_command("dump_auth_profiles", "--json", "--clear", stdout=output)
+            profiles = [json.loads(line) for line in output.getvalue().splitlines()]
+            self.assertEqual(2, len(profiles), "Shared ring buffer is bounded.")
+            self.assertEqual("authenticate", profiles[0]["stage"])
+
+            output = StringIO()
+            call_command("dump_auth_profiles", stdout=output)
+            self.assertEqual("", output.getvalue(), "Ring buffer was cleared.")
+
+    def test_dump_auth_profiles_requires_cache_alias(self) -> None:
+        with self.assertRaises(CommandError):
+            call_command("dump_auth_profiles")
@@ -0,0 +1,240 @@
+import json
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any
+
+from django.test import TestCase
+from jwt import InvalidTokenError
+from jwt.exceptions import PyJWKClientError
+
+from ninja_simple_jwt.jwt.jwks import make_jwk
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+from ninja_simple_jwt.jwt.remote_jwks import RemoteJwks
+from ninja_simple_jwt.jwt.token_operations import TokenTypes, decode_token, encode_token
+from ninja_simple_jwt.settings import DEFAULTS
+
+
+class JwksHandler(BaseHTTPRequestHandler):
+    content = b'{"keys":[]}'
+    status = 200
+    delay = 0.0
+    requests: list[dict] = []
+
+    def do_GET(self) -> None:  # pylint: disable=C0103
+        self.requests.append(dict(self.headers))
+        time.sleep(self.delay)
+        etag = f'"{len(self.content)}-{hash(self.content)}"'
+        if self.status != 200:
+            self.send_response(self.status)
+            self.end_headers()
+        elif self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(self.content)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRemoteJwks(TestCase):
+    server: ThreadingHTTPServer
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), JwksHandler)
+        Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def merge_settings(self, **kwargs: Any) -> dict:
+        return {
+            **DEFAULTS,
+            "JWT_PUBLIC_KEY_SOURCE": "jwks",
+            "JWT_JWKS_URL": f"http://127.0.0.1:{self.server.server_port}/.well-known/jwks.json",
+            "JWT_JWKS_LIFETIME": timedelta(minutes=10),
+            "JWT_JWKS_STALE_LIFETIME": timedelta(minutes=10),
+            **kwargs,
+        }
+
+    def setUp(self) -> None:
+        JwksHandler.status = 200
+        JwksHandler.delay = 0.0
+        JwksHandler.requests = []
+        self.publish_signing_key()
+
+    def tearDown(self) -> None:
+        InMemoryJwtKeyPair.clear()
+
+    @staticmethod
+    def publish_signing_key() -> None:
+        make_and_save_key_pair()
+        jwk = make_jwk(InMemoryJwtKeyPair.signing_key_id, InMemoryJwtKeyPair.parsed_public_key)
+        JwksHandler.content = json.dumps({"keys": [jwk]}).encode()
+
+    @staticmethod
+    def wait_for_refresh(remote_jwks: RemoteJwks) -> None:
+        deadline = time.monotonic() + 5
+        while remote_jwks._refreshing and time.monotonic() < deadline:  # pylint: disable=W0212
+            time.sleep(0.01)
+
+    def test_decode_token_verifies_with_keys_from_jwks_url(self) -> None:
+        token, _ = encode_token({"name": "bebe"}, TokenTypes.ACCESS)
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            InMemoryJwtKeyPair.clear()
+            decoded = decode_token(token, token_type=TokenTypes.ACCESS)
+
+        self.assertEqual("bebe", decoded["name"], "Token is verified with the published key.")
+        self.assertEqual(1, len(JwksHandler.requests), "JWKS is fetched once.")
+
+    def test_unusable_keys_are_skipped(self) -> None:
+        jwks = json.loads(JwksHandler.content)
+        JwksHandler.content = json.dumps({"keys": [{"kid": "bad", "kty": "RSA"}, *jwks["keys"]]}).encode()
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            with self.assertLogs("ninja_simple_jwt.jwt.remote_jwks", "WARNING"):
+                keys = RemoteJwks().keys
+
+        self.assertEqual([InMemoryJwtKeyPair.signing_key_id], list(keys), "Only the usable key is served.")
+
+    def test_malformed_jwks_fails_with_backoff(self) -> None:
+        JwksHandler.content = b'["not", "a", "jwks"]'
+        clock = FakeClock()
+        remote_jwks = RemoteJwks(clock=clock)
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            with self.assertRaises(PyJWKClientError):
+                remote_jwks.keys  # pylint: disable=W0104
+
+        self.assertGreater(remote_jwks._retry_at, clock.now, "Failed fetch is backed off.")  # pylint: disable=W0212
+
+    def test_failed_cold_fetch_is_not_retried_until_backoff(self) -> None:
+        JwksHandler.status = 500
+        clock = FakeClock()
+        remote_jwks = RemoteJwks(clock=clock)
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            for _ in range(3):
+                with self.assertRaises(PyJWKClientError):
+                    remote_jwks.keys  # pylint: disable=W0104
+            self.assertEqual(1, len(JwksHandler.requests), "Callers fail fast during the backoff.")
+
+            JwksHandler.status = 200
+            clock.now += 5 * 60
+            self.assertTrue(remote_jwks.keys, "Fetch is retried after the backoff.")
+
+    def test_unknown_kid_refreshes_are_rate_limited(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            InMemoryJwtKeyPair.clear()
+            InMemoryJwtKeyPair.verification_keys  # pylint: disable=W0104
+            for kid in ("garbage-1", "garbage-2", "garbage-3"):
+                with self.assertRaises(InvalidTokenError):
+                    InMemoryJwtKeyPair.get_verification_key(kid)
+
+        self.assertEqual(1, len(JwksHandler.requests), "Keys fetched just now are not refreshed for unknown kids.")
+
+    def test_token_without_kid_is_rejected(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            InMemoryJwtKeyPair.clear()
+            with self.assertRaises(InvalidTokenError):
+                InMemoryJwtKeyPair.get_verification_key(None)
+
+    def test_concurrent_cold_fetches_are_collapsed(self) -> None:
+        JwksHandler.delay = 0.2
+        remote_jwks = RemoteJwks()
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            results: list[dict] = []
+            threads = [Thread(target=lambda: results.append(remote_jwks.keys)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(1, len(JwksHandler.requests), "Concurrent callers share one fetch.")
+        self.assertTrue(all(keys is results[0] for keys in results), "Every caller gets the same keys.")
+
+    def test_keys_are_refreshed_in_background_before_expiry(self) -> None:
+        clock = FakeClock()
+        remote_jwks = RemoteJwks(clock=clock)
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            old_keys = remote_jwks.keys
+            self.publish_signing_key()
+            clock.now += 9 * 60
+
+            self.assertIs(old_keys, remote_jwks.keys, "Current keys are served while refreshing.")
+            self.wait_for_refresh(remote_jwks)
+
+            self.assertEqual(2, len(JwksHandler.requests), "Keys are refreshed ahead of expiry.")
+            self.assertIn(InMemoryJwtKeyPair.signing_key_id, remote_jwks.keys, "Refreshed keys are served.")
+
+    def test_background_refresh_does_not_block_callers(self) -> None:
+        clock = FakeClock()
+        remote_jwks = RemoteJwks(clock=clock)
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            keys = remote_jwks.keys
+            JwksHandler.delay = 1.0
+            clock.now += 9 * 60
+
+            started_at = time.monotonic()
+            for _ in range(3):
+                self.assertIs(keys, remote_jwks.keys, "Current keys are served while refreshing.")
+                remote_jwks.request_refresh()
+            elapsed = time.monotonic() - started_at
+            self.wait_for_refresh(remote_jwks)
+
+        self.assertLess(elapsed, 0.5, "Callers do not wait for the background fetch.")
+        self.assertEqual(2, len(JwksHandler.requests), "Only one refresh runs at a time.")
+
+    def test_stale_keys_are_served_when_refresh_fails(self) -> None:
+        clock = FakeClock()
+        remote_jwks = RemoteJwks(clock=clock)
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            keys = remote_jwks.keys
+            JwksHandler.status = 500
+            clock.now += 15 * 60
+
+            with self.assertLogs("ninja_simple_jwt.jwt.remote_jwks", "WARNING"):
+                self.assertIs(keys, remote_jwks.keys, "Stale keys are served past expiry.")
+                self.wait_for_refresh(remote_jwks)
+            self.assertIs(keys, remote_jwks.keys, "Failed refresh is not retried immediately.")
+            self.assertEqual(2, len(JwksHandler.requests))
+
+            clock.now += 10 * 60
+            with self.assertRaises(PyJWKClientError):
+                remote_jwks.keys  # pylint: disable=W0104
+
+    def test_expired_keys_are_revalidated_with_etag(self) -> None:
+        clock = FakeClock()
+        remote_jwks = RemoteJwks(clock=clock)
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            keys = remote_jwks.keys
+            clock.now += 30 * 60
+
+            self.assertIs(keys, remote_jwks.keys, "Keys are kept on 304 Not Modified.")
+            self.assertIn("If-None-Match", JwksHandler.requests[-1], "Conditional request is sent.")
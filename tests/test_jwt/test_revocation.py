@@ -0,0 +1,162 @@
+import time
+from datetime import timedelta
+from typing import Any
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from freezegun import freeze_time
+
+from ninja_simple_jwt.checks import check_jwt_keys
+from ninja_simple_jwt.jwt.bloom_filter import BloomFilter
+from ninja_simple_jwt.jwt.revocation import (
+    BloomFilterRevocationStore,
+    CacheRevocationStore,
+    DatabaseRevocationStore,
+    TokenRevocation,
+)
+from ninja_simple_jwt.models import RevokedToken
+from ninja_simple_jwt.settings import DEFAULTS
+
+
+class TestBloomFilter(TestCase):
+    def test_added_items_are_always_found(self) -> None:
+        bloom_filter = BloomFilter(1000)
+        for i in range(1000):
+            bloom_filter.add(f"jti-{i}")
+
+        self.assertTrue(all(f"jti-{i}" in bloom_filter for i in range(1000)), "No false negatives.")
+
+    def test_false_positive_rate_is_bounded(self) -> None:
+        bloom_filter = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom_filter.add(f"jti-{i}")
+
+        false_positives = sum(f"other-{i}" in bloom_filter for i in range(10000))
+        self.assertLess(false_positives, 300, "False positive rate stays near the configured rate.")
+
+
+class TestCacheRevocationStore(TestCase):
+    def test_revoke(self) -> None:
+        store = CacheRevocationStore()
+        exp = int(time.time()) + 60
+
+        self.assertFalse(store.is_revoked("jti"))
+        self.assertTrue(store.revoke("jti", exp), "First revocation succeeds.")
+        self.assertFalse(store.revoke("jti", exp), "Token can only be revoked once.")
+        self.assertTrue(store.is_revoked("jti"))
+
+
+class TestDatabaseRevocationStore(TestCase):
+    def test_revoke(self) -> None:
+        store = DatabaseRevocationStore()
+        exp = int(time.time()) + 60
+
+        self.assertFalse(store.is_revoked("jti"))
+        self.assertTrue(store.revoke("jti", exp), "First revocation succeeds.")
+        self.assertFalse(store.revoke("jti", exp), "Token can only be revoked once.")
+        self.assertTrue(store.is_revoked("jti"))
+
+    def test_expired_entries_are_purged_when_revoking(self) -> None:
+        store = DatabaseRevocationStore()
+        with freeze_time() as frozen_time:
+            store.revoke("expiring", int(time.time()) + 60)
+            store.revoke("lasting", int(time.time()) + 7200)
+            frozen_time.tick(timedelta(hours=1, minutes=1))
+
+            store.revoke("new", int(time.time()) + 60)
+
+        self.assertEqual(["lasting", "new"], sorted(RevokedToken.objects.values_list("jti", flat=True)))
+
+
+class TestBloomFilterRevocationStore(TestCase):
+    def test_not_revoked_check_does_not_query_store(self) -> None:
+        store = BloomFilterRevocationStore(DatabaseRevocationStore())
+        store.revoke("revoked", int(time.time()) + 60)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(store.is_revoked("not-revoked"))
+        with self.assertNumQueries(1):
+            self.assertTrue(store.is_revoked("revoked"))
+
+    def test_revocations_by_other_processes_are_synced(self) -> None:
+        database_store = DatabaseRevocationStore()
+        store = BloomFilterRevocationStore(database_store)
+
+        with freeze_time() as frozen_time:
+            self.assertFalse(store.is_revoked("jti"))
+            database_store.revoke("jti", int(time.time()) + 60)
+
+            frozen_time.tick(timedelta(seconds=6))
+            self.assertTrue(store.is_revoked("jti"), "Filter is synced after JWT_REVOCATION_BLOOM_SYNC_INTERVAL.")
+
+    def test_is_revoked_in_memory(self) -> None:
+        store = BloomFilterRevocationStore(DatabaseRevocationStore())
+
+        self.assertIsNone(store.is_revoked_in_memory("jti"), "Empty filter cannot answer.")
+        store.revoke("revoked", int(time.time()) + 60)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(store.is_revoked_in_memory("not-revoked"))
+            self.assertIsNone(store.is_revoked_in_memory("revoked"), "Possibly revoked jti needs the store.")
+
+    def test_stats(self) -> None:
+        with self.settings(
+            NINJA_SIMPLE_JWT={
+                **DEFAULTS,
+                "JWT_REVOCATION_BLOOM_CAPACITY": 1000,
+                "JWT_REVOCATION_BLOOM_ERROR_RATE": 0.01,
+            }
+        ):
+            store = BloomFilterRevocationStore(DatabaseRevocationStore())
+            store.revoke("revoked", int(time.time()) + 60)
+            for i in range(9):
+                store.is_revoked(f"jti-{i}")
+            store.is_revoked("revoked")
+
+            stats = store.stats()
+
+        self.assertEqual(1, stats["items"])
+        self.assertEqual(BloomFilter(1000, 0.01).size_bytes, stats["size_bytes"], "Filter is sized by capacity.")
+        self.assertEqual(10, stats["lookups"])
+        self.assertEqual(1, stats["store_revoked"])
+        self.assertEqual(stats["store_lookups"] / 10, stats["store_lookup_rate"])
+
+
+class TestTokenRevocation(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def test_store_is_built_from_settings(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            self.assertIsNone(TokenRevocation.store, "Revocation is disabled by default.")
+
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(
+                JWT_REVOCATION_STORE_CLS="ninja_simple_jwt.jwt.revocation.DatabaseRevocationStore",
+                JWT_REVOCATION_BLOOM_FILTER=True,
+            )
+        ):
+            store = TokenRevocation.store
+            self.assertIsInstance(store, BloomFilterRevocationStore)
+            self.assertIsInstance(store.store, DatabaseRevocationStore)
+            self.assertIs(store, TokenRevocation.store, "Store is reused.")
+
+    def test_bloom_filter_needs_store_that_lists_revoked_tokens(self) -> None:
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(
+                JWT_REVOCATION_STORE_CLS="ninja_simple_jwt.jwt.revocation.CacheRevocationStore",
+                JWT_REVOCATION_BLOOM_FILTER=True,
+            )
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                TokenRevocation.store  # pylint: disable=W0104
+            self.assertIn("ninja_simple_jwt.E007", [message.id for message in check_jwt_keys(None)])
+
+    def test_store_is_reset_on_setting_change(self) -> None:
+        with mock.patch.object(TokenRevocation, "clear") as clear:
+            with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+                pass
+
+        self.assertTrue(clear.called)
@@ -1,22 +1,40 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import timedelta
+from io import StringIO
+from multiprocessing import get_context
 from typing import Any
+from unittest.mock import patch
 
+import jwt
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
 from freezegun import freeze_time
-from jwt import DecodeError, ExpiredSignatureError, InvalidTokenError
+from jwt import DecodeError, ExpiredSignatureError, InvalidKeyError, InvalidTokenError, MissingRequiredClaimError
 
+from ninja_simple_jwt.jwt.batch_verification import verify_tokens_with
+from ninja_simple_jwt.jwt.json_encode import TokenUserEncoder
 from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
 from ninja_simple_jwt.jwt.token_operations import (
     TokenTypes,
     decode_token,
+    decode_tokens,
     encode_token,
     get_access_token_for_user,
     get_access_token_from_refresh_token,
     get_refresh_token_for_user,
+    get_token_pair_for_user,
+    issue_tokens_for_users,
+    revoke_refresh_token,
 )
 from ninja_simple_jwt.settings import DEFAULTS
 
+KEYRING_PATH = "jwt-signing-keyring.pub"
+
 
 class TestEncodeDecodeToken(TestCase):
     @staticmethod
@@ -118,6 +136,21 @@ class TestEncodeDecodeToken(TestCase):
 
         self.assertTrue(exception_raised, "Exception raised as expected if token has expired.")
 
+    def test_decode_token_with_missing_claims_raises_exception(self) -> None:
+        claims = {"exp": 1704975301, "jti": "abc", "token_type": TokenTypes.ACCESS}
+        expected_exceptions = {"exp": MissingRequiredClaimError, "jti": InvalidKeyError, "token_type": InvalidKeyError}
+
+        with freeze_time("2024-01-11 12:00:01"):
+            for claim, exception in expected_exceptions.items():
+                with self.subTest(claim=claim):
+                    token = jwt.encode(
+                        {k: v for k, v in claims.items() if k != claim},
+                        InMemoryJwtKeyPair.parsed_private_key,
+                        algorithm="RS256",
+                    )
+                    with self.assertRaises(exception):
+                        decode_token(token, token_type=TokenTypes.ACCESS)
+
     def test_get_access_token_from_refresh_token(self) -> None:
         test_payload = {
             "username": "bebe",
@@ -228,3 +261,180 @@ class TestUserTokenFunctions(TestCase):
         self.assertEqual(
             decoded_token_data["name"], self.user.first_name + " " + self.user.last_name, "Token data has correct name."
         )
+
+    def test_get_token_pair_for_user(self) -> None:
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(
+                JWT_REFRESH_TOKEN_LIFETIME=timedelta(days=30),
+                JWT_ACCESS_TOKEN_LIFETIME=timedelta(minutes=15),
+                TOKEN_CLAIM_USER_ATTRIBUTE_MAP={
+                    "user_id": "id",
+                    "username": "username",
+                    "date_joined": "date_joined",
+                },
+            )
+        ):
+            with freeze_time("2024-01-11 12:00:01"):
+                (refresh_token, refresh_token_data), (access_token, access_token_data) = get_token_pair_for_user(
+                    self.user
+                )
+                decoded_refresh_token_data = decode_token(refresh_token, token_type=TokenTypes.REFRESH)
+                decoded_access_token_data = decode_token(access_token, token_type=TokenTypes.ACCESS)
+
+        self.assertEqual(refresh_token_data["exp"], 1707566401, "Refresh token data has correct exp.")
+        self.assertEqual(access_token_data["exp"], 1704975301, "Access token data has correct exp.")
+        self.assertEqual(decoded_refresh_token_data["iat"], 1704974401, "Refresh token has correct iat.")
+        self.assertEqual(decoded_access_token_data["iat"], 1704974401, "Access token has correct iat.")
+        self.assertNotEqual(decoded_refresh_token_data["jti"], decoded_access_token_data["jti"], "Tokens have own jti.")
+        self.assertEqual(decoded_access_token_data["user_id"], self.user.id, "Access token has user claims.")
+        self.assertEqual(decoded_refresh_token_data["username"], "tester", "Refresh token has user claims.")
+        self.assertEqual(
+            decoded_access_token_data["date_joined"],
+            TokenUserEncoder().default(self.user.date_joined),
+            "User claims are serialized with the token user encoder.",
+        )
+        self.assertEqual(
+            access_token_data["date_joined"],
+            decoded_access_token_data["date_joined"],
+            "Returned claims are the serialized values.",
+        )
+
+
+class TestIssueTokensForUsers(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        make_and_save_key_pair()
+        self.users = [get_user_model().objects.create_user(username=f"user-{i}") for i in range(5)]
+
+    def test_issue_tokens_in_process(self) -> None:
+        users = get_user_model().objects.order_by("pk")
+
+        with self.assertNumQueries(1):
+            issued = list(
+                issue_tokens_for_users(users, [TokenTypes.REFRESH, TokenTypes.ACCESS], workers=0, chunk_size=2)
+            )
+
+        self.assertEqual([user.pk for user in self.users], [pk for pk, _ in issued], "Tokens are issued in order.")
+        for user, (_, tokens) in zip(self.users, issued):
+            refresh_token, _ = tokens[TokenTypes.REFRESH]
+            access_token, access_payload = tokens[TokenTypes.ACCESS]
+            self.assertEqual(user.username, decode_token(refresh_token, token_type=TokenTypes.REFRESH)["username"])
+            self.assertEqual(access_payload["jti"], decode_token(access_token, token_type=TokenTypes.ACCESS)["jti"])
+
+    def test_issue_tokens_loads_only_claim_fields(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(TOKEN_CLAIM_USER_ATTRIBUTE_MAP={"user_id": "id"})):
+            with self.assertNumQueries(1) as context:
+                list(issue_tokens_for_users(get_user_model().objects.all(), workers=0))
+            queries = [query["sql"] for query in context.captured_queries]
+
+        self.assertNotIn("username", queries[0], "Only mapped fields are selected.")
+
+    def test_issue_tokens_on_process_pool(self) -> None:
+        users = get_user_model().objects.order_by("pk")
+
+        issued = list(issue_tokens_for_users(users, workers=2, chunk_size=2))
+
+        self.assertEqual([user.pk for user in self.users], [pk for pk, _ in issued], "Tokens are issued in order.")
+        for user, (_, tokens) in zip(self.users, issued):
+            access_token, _ = tokens[TokenTypes.ACCESS]
+            self.assertEqual(user.pk, decode_token(access_token, token_type=TokenTypes.ACCESS)["user_id"])
+
+    def test_make_tokens_command_writes_jsonl(self) -> None:
+        output = StringIO()
+
+        call_command("make_tokens", "user-1", "user-3", "--workers", "0", "--token-type", "access", stdout=output)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([self.users[1].pk, self.users[3].pk], [line["pk"] for line in lines])
+        self.assertEqual("user-3", decode_token(lines[1]["access"], token_type=TokenTypes.ACCESS)["username"])
+
+    def test_issue_tokens_rejects_missing_signed_tokens(self) -> None:
+        users = get_user_model().objects.order_by("pk")
+
+        with patch("ninja_simple_jwt.jwt.token_operations.sign_payloads_with", return_value=["token"]):
+            with self.assertRaises(RuntimeError):
+                list(issue_tokens_for_users(users, workers=0, chunk_size=2))
+
+
+class TestDecodeTokens(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        if os.path.exists(KEYRING_PATH):
+            os.remove(KEYRING_PATH)
+        make_and_save_key_pair()
+
+    def tearDown(self) -> None:
+        if os.path.exists(KEYRING_PATH):
+            os.remove(KEYRING_PATH)
+
+    def test_decode_tokens_returns_claims_or_errors_in_order(self) -> None:
+        first_token, _ = encode_token({"name": "bebe"}, TokenTypes.ACCESS)
+        second_token, _ = encode_token({"name": "mimi"}, TokenTypes.ACCESS)
+        refresh_token, _ = encode_token({"name": "bebe"}, TokenTypes.REFRESH)
+        with freeze_time(timezone.now() - timedelta(days=1)):
+            expired_token, _ = encode_token({"name": "bebe"}, TokenTypes.ACCESS)
+
+        results = decode_tokens(
+            [first_token, "garbage", second_token, refresh_token, expired_token, first_token], TokenTypes.ACCESS
+        )
+
+        self.assertEqual("bebe", results[0]["name"])
+        self.assertIsInstance(results[1], DecodeError)
+        self.assertEqual("mimi", results[2]["name"])
+        self.assertIsInstance(results[3], InvalidTokenError, "Wrong token type is an error result.")
+        self.assertIsInstance(results[4], ExpiredSignatureError)
+        self.assertEqual(results[0], results[5], "Identical tokens get the same claims.")
+        self.assertIsNot(results[0], results[5], "Identical tokens get their own copy of the claims.")
+
+    def test_decode_tokens_verifies_duplicates_once(self) -> None:
+        token, _ = encode_token({"name": "bebe"}, TokenTypes.ACCESS)
+
+        with patch("ninja_simple_jwt.jwt.token_operations.verify_tokens_with", wraps=verify_tokens_with) as verify:
+            decode_tokens([token] * 5, TokenTypes.ACCESS)
+
+        verify.assert_called_once()
+        self.assertEqual([token], verify.call_args.args[2], "Duplicates are verified once.")
+
+    def test_decode_tokens_groups_tokens_by_kid(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_PUBLIC_KEYRING_PATH=KEYRING_PATH)):
+            old_token, _ = encode_token({"name": "bebe"}, TokenTypes.ACCESS)
+            make_and_save_key_pair()
+            new_token, _ = encode_token({"name": "mimi"}, TokenTypes.ACCESS)
+            unknown_kid_token, _ = encode_token({}, TokenTypes.ACCESS, kid="unknown")
+
+            results = decode_tokens([old_token, new_token, unknown_kid_token, old_token], TokenTypes.ACCESS)
+
+        self.assertEqual(["bebe", "mimi"], [results[0]["name"], results[1]["name"]])
+        self.assertIsInstance(results[2], InvalidTokenError, "Unknown kid is an error result.")
+        self.assertEqual("bebe", results[3]["name"])
+
+    def test_decode_tokens_on_pools(self) -> None:
+        tokens = [encode_token({"index": i}, TokenTypes.ACCESS)[0] for i in range(5)] + ["garbage"]
+
+        for executor in (ThreadPoolExecutor(max_workers=2), ProcessPoolExecutor(2, mp_context=get_context("spawn"))):
+            with self.subTest(executor=executor.__class__.__name__), executor:
+                results = decode_tokens(tokens, TokenTypes.ACCESS, executor=executor, chunk_size=2)
+
+                self.assertEqual(list(range(5)), [result["index"] for result in results[:5]])
+                self.assertIsInstance(results[5], DecodeError)
+
+    def test_decode_tokens_rejects_revoked_refresh_tokens(self) -> None:
+        with self.settings(
+            NINJA_SIMPLE_JWT=self.merge_settings(
+                JWT_REVOCATION_STORE_CLS="ninja_simple_jwt.jwt.revocation.DatabaseRevocationStore"
+            )
+        ):
+            token, _ = encode_token({}, TokenTypes.REFRESH)
+            revoked_token, _ = encode_token({}, TokenTypes.REFRESH)
+            revoke_refresh_token(revoked_token)
+
+            results = decode_tokens([token, revoked_token], TokenTypes.REFRESH)
+
+        self.assertIsInstance(results[0], dict)
+        self.assertIsInstance(results[1], InvalidTokenError, "Revoked token is an error result.")
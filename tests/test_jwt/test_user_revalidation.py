@@ -0,0 +1,231 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db.models.signals import post_init, pre_save
+from django.test import TestCase
+from django.urls import reverse
+from freezegun import freeze_time
+from jwt import InvalidTokenError
+
+from ninja_simple_jwt.checks import check_jwt_keys
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.token_operations import (
+    get_access_token_from_refresh_token,
+    get_refresh_token_for_user,
+    rotate_refresh_token,
+)
+from ninja_simple_jwt.jwt.user_revalidation import UserRevalidation
+from ninja_simple_jwt.models import UserStateChange
+from ninja_simple_jwt.settings import DEFAULTS
+
+
+class TestUserRevalidation(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, "JWT_REFRESH_USER_REVALIDATION": True, **kwargs}
+
+    def setUp(self) -> None:
+        make_and_save_key_pair()
+        UserRevalidation.clear()
+        self.user = get_user_model().objects.create_user(username="user")
+
+    def tearDown(self) -> None:
+        UserRevalidation.clear()
+
+    def deactivate_user(self) -> None:
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+    def test_deactivated_user_can_refresh_by_default(self) -> None:
+        refresh_token, _ = get_refresh_token_for_user(self.user)
+        self.deactivate_user()
+
+        access_token, _ = get_access_token_from_refresh_token(refresh_token)
+
+        self.assertIsNotNone(access_token, "Refresh tokens are not re-validated by default.")
+
+    def test_user_signals_are_connected_only_when_enabled(self) -> None:
+        self.assertFalse(post_init.has_listeners(get_user_model()), "User instantiation is not slowed by default.")
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            self.assertTrue(post_init.has_listeners(get_user_model()), "Receivers are connected once enabled.")
+            self.assertTrue(pre_save.has_listeners(get_user_model()))
+
+        self.assertFalse(pre_save.has_listeners(get_user_model()), "Receivers are disconnected once disabled.")
+
+    def test_deactivated_user_cannot_refresh(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            refresh_token, _ = get_refresh_token_for_user(self.user)
+            get_access_token_from_refresh_token(refresh_token)
+            self.deactivate_user()
+
+            with self.assertNumQueries(0):
+                with self.assertRaises(InvalidTokenError, msg="Deactivated user cannot refresh."):
+                    get_access_token_from_refresh_token(refresh_token)
+            with self.assertRaises(InvalidTokenError, msg="Deactivated user cannot rotate refresh token."):
+                rotate_refresh_token(refresh_token)
+
+    def test_active_user_refreshes_without_querying_database(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            refresh_token, _ = get_refresh_token_for_user(self.user)
+            get_access_token_from_refresh_token(refresh_token)
+
+            with self.assertNumQueries(0):
+                access_token, _ = get_access_token_from_refresh_token(refresh_token)
+
+        self.assertIsNotNone(access_token)
+
+    def test_user_deactivated_without_signals_cannot_refresh_after_rebuild(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            with freeze_time("2024-01-11 12:00:01") as frozen_time:
+                refresh_token, _ = get_refresh_token_for_user(self.user)
+                get_user_model().objects.filter(pk=self.user.pk).update(
+                    is_active=False, last_login=datetime.now(timezone.utc)
+                )
+                UserRevalidation.snapshot.is_valid({"user_id": "other", "iat": 0})
+                get_user_model().objects.filter(pk=self.user.pk).update(is_active=True)
+                get_user_model().objects.create_user(username="other", is_active=False)
+
+                with self.assertRaises(InvalidTokenError, msg="Snapshot is filled with recently signed in users."):
+                    get_access_token_from_refresh_token(refresh_token)
+                self.assertEqual(1, UserRevalidation.snapshot.stats()["users"], "Users not signed in are left out.")
+
+                get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+                frozen_time.tick(DEFAULTS["JWT_USER_SNAPSHOT_SYNC_INTERVAL"])
+                get_user_model().objects.filter(pk=self.user.pk).update(is_active=True)
+                frozen_time.tick(DEFAULTS["JWT_USER_SNAPSHOT_REBUILD_INTERVAL"])
+                access_token, _ = get_access_token_from_refresh_token(refresh_token)
+
+        self.assertIsNotNone(access_token, "Reactivation is picked up when the snapshot is rebuilt.")
+
+    def test_saving_loaded_user_does_not_query_previous_state(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            user = get_user_model().objects.get(pk=self.user.pk)
+            user.first_name = "Name"
+            with self.assertNumQueries(1):
+                user.save()
+
+            user.is_staff = True
+            with self.captureOnCommitCallbacks(execute=True):
+                user.save()
+
+        self.assertTrue(UserStateChange.objects.filter(user_pk=str(user.pk)).exists(), "Change is recorded.")
+
+    def test_sign_in_update_does_not_invalidate_refresh_token(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            with freeze_time("2024-01-11 12:00:01") as frozen_time:
+                refresh_token, _ = get_refresh_token_for_user(self.user)
+                frozen_time.tick(timedelta(seconds=5))
+                self.user.last_login = datetime.now(timezone.utc)
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.user.save(update_fields=["last_login"])
+                    self.user.first_name = "Name"
+                    self.user.save()
+
+                access_token, _ = get_access_token_from_refresh_token(refresh_token)
+
+        self.assertIsNotNone(access_token, "Unwatched fields do not invalidate refresh tokens.")
+        self.assertFalse(UserStateChange.objects.exists(), "No change is recorded.")
+
+    def test_permission_change_invalidates_earlier_refresh_tokens(self) -> None:
+        group = Group.objects.create(name="group")
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            with freeze_time("2024-01-11 12:00:01") as frozen_time:
+                refresh_token, _ = get_refresh_token_for_user(self.user)
+                frozen_time.tick(timedelta(seconds=5))
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.user.groups.add(group)
+                frozen_time.tick(timedelta(seconds=5))
+                new_refresh_token, _ = get_refresh_token_for_user(self.user)
+
+                with self.assertRaises(InvalidTokenError, msg="Refresh token issued before the change is rejected."):
+                    get_access_token_from_refresh_token(refresh_token)
+                access_token, _ = get_access_token_from_refresh_token(new_refresh_token)
+
+        self.assertIsNotNone(access_token, "Refresh token issued after the change is accepted.")
+
+    def test_reverse_relation_clear_invalidates_refresh_tokens(self) -> None:
+        group = Group.objects.create(name="group")
+        self.user.groups.add(group)
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            with freeze_time("2024-01-11 12:00:01") as frozen_time:
+                refresh_token, _ = get_refresh_token_for_user(self.user)
+                frozen_time.tick(timedelta(seconds=5))
+                with self.captureOnCommitCallbacks(execute=True):
+                    group.user_set.clear()
+
+                with self.assertRaises(InvalidTokenError, msg="Users removed from the group cannot refresh."):
+                    get_access_token_from_refresh_token(refresh_token)
+
+    def test_change_recorded_by_other_process_is_synced(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            with freeze_time("2024-01-11 12:00:01") as frozen_time:
+                refresh_token, _ = get_refresh_token_for_user(self.user)
+                get_access_token_from_refresh_token(refresh_token)
+                UserStateChange.objects.create(
+                    user_pk=str(self.user.pk), is_active=False, changed_at=datetime.now(timezone.utc)
+                )
+
+                access_token, _ = get_access_token_from_refresh_token(refresh_token)
+                self.assertIsNotNone(access_token, "Change is not seen before the sync interval.")
+
+                frozen_time.tick(DEFAULTS["JWT_USER_SNAPSHOT_SYNC_INTERVAL"])
+                with self.assertRaises(InvalidTokenError, msg="Change is seen after the sync interval."):
+                    get_access_token_from_refresh_token(refresh_token)
+
+    def test_changes_older_than_refresh_tokens_are_purged(self) -> None:
+        with freeze_time("2024-01-11 12:00:01"):
+            UserStateChange.objects.create(
+                user_pk="old", is_active=True, changed_at=datetime.now(timezone.utc) - timedelta(days=31)
+            )
+            UserStateChange.objects.create(user_pk="new", is_active=True, changed_at=datetime.now(timezone.utc))
+
+            with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+                UserRevalidation.snapshot.is_valid({"user_id": self.user.pk, "iat": 0})
+                self.assertEqual(1, UserRevalidation.snapshot.stats()["users"], "Old changes are not loaded.")
+                self.assertEqual(2, UserStateChange.objects.count(), "Changes are not purged on the request path.")
+
+                stdout = StringIO()
+                call_command("purge_user_state_changes", stdout=stdout)
+
+        self.assertEqual(["new"], list(UserStateChange.objects.values_list("user_pk", flat=True)))
+        self.assertIn("Purged 1", stdout.getvalue())
+
+    def test_web_token_refresh_rejects_deactivated_user(self) -> None:
+        refresh_token, _ = get_refresh_token_for_user(self.user)
+        self.client.cookies[DEFAULTS["JWT_REFRESH_COOKIE_NAME"]] = refresh_token
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            self.deactivate_user()
+            response = self.client.post(reverse("api-1.0.0:web_token_refresh"))
+
+        self.assertEqual(401, response.status_code, "Deactivated user cannot refresh.")
+
+    def test_async_token_refresh_rejects_deactivated_user(self) -> None:
+        refresh_token, _ = get_refresh_token_for_user(self.user)
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings()):
+            self.deactivate_user()
+            response = self.client.post(
+                reverse("api-1.0.0:async_mobile_token_refresh"),
+                data={"refresh": refresh_token},
+                content_type="application/json",
+            )
+
+        self.assertEqual(401, response.status_code, "Deactivated user cannot refresh.")
+
+    def test_user_pk_claim_is_required(self) -> None:
+        claim_map = {claim: attr for claim, attr in DEFAULTS["TOKEN_CLAIM_USER_ATTRIBUTE_MAP"].items() if attr != "id"}
+
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(TOKEN_CLAIM_USER_ATTRIBUTE_MAP=claim_map)):
+            with self.assertRaises(ImproperlyConfigured):
+                UserRevalidation.snapshot  # pylint: disable=W0104
+            self.assertIn("ninja_simple_jwt.E006", [message.id for message in check_jwt_keys(None)])
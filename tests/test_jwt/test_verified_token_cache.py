@@ -0,0 +1,67 @@
+from typing import Any
+
+from django.test import TestCase
+from freezegun import freeze_time
+
+from ninja_simple_jwt.jwt.key_creation import make_and_save_key_pair
+from ninja_simple_jwt.jwt.verified_token_cache import VerifiedTokenCache, verified_token_cache
+from ninja_simple_jwt.settings import DEFAULTS
+
+
+class TestVerifiedTokenCache(TestCase):
+    @staticmethod
+    def merge_settings(**kwargs: Any) -> dict:
+        return {**DEFAULTS, **kwargs}
+
+    def setUp(self) -> None:
+        self.cache = VerifiedTokenCache()
+
+    def test_cache_disabled_by_default(self) -> None:
+        self.cache.set("token", {"exp": 1704975301})
+
+        self.assertIsNone(self.cache.get("token"), "Nothing is cached by default.")
+        self.assertEqual(0, self.cache.stats()["misses"], "Disabled cache does not count misses.")
+
+    def test_cache_hit_and_miss(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_VERIFIED_TOKEN_CACHE_SIZE=10)):
+            with freeze_time("2024-01-11 12:00:01"):
+                self.assertIsNone(self.cache.get("token"), "Unknown token is a miss.")
+                self.cache.set("token", {"exp": 1704975301, "username": "user"})
+                claims = self.cache.get("token")
+
+            stats = self.cache.stats()
+
+        self.assertEqual({"exp": 1704975301, "username": "user"}, claims, "Cached claims returned.")
+        self.assertEqual(1, stats["hits"], "Hit counted.")
+        self.assertEqual(1, stats["misses"], "Miss counted.")
+
+    def test_cache_entry_expires_with_token(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_VERIFIED_TOKEN_CACHE_SIZE=10)):
+            with freeze_time("2024-01-11 12:00:01"):
+                self.cache.set("token", {"exp": 1704975301})
+            with freeze_time("2024-01-11 12:15:01"):
+                claims = self.cache.get("token")
+
+            stats = self.cache.stats()
+
+        self.assertIsNone(claims, "Expired token is not returned.")
+        self.assertEqual(0, stats["size"], "Expired entry is evicted.")
+
+    def test_cache_evicts_least_recently_used(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_VERIFIED_TOKEN_CACHE_SIZE=2)):
+            with freeze_time("2024-01-11 12:00:01"):
+                self.cache.set("first", {"exp": 1704975301})
+                self.cache.set("second", {"exp": 1704975301})
+                self.cache.get("first")
+                self.cache.set("third", {"exp": 1704975301})
+
+                self.assertIsNotNone(self.cache.get("first"), "Recently used entry is kept.")
+                self.assertIsNone(self.cache.get("second"), "Least recently used entry is evicted.")
+                self.assertIsNotNone(self.cache.get("third"), "New entry is cached.")
+
+    def test_key_pair_clear_clears_cache(self) -> None:
+        with self.settings(NINJA_SIMPLE_JWT=self.merge_settings(JWT_VERIFIED_TOKEN_CACHE_SIZE=10)):
+            with freeze_time("2024-01-11 12:00:01"):
+                verified_token_cache.set("token", {"exp": 1704975301})
+                make_and_save_key_pair()
+                self.assertIsNone(verified_token_cache.get("token"), "Cache is cleared with the key pair.")
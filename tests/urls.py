@@ -1,11 +1,20 @@
 from django.urls import path
 from ninja import NinjaAPI
 
-from ninja_simple_jwt.auth.views.api import mobile_auth_router, web_auth_router
+from ninja_simple_jwt.auth.views.api import (
+    async_mobile_auth_router,
+    async_web_auth_router,
+    jwks_router,
+    mobile_auth_router,
+    web_auth_router,
+)
 
 api = NinjaAPI()
 api.add_router("/auth/mobile/", mobile_auth_router)
 api.add_router("/auth/web/", web_auth_router)
+api.add_router("/auth/async/mobile/", async_mobile_auth_router)
+api.add_router("/auth/async/web/", async_web_auth_router)
+api.add_router("/", jwks_router)
 
 
 urlpatterns = [path("api/", api.urls)]